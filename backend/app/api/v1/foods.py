@@ -1,10 +1,19 @@
 import logging
-from typing import List
+import secrets
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 
+from ...core.catalog_reload import CatalogReloadError
 from ...core.config import settings
 from ...models.database import Food
+from ...models.schemas import (
+    CacheStats,
+    CatalogReloadResult,
+    FoodBatchSearchRequest,
+    FoodBatchSearchResponse,
+    FoodBatchSearchResult,
+)
 from ...services.food_service import food_service
 
 logger = logging.getLogger(__name__)
@@ -12,20 +21,127 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/foods", tags=["foods"])
 
 
-@router.get("", response_model=List[Food])
-async def search_foods(q: str = Query(..., description="Search query for food ingredients")):
-    """Search for food ingredients containing the given query string."""
+def _query_error(q: str) -> Optional[str]:
+    """Explain why a query cannot be searched, or return None if it can."""
     if not food_service.validate_search_query(q):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Enter at least {settings.MIN_SEARCH_LENGTH} characters to search"
-        )
+        return f"Enter at least {settings.MIN_SEARCH_LENGTH} characters to search"
+    if len(q) > settings.MAX_SEARCH_LENGTH:
+        return f"Enter at most {settings.MAX_SEARCH_LENGTH} characters to search"
+    return None
+
+
+def _validate_query(q: str) -> None:
+    """Reject queries outside the allowed search length."""
+    error = _query_error(q)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+
+@router.get("", response_model=List[Food])
+async def search_foods(
+    response: Response,
+    q: str = Query(
+        ..., max_length=settings.MAX_SEARCH_LENGTH, description="Search query for food ingredients"
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.MAX_FOOD_PAGE_SIZE, description="Maximum number of results"
+    ),
+    after_id: Optional[int] = Query(
+        None, ge=0, description="Cursor from X-Next-Cursor: continue after the food with this id"
+    ),
+):
+    """Search for food ingredients matching the given query string.
+
+    When a page is full, the id to pass as ``after_id`` for the next page
+    is returned in the ``X-Next-Cursor`` header.
+    """
+    _validate_query(q)
 
     try:
-        results = food_service.search_foods(q)
+        results = await food_service.search_foods_async(q, max_results=limit, after_id=after_id)
+        page_size = limit or settings.MAX_FOOD_RESULTS
+        if results and len(results) >= page_size:
+            response.headers["X-Next-Cursor"] = str(results[-1].id)
         return results
     except Exception as e:
         logger.error(f"Food search failed: {e}")
         raise HTTPException(
             status_code=500, detail=f"Failed to search foods: {str(e)}"
         )
+
+
+@router.post("/batch-search", response_model=FoodBatchSearchResponse)
+async def batch_search_foods(request: FoodBatchSearchRequest):
+    """Resolve several ingredient strings against the catalog in one request.
+
+    Results are returned in request order. A query that cannot be searched
+    (too short or too long) gets no foods and an error, and does not fail
+    the rest of the batch.
+    """
+    errors = [_query_error(query) for query in request.queries]
+    valid = [query for query, error in zip(request.queries, errors) if error is None]
+
+    try:
+        matches = []
+        if valid:
+            matches = await food_service.search_foods_batch_async(
+                valid, max_results=request.max_results
+            )
+        found = iter(matches)
+        results = []
+        for query, error in zip(request.queries, errors):
+            if error:
+                results.append(FoodBatchSearchResult(query=query, foods=[], error=error))
+            else:
+                results.append(FoodBatchSearchResult(query=query, foods=next(found)))
+        return FoodBatchSearchResponse(results=results)
+    except Exception as e:
+        logger.error(f"Batch food search failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to search foods: {str(e)}"
+        )
+
+
+@router.get("/autocomplete", response_model=List[Food])
+async def autocomplete_foods(
+    q: str = Query(
+        ..., max_length=settings.MAX_SEARCH_LENGTH, description="Partially typed ingredient name"
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.MAX_FOOD_PAGE_SIZE, description="Maximum number of results"
+    ),
+):
+    """Suggest food ingredients with a word starting with the given prefix."""
+    _validate_query(q)
+
+    try:
+        return await food_service.autocomplete_foods_async(q, max_results=limit)
+    except Exception as e:
+        logger.error(f"Food autocomplete failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to autocomplete foods: {str(e)}"
+        )
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+async def food_search_cache_stats():
+    """Report hit/miss/eviction counters for the food search cache."""
+    return food_service.cache_stats()
+
+
+@router.post("/catalog/reload", response_model=CatalogReloadResult)
+async def reload_food_catalog(x_admin_token: Optional[str] = Header(None)):
+    """Apply changes in the ingredients CSV without restarting the server."""
+    token = settings.CATALOG_ADMIN_TOKEN
+    if not token or not x_admin_token or not secrets.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    try:
+        return await food_service.reload_catalog_async()
+    except CatalogReloadError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Catalog reload failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to reload catalog: {str(e)}"
+        )
@@ -1,16 +1,40 @@
+import asyncio
+import json
 import logging
-from typing import List
+import math
+from typing import AsyncIterator, List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from ...models.schemas import RecipeRequest, RecipeResponse
-from ...services.recipe_service import recipe_service
+from ...core.config import settings
+from ...core.job_queue import QueueFullError
+from ...core.resilience import CircuitOpenError, is_retryable
+from ...models.schemas import (
+    JobQueueStats,
+    RecipeBatchRequest,
+    RecipeBatchResponse,
+    RecipeCacheStats,
+    RecipeJobRequest,
+    RecipeJobStatus,
+    RecipeRequest,
+    RecipeResponse,
+    ResilienceStats,
+    SimilarityCacheStats,
+    SingleFlightStats,
+)
+from ...services.recipe_service import NoIngredientsError, recipe_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
 
+def _retry_after_seconds(error: CircuitOpenError) -> str:
+    """Retry-After header value for a rejected call."""
+    return str(max(1, math.ceil(error.retry_after)))
+
+
 @router.post("/generate", response_model=RecipeResponse)
 async def generate_recipes(request: RecipeRequest):
     """Generate recipes based on provided ingredients."""
@@ -20,11 +44,177 @@ async def generate_recipes(request: RecipeRequest):
         )
 
     try:
-        recipes = recipe_service.generate_recipes(request)
+        recipes = await recipe_service.generate_recipes_async(request)
         return RecipeResponse(recipes=recipes)
 
+    except NoIngredientsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        logger.warning("Recipe generation rejected: circuit breaker open")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": _retry_after_seconds(e)}
+        )
+    except asyncio.TimeoutError:
+        logger.error("Recipe generation timed out")
+        raise HTTPException(status_code=504, detail="Recipe generation timed out")
     except Exception as e:
         logger.error(f"Recipe generation failed: {e}")
+        if is_retryable(e):
+            # Upstream overloaded or down even after retries; ask clients to back off
+            raise HTTPException(
+                status_code=503,
+                detail=f"Failed to generate recipes: {str(e)}",
+                headers={"Retry-After": str(math.ceil(settings.GEMINI_BACKOFF_MAX_SECONDS))},
+            )
+        raise HTTPException(
+            status_code=500, detail=f"Failed to generate recipes: {str(e)}"
+        )
+
+
+@router.post("/generate/batch", response_model=RecipeBatchResponse)
+async def generate_recipes_batch(request: RecipeBatchRequest):
+    """Generate recipes for many requests in one call.
+
+    Results are returned in request order; each carries either its recipes
+    or an error, so one failing item does not fail the batch.
+    """
+    try:
+        results = await recipe_service.generate_recipes_batch_async(
+            request.requests, pack_prompts=request.pack_prompts
+        )
+        return RecipeBatchResponse(results=results)
+    except Exception as e:
+        logger.error(f"Batch recipe generation failed: {e}")
         raise HTTPException(
             status_code=500, detail=f"Failed to generate recipes: {str(e)}"
         )
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_recipes_stream(request: RecipeRequest):
+    """Stream generated recipes as server-sent events.
+
+    Each complete recipe is sent as a ``recipe`` event as soon as it has
+    been generated, followed by a final ``done`` event, or an ``error``
+    event if generation fails part way.
+    """
+    if not request.ingredients:
+        raise HTTPException(
+            status_code=400, detail="At least one ingredient is required"
+        )
+
+    try:
+        request = await recipe_service.prepare_request_async(request)
+    except NoIngredientsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for recipe in recipe_service.stream_prepared_recipes_async(request):
+                yield _sse_event("recipe", recipe.model_dump_json())
+            yield _sse_event("done", "{}")
+        except CircuitOpenError as e:
+            logger.warning("Recipe streaming rejected: circuit breaker open")
+            yield _sse_event("error", json.dumps({
+                "detail": str(e), "retry_after": int(_retry_after_seconds(e))
+            }))
+        except asyncio.TimeoutError:
+            logger.error("Recipe streaming timed out")
+            yield _sse_event("error", json.dumps({"detail": "Recipe generation timed out"}))
+        except Exception as e:
+            logger.error(f"Recipe streaming failed: {e}")
+            yield _sse_event(
+                "error", json.dumps({"detail": f"Failed to generate recipes: {str(e)}"})
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs", response_model=RecipeJobStatus, status_code=202)
+async def submit_recipe_job(
+    request: RecipeJobRequest, http_request: Request, response: Response
+):
+    """Queue recipe generation in the background and return the job at once.
+
+    Poll ``GET /recipes/jobs/{id}`` (optionally with ``wait`` to long-poll)
+    for the status and, when finished, the recipes.
+    """
+    if not request.ingredients:
+        raise HTTPException(
+            status_code=400, detail="At least one ingredient is required"
+        )
+
+    try:
+        job = await recipe_service.submit_job(request)
+    except NoIngredientsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        logger.warning("Recipe job rejected: queue full")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(settings.GEMINI_BACKOFF_MAX_SECONDS))},
+        )
+    except Exception as e:
+        logger.error(f"Recipe job submission failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to submit recipe job: {str(e)}"
+        )
+    response.headers["Location"] = str(http_request.url_for("get_recipe_job", job_id=job.id))
+    return job
+
+
+@router.get("/jobs/stats", response_model=JobQueueStats)
+async def recipe_job_stats():
+    """Report queue depth and counters for background recipe jobs."""
+    return recipe_service.job_stats()
+
+
+@router.get("/jobs/{job_id}", response_model=RecipeJobStatus)
+async def get_recipe_job(
+    job_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=settings.RECIPE_JOB_MAX_WAIT_SECONDS,
+        description="Seconds to wait for the job to finish before answering",
+    ),
+):
+    """Return a recipe job's status, and its recipes once it has succeeded."""
+    job = await recipe_service.get_job(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Recipe job not found")
+    return job
+
+
+@router.get("/cache/stats", response_model=RecipeCacheStats)
+async def recipe_cache_stats():
+    """Report hit/miss counters for the generated recipe cache."""
+    return recipe_service.cache_stats()
+
+
+@router.get("/similarity/stats", response_model=SimilarityCacheStats)
+async def recipe_similarity_stats():
+    """Report how often near-duplicate requests reused cached recipes."""
+    return recipe_service.similarity_stats()
+
+
+@router.get("/resilience/stats", response_model=ResilienceStats)
+async def recipe_resilience_stats():
+    """Report circuit breaker state and retry counters for recipe generation."""
+    return recipe_service.resilience_stats()
+
+
+@router.get("/coalescing/stats", response_model=SingleFlightStats)
+async def recipe_coalescing_stats():
+    """Report how many Gemini calls identical concurrent requests shared."""
+    return recipe_service.coalescing_stats()
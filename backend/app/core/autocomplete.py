@@ -0,0 +1,117 @@
+import logging
+from array import array
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+from .catalog_index import CatalogIndex
+from .compact_catalog import CompactCatalog, fold_case
+
+logger = logging.getLogger(__name__)
+
+
+def word_starts(name: str) -> list[int]:
+    """Return the offsets at which words start in a name."""
+    return [
+        i for i, char in enumerate(name)
+        if char != " " and (i == 0 or name[i - 1] == " ")
+    ]
+
+
+def _rank(key: str, name_length: int, position: int) -> tuple[int, int, int]:
+    """Sort key for a completion: whole-name matches first, then shorter names."""
+    return (0 if len(key) == name_length else 1, name_length, position)
+
+
+class _IndexState(NamedTuple):
+    catalog: CompactCatalog
+    name_lengths: array
+    keys: list[str]
+    key_positions: array
+    hot_prefixes: dict[str, tuple[int, ...]]
+    hot_prefix_length: int
+    hot_results: int
+
+
+class PrefixIndex(CatalogIndex[_IndexState]):
+    """Immutable sorted-array index for ingredient autocompletion.
+
+    Every word-initial suffix of every name is stored in one sorted list, so
+    "blu" completes "cheese blue" as well as "blueberries". Names that start
+    with the prefix rank first, then shorter names. The top ``hot_results``
+    completions of every ``hot_prefix_length``-character prefix are
+    precomputed, so the common first keystrokes are a single dict lookup.
+    """
+
+    _state_type = _IndexState
+
+    def build(
+        self,
+        catalog: CompactCatalog,
+        hot_prefix_length: int = 3,
+        hot_results: int = 20,
+    ) -> None:
+        """Build the index over a catalog and swap it in atomically."""
+        name_lengths = array("I")
+        entries: list[tuple[str, int]] = []
+
+        for position, (_, name) in enumerate(catalog.rows()):
+            name_lengths.append(len(name))
+            folded = fold_case(name)
+            entries.extend((folded[start:], position) for start in word_starts(folded))
+        entries.sort()
+
+        candidates: dict[str, dict[int, tuple]] = {}
+        for key, position in entries:
+            if len(key) >= hot_prefix_length:
+                rank = _rank(key, name_lengths[position], position)
+                bucket = candidates.setdefault(key[:hot_prefix_length], {})
+                if rank < bucket.get(position, (2,)):
+                    bucket[position] = rank
+        hot_prefixes = {
+            prefix: sorted(bucket, key=bucket.__getitem__)[:hot_results]
+            for prefix, bucket in candidates.items()
+        }
+
+        self._state = _IndexState(
+            catalog=catalog,
+            name_lengths=name_lengths,
+            keys=[key for key, _ in entries],
+            key_positions=array("I", (position for _, position in entries)),
+            hot_prefixes={prefix: tuple(bucket) for prefix, bucket in hot_prefixes.items()},
+            hot_prefix_length=hot_prefix_length,
+            hot_results=hot_results,
+        )
+        logger.info(
+            f"Built autocomplete index over {len(entries)} keys "
+            f"({len(hot_prefixes)} precomputed prefixes)"
+        )
+
+    def complete(self, prefix: str, max_results: int) -> Optional[list[tuple[int, str]]]:
+        """Return ``(id, name)`` pairs with a word starting with ``prefix``.
+
+        Returns ``None`` when the index has not been built.
+        """
+        state = self._state
+        if state is None:
+            return None
+
+        needle = fold_case(prefix.lstrip())
+        if len(needle) == state.hot_prefix_length and max_results <= state.hot_results:
+            positions = state.hot_prefixes.get(needle, ())[:max_results]
+        else:
+            ranks: dict[int, tuple] = {}
+            keys = state.keys
+            i = bisect_left(keys, needle)
+            while i < len(keys) and keys[i].startswith(needle):
+                position = state.key_positions[i]
+                rank = _rank(keys[i], state.name_lengths[position], position)
+                if rank < ranks.get(position, (2,)):
+                    ranks[position] = rank
+                i += 1
+            positions = sorted(ranks, key=ranks.__getitem__)[:max_results]
+
+        return [state.catalog.row_at(position) for position in positions]
+
+
+# Shared index instance, built at startup from the Food table
+prefix_index = PrefixIndex()
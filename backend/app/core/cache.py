@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+from cachetools import TTLCache
+
+from .config import settings
+from ..models.schemas import CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that counts capacity evictions and TTL expirations."""
+
+    def __init__(self, maxsize: int, ttl: float, timer=time.monotonic) -> None:
+        super().__init__(maxsize, ttl, timer)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        # cachetools calls popitem only to make room for a new entry
+        self.evictions += 1
+        return super().popitem()
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class SearchCache:
+    """Thread-safe bounded LRU + TTL cache with hit/miss/eviction counters.
+
+    A ``maxsize`` of 0 disables caching while still counting misses.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, timer=time.monotonic, name: str = "food search"
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache = _CountingTTLCache(maxsize, ttl, timer) if maxsize > 0 else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            value = self._cache.get(key) if self._cache is not None else None
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for ``key``."""
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the catalog changed."""
+        if self._cache is None:
+            return
+        with self._lock:
+            # clear() pops every item, which must not count as evictions
+            evictions, expirations = self._cache.evictions, self._cache.expirations
+            self._cache.clear()
+            self._cache.evictions, self._cache.expirations = evictions, expirations
+        logger.info(f"Cleared {self.name} cache")
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            if self._cache is not None:
+                self._cache.expire()
+            lookups = self.hits + self.misses
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self._cache.evictions if self._cache is not None else 0,
+                expirations=self._cache.expirations if self._cache is not None else 0,
+                size=len(self._cache) if self._cache is not None else 0,
+                maxsize=self.maxsize,
+                ttl_seconds=self.ttl,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+            )
+
+
+# Shared cache for food search results, cleared whenever the catalog is imported
+food_search_cache = SearchCache(
+    settings.FOOD_SEARCH_CACHE_SIZE, settings.FOOD_SEARCH_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,47 @@
+from typing import Generic, Optional, TypeVar
+
+from .compact_catalog import CompactCatalog
+
+StateT = TypeVar("StateT")
+
+
+class CatalogIndex(Generic[StateT]):
+    """Lifecycle shared by the in-memory search indexes over a CompactCatalog.
+
+    A subclass keeps everything it needs in one ``_state_type`` named tuple
+    whose first field is ``catalog``, and ``build`` replaces ``_state``
+    in a single assignment, so searches never see a half-built index.
+    Exported state leaves the catalog out: snapshots store it separately.
+    """
+
+    _state_type: type[StateT]
+
+    def __init__(self) -> None:
+        self._state: Optional[StateT] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been built."""
+        return self._state is not None
+
+    def export_state(self) -> Optional[tuple]:
+        """Return the index contents without the catalog, for storing in a snapshot."""
+        state = self._state
+        return tuple(state._replace(catalog=None)) if state else None
+
+    def import_state(self, catalog: CompactCatalog, exported: tuple) -> None:
+        """Restore contents produced by export_state over the same catalog.
+
+        Raises ValueError if ``exported`` does not have this index's fields,
+        e.g. when it was stored by an older version of the index.
+        """
+        fields = self._state_type._fields
+        if len(exported) != len(fields):
+            raise ValueError(
+                f"{type(self).__name__} state has {len(exported)} fields, expected {len(fields)}"
+            )
+        self._state = self._state_type(*exported)._replace(catalog=catalog)
+
+    def clear(self) -> None:
+        """Drop the index."""
+        self._state = None
@@ -0,0 +1,145 @@
+"""Reload the ingredient catalog from the CSV while the app keeps serving.
+
+The food table is brought up to date with ``sync_ingredients``, which
+touches only inserted and deleted rows. The in-memory indexes are then
+rebuilt over a fresh compact catalog and swapped in. Searches keep using
+the previous indexes and the WAL-isolated database until the swap.
+
+With several workers, only the one that reloads updates the database and
+the shared compact catalog. The others notice the new content hash within
+CATALOG_REFRESH_INTERVAL_SECONDS (``poll_catalog``) and rebuild their own
+indexes from the shared catalog.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from . import database
+from .config import settings
+from .shared_catalog import (
+    catalog_lock,
+    catalog_path,
+    index_catalog,
+    indexed_catalog_hash,
+    load_shared_catalog,
+)
+from .trigram_index import trigram_index
+from ..models.schemas import CatalogReloadResult
+
+logger = logging.getLogger(__name__)
+
+_reload_lock = threading.Lock()
+
+
+class CatalogReloadError(Exception):
+    """Raised when the catalog cannot be reloaded in this deployment."""
+
+
+def reload_catalog() -> CatalogReloadResult:
+    """Bring the food table and search indexes up to date with the CSV."""
+    if settings.CATALOG_SNAPSHOT_PATH:
+        raise CatalogReloadError(
+            "The catalog is served from a read-only snapshot; build and deploy a new snapshot"
+        )
+    csv_file_path = settings.INGREDIENTS_CSV_PATH
+    if not os.path.exists(csv_file_path):
+        raise CatalogReloadError(f"Ingredients CSV file not found: {csv_file_path}")
+
+    started = time.perf_counter()
+    # Indexes are rebuilt under the reload lock so refresh_catalog does not repeat the work
+    with _reload_lock:
+        with catalog_lock():
+            content_hash = database.file_sha256(csv_file_path)
+            inserted = deleted = 0
+            if content_hash != database.get_catalog_hash():
+                # Workers attached read-only write through a short-lived engine
+                writer = database.engine
+                if database.is_read_only(writer):
+                    writer = database.create_database_engine(settings.DATABASE_URL)
+                try:
+                    inserted, deleted = database.sync_ingredients(
+                        csv_file_path, content_hash, writer
+                    )
+                finally:
+                    if writer is not database.engine:
+                        writer.dispose()
+
+            if content_hash == indexed_catalog_hash() and not (inserted or deleted):
+                catalog = None
+            else:
+                catalog = database.load_compact_catalog()
+                if os.path.exists(catalog_path()):
+                    catalog.save(catalog_path())
+
+        if catalog is not None:
+            index_catalog(catalog, content_hash)
+
+    result = CatalogReloadResult(
+        inserted=inserted,
+        deleted=deleted,
+        food_count=len(catalog) if catalog is not None else len(trigram_index),
+        content_hash=content_hash,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+    logger.info(
+        f"Reloaded catalog: {inserted} inserted, {deleted} deleted, "
+        f"{result.food_count} foods in {result.elapsed_ms:.1f} ms"
+    )
+    return result
+
+
+def refresh_catalog() -> bool:
+    """Rebuild this worker's indexes if another worker has reloaded the catalog.
+
+    Returns True if the indexes were rebuilt.
+    """
+    if database.get_catalog_hash() == indexed_catalog_hash():
+        return False
+    with _reload_lock:
+        with catalog_lock():
+            # The reloading worker holds the lock until the shared catalog is saved
+            content_hash = database.get_catalog_hash()
+            if content_hash == indexed_catalog_hash():
+                return False
+            catalog = load_shared_catalog()
+        index_catalog(catalog, content_hash)
+    logger.info(f"Refreshed search indexes for catalog {content_hash} ({len(catalog)} foods)")
+    return True
+
+
+async def poll_catalog(stop_event: asyncio.Event) -> None:
+    """Refresh this worker's indexes after reloads by other workers, until ``stop_event`` is set."""
+    interval = settings.CATALOG_REFRESH_INTERVAL_SECONDS
+    while True:
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.to_thread(refresh_catalog)
+        except Exception:
+            logger.exception("Catalog refresh failed")
+
+
+async def watch_catalog(stop_event: asyncio.Event) -> None:
+    """Reload the catalog whenever the ingredients CSV changes, until ``stop_event`` is set.
+
+    The parent directory is watched so that files replaced by rename (as
+    editors and deploy tools do) are still picked up.
+    """
+    from watchfiles import awatch
+
+    csv_file_path = os.path.abspath(settings.INGREDIENTS_CSV_PATH)
+    logger.info(f"Watching {csv_file_path} for catalog changes")
+    async for _ in awatch(
+        os.path.dirname(csv_file_path),
+        watch_filter=lambda change, path: os.path.abspath(path) == csv_file_path,
+        stop_event=stop_event,
+    ):
+        try:
+            await asyncio.to_thread(reload_catalog)
+        except Exception:
+            logger.exception("Catalog reload failed")
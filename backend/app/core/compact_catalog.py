@@ -0,0 +1,149 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, Optional, Union
+
+CATALOG_MAGIC = b"FOODCAT1"
+_HEADER = struct.Struct("=8sII")
+_SEPARATOR = b"\n"
+
+# SQLite's LIKE is case-insensitive for ASCII letters only, so fold the same way
+_ASCII_FOLD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def fold_case(text: str) -> str:
+    """Lower-case ASCII letters only, matching SQLite LIKE semantics."""
+    return text.translate(_ASCII_FOLD)
+
+
+class CompactCatalog:
+    """Read-only food catalog packed into one contiguous buffer.
+
+    Layout (native byte order)::
+
+        header   magic, row count, name buffer length
+        ids      uint32[count], ascending
+        offsets  uint32[count + 1] into the name buffers
+        names    UTF-8 names separated by newlines
+        folded   the same bytes with ASCII letters lower-cased
+
+    The ids and offsets are zero-copy ``memoryview`` casts over the buffer,
+    so a catalog loaded with :meth:`load` is backed by ``mmap`` pages that
+    every worker process shares. Rows are addressed by position (ascending
+    id order); no Python object is created per row until it is returned.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        magic, count, names_length = _HEADER.unpack_from(buffer, 0)
+        if magic != CATALOG_MAGIC:
+            raise ValueError("Not a compact food catalog")
+
+        self._buffer = buffer
+        view = memoryview(buffer)
+        ids_start = _HEADER.size
+        offsets_start = ids_start + 4 * count
+        self._names_start = offsets_start + 4 * (count + 1)
+        self._folded_start = self._names_start + names_length
+        self._ids = view[ids_start:offsets_start].cast("I")
+        self._offsets = view[offsets_start:self._names_start].cast("I")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, str]]) -> "CompactCatalog":
+        """Pack ``(id, name)`` rows into an in-memory catalog."""
+        ids = array("I")
+        offsets = array("I", [0])
+        names = bytearray()
+        for food_id, name in sorted(rows):
+            ids.append(food_id)
+            names += name.encode("utf-8") + _SEPARATOR
+            offsets.append(len(names))
+
+        folded = fold_case(names.decode("utf-8")).encode("utf-8")
+        header = _HEADER.pack(CATALOG_MAGIC, len(ids), len(names))
+        return cls(b"".join((header, ids.tobytes(), offsets.tobytes(), bytes(names), folded)))
+
+    @classmethod
+    def load(cls, path: str) -> "CompactCatalog":
+        """Memory-map a catalog file written by :meth:`save`."""
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def save(self, path: str) -> None:
+        """Write the catalog to ``path`` atomically."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self._buffer)
+        os.replace(temp_path, path)
+
+    def close(self) -> None:
+        """Release the memory map, if any."""
+        self._ids.release()
+        self._offsets.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the packed catalog in bytes."""
+        return len(self._buffer)
+
+    def id_at(self, position: int) -> int:
+        """Return the food id stored at a row position."""
+        return self._ids[position]
+
+    def name_at(self, position: int) -> str:
+        """Decode the food name stored at a row position."""
+        start = self._names_start + self._offsets[position]
+        end = self._names_start + self._offsets[position + 1] - len(_SEPARATOR)
+        return self._buffer[start:end].decode("utf-8")
+
+    def row_at(self, position: int) -> tuple[int, str]:
+        """Return the ``(id, name)`` row at a position."""
+        return self.id_at(position), self.name_at(position)
+
+    def rows(self) -> Iterator[tuple[int, str]]:
+        """Iterate over all ``(id, name)`` rows in id order."""
+        return (self.row_at(position) for position in range(len(self)))
+
+    def position_after(self, after_id: Optional[int]) -> int:
+        """Return the first row position with an id greater than ``after_id``."""
+        return bisect_right(self._ids, after_id) if after_id is not None else 0
+
+    def folded_contains(self, position: int, needle: bytes) -> bool:
+        """Check whether the case-folded name at ``position`` contains ``needle``."""
+        start = self._folded_start + self._offsets[position]
+        end = self._folded_start + self._offsets[position + 1]
+        return self._buffer.find(needle, start, end) != -1
+
+    def search(
+        self, substr: str, max_results: int, after_id: Optional[int] = None
+    ) -> list[tuple[int, str]]:
+        """Return ``(id, name)`` rows whose name contains ``substr`` (ASCII case-insensitive).
+
+        Scans the folded buffer with ``find`` and jumps to the next row after
+        each hit, so only matching rows are ever decoded.
+        """
+        needle = fold_case(substr).encode("utf-8")
+        if _SEPARATOR in needle:
+            return []
+
+        results = []
+        position = self.position_after(after_id)
+        end = self._folded_start + self._offsets[len(self)]
+        cursor = self._folded_start + self._offsets[position]
+        while len(results) < max_results:
+            hit = self._buffer.find(needle, cursor, end)
+            if hit == -1:
+                break
+            position = bisect_right(self._offsets, hit - self._folded_start) - 1
+            results.append(self.row_at(position))
+            cursor = self._folded_start + self._offsets[position + 1]
+        return results
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -14,6 +14,24 @@ class Settings:
     # Database settings
     DATABASE_URL: str = "sqlite:///database.db"
     DATABASE_FILE_NAME: str = "database.db"
+    # Prebuilt catalog artifact (see app.core.snapshot); when set, startup opens it
+    # read-only instead of rebuilding the database from the CSV
+    CATALOG_SNAPSHOT_PATH: Optional[str] = os.getenv("CATALOG_SNAPSHOT_PATH")
+    # Where `python -m app.core.snapshot build` writes snapshots by default
+    CATALOG_SNAPSHOT_DIR: str = "snapshots"
+
+    # SQLite performance profile, applied to every new connection
+    SQLITE_PERFORMANCE_PROFILE: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    # NORMAL is durable across application crashes when journal mode is WAL
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    # Keep at least SEARCH_EXECUTOR_WORKERS connections so search threads never wait
+    SQLITE_POOL_SIZE: int = 8
+    SQLITE_MAX_OVERFLOW: int = 8
+    # Serve searches from a separate read-only (query_only) engine
+    SQLITE_READ_ENGINE_ENABLED: bool = True
 
     # CORS settings
     ALLOWED_ORIGINS: List[str] = [
@@ -21,17 +39,105 @@ class Settings:
         "https://recipe-robot-ui.onrender.com",
     ]
 
+    # Recipe generation backend: "gemini" calls the Gemini API, "fake" answers
+    # locally with deterministic recipes (for load testing without network access)
+    RECIPE_BACKEND: str = os.getenv("RECIPE_BACKEND", "gemini")
+    # Fake backend: log-normal latency with this median and shape, and the share
+    # of calls that fail; draws are seeded so runs are reproducible
+    FAKE_RECIPE_LATENCY_MEDIAN_MS: float = float(os.getenv("FAKE_RECIPE_LATENCY_MEDIAN_MS", "800"))
+    FAKE_RECIPE_LATENCY_SIGMA: float = float(os.getenv("FAKE_RECIPE_LATENCY_SIGMA", "0.5"))
+    FAKE_RECIPE_ERROR_RATE: float = float(os.getenv("FAKE_RECIPE_ERROR_RATE", "0"))
+    FAKE_RECIPE_SEED: int = int(os.getenv("FAKE_RECIPE_SEED", "0"))
+
+    # Requested ingredients are folded onto catalog words (case, spacing, plurals,
+    # typos), deduplicated and capped before building prompts and cache keys
+    INGREDIENT_CANONICALIZATION_ENABLED: bool = True
+    MAX_RECIPE_INGREDIENTS: int = 20
+    MAX_INGREDIENT_LENGTH: int = 100
+
     # Gemini AI settings
     GEMINI_MODEL: str = "gemini-2.5-flash"
+    # Generations in flight per worker; further requests wait for a free slot
+    GEMINI_MAX_CONCURRENCY: int = 32
+    # Upper bound on waiting for a slot plus the Gemini call itself, retries included
+    GEMINI_TIMEOUT_SECONDS: float = 60.0
+    # Retries of overloaded/unavailable/timed-out calls: attempts per call, the
+    # timeout of each async attempt, and full-jitter exponential backoff between them
+    GEMINI_MAX_ATTEMPTS: int = 3
+    GEMINI_ATTEMPT_TIMEOUT_SECONDS: float = 25.0
+    GEMINI_BACKOFF_INITIAL_SECONDS: float = 0.5
+    GEMINI_BACKOFF_MAX_SECONDS: float = 8.0
+    # Retries may use at most this share of calls (plus a small per-second floor)
+    GEMINI_RETRY_BUDGET_RATIO: float = 0.2
+    GEMINI_RETRY_BUDGET_MIN_PER_SECOND: float = 1.0
+    # Consecutive failures that open the circuit breaker, and how long it then
+    # rejects calls (503 with Retry-After) before letting a probe through
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RECOVERY_SECONDS: float = 30.0
+    # POST /recipes/generate/batch: items per batch, items generated in parallel,
+    # and how many requests to pack into one prompt when packing is requested
+    MAX_BATCH_RECIPE_REQUESTS: int = 100
+    RECIPE_BATCH_CONCURRENCY: int = 8
+    RECIPE_BATCH_PACK_SIZE: int = 4
+
+    # Background recipe jobs (POST /recipes/jobs): workers per process, queued
+    # jobs before submissions are rejected, how long finished jobs stay
+    # retrievable, and the longest long-poll wait on GET /recipes/jobs/{id}
+    RECIPE_JOB_WORKERS: int = 4
+    RECIPE_JOB_QUEUE_SIZE: int = 1000
+    RECIPE_JOB_TTL_SECONDS: int = 15 * 60
+    RECIPE_JOB_MAX_WAIT_SECONDS: float = 30.0
 
     # File paths
     INGREDIENTS_CSV_PATH: str = "unique_indexed_ingredients.csv"
 
+    # Rows per executemany batch when bulk loading the ingredients CSV
+    IMPORT_CHUNK_SIZE: int = 5000
+
+    # Hot reload of the ingredients CSV: POST /api/v1/foods/catalog/reload requires
+    # this token in X-Admin-Token (unset disables the endpoint), and the watcher
+    # reloads whenever the file changes
+    CATALOG_ADMIN_TOKEN: Optional[str] = os.getenv("CATALOG_ADMIN_TOKEN")
+    CATALOG_WATCH_ENABLED: bool = os.getenv("CATALOG_WATCH_ENABLED", "").lower() in ("1", "true")
+    # Other workers pick up a reload within this many seconds (0 disables polling)
+    CATALOG_REFRESH_INTERVAL_SECONDS: float = 5.0
+
     # API settings
     DEFAULT_MAX_RECIPES: int = 3
     DEFAULT_CUISINE_STYLE: str = "any"
     MIN_SEARCH_LENGTH: int = 3
+    MAX_SEARCH_LENGTH: int = 200
     MAX_FOOD_RESULTS: int = 20
+    MAX_FOOD_PAGE_SIZE: int = 100
+    MAX_BATCH_SEARCH_QUERIES: int = 100
+
+    # Food search settings
+    # "trigram" serves substring searches from the in-memory index, "like" always
+    # queries SQLite, "fts" uses the FTS5 index for ranked token-prefix matching
+    FOOD_SEARCH_MODE: str = "trigram"
+    # Fall back to typo-tolerant matching when a search finds nothing
+    FUZZY_SEARCH_ENABLED: bool = True
+    FUZZY_MAX_EDIT_DISTANCE: int = 2
+    # Bounded result cache in front of food search (size 0 disables it)
+    FOOD_SEARCH_CACHE_SIZE: int = 4096
+    FOOD_SEARCH_CACHE_TTL_SECONDS: int = 3600
+    # Threads that run blocking search work off the event loop
+    SEARCH_EXECUTOR_WORKERS: int = 4
+
+    # Generated recipe cache: an in-process LRU tier plus an optional SQLite tier
+    # shared by workers and restarts (unset RECIPE_CACHE_DATABASE_URL disables it)
+    RECIPE_CACHE_SIZE: int = 1024
+    RECIPE_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    RECIPE_CACHE_DATABASE_URL: Optional[str] = os.getenv("RECIPE_CACHE_DATABASE_URL")
+
+    # Approximate recipe cache: requests whose ingredient words overlap a cached
+    # request's by at least the Jaccard threshold (same cuisine and recipe count)
+    # reuse its recipes; MinHash signatures split into LSH bands find candidates
+    RECIPE_SIMILARITY_ENABLED: bool = True
+    RECIPE_SIMILARITY_THRESHOLD: float = 0.6
+    RECIPE_SIMILARITY_CACHE_SIZE: int = 4096
+    RECIPE_SIMILARITY_PERMUTATIONS: int = 64
+    RECIPE_SIMILARITY_BANDS: int = 16
 
 
 settings = Settings()
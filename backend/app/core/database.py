@@ -1,30 +1,167 @@
 import csv
+import hashlib
 import logging
 import os
+import re
+from collections import Counter
 from contextlib import contextmanager
-from typing import Generator
+from itertools import islice
+from typing import Generator, Optional
 
+from sqlalchemy import Engine, delete, event, func, insert, inspect, make_url, or_, text
 from sqlmodel import Session, SQLModel, create_engine, select
 
+from .autocomplete import prefix_index
+from .cache import food_search_cache
+from .compact_catalog import CompactCatalog
 from .config import settings
-from ..models.database import Food
+from .fuzzy_index import fuzzy_index
+from .trigram_index import trigram_index
+from ..models.database import CatalogMetadata, Food
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Snapshot artifacts are immutable, so SQLite can skip locking and change detection
+SNAPSHOT_DATABASE_FILE_NAME = "database.db"
+
+
+def read_only_database_url(database_path: str, immutable: bool = False) -> str:
+    """Return a SQLite URL that opens ``database_path`` read-only."""
+    flags = "mode=ro&immutable=1" if immutable else "mode=ro"
+    return f"sqlite:///file:{os.path.abspath(database_path)}?{flags}&uri=true"
+
+
+def snapshot_database_url(snapshot_path: str) -> str:
+    """Return a read-only SQLite URL for the database inside a catalog snapshot."""
+    return read_only_database_url(
+        os.path.join(snapshot_path, SNAPSHOT_DATABASE_FILE_NAME), immutable=True
+    )
+
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    """Apply the SQLite performance profile to a new DB-API connection.
+
+    Journal mode is a property of the database file, so only writers set
+    it; read-only connections additionally refuse writes with query_only.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size = {-settings.SQLITE_CACHE_SIZE_KIB}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
+def create_database_engine(url: str, read_only: bool = False) -> Engine:
+    """Create an engine with a sized connection pool and the performance profile."""
+    pool_args = {}
+    if make_url(url).database not in (None, "", ":memory:"):
+        pool_args = {
+            "pool_size": settings.SQLITE_POOL_SIZE,
+            "max_overflow": settings.SQLITE_MAX_OVERFLOW,
+        }
+    new_engine = create_engine(url, connect_args=connect_args, **pool_args)
+
+    if settings.SQLITE_PERFORMANCE_PROFILE:
+        @event.listens_for(new_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, read_only)
+
+    return new_engine
+
+
 # Database engine setup
 connect_args = {"check_same_thread": False}
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+engine = (
+    create_database_engine(snapshot_database_url(settings.CATALOG_SNAPSHOT_PATH), read_only=True)
+    if settings.CATALOG_SNAPSHOT_PATH else create_database_engine(settings.DATABASE_URL)
+)
+
+# Separate read-only engine for the search path, opened once the database exists
+read_engine: Optional[Engine] = None
+
+
+def open_read_engine():
+    """Open the read-only search engine if enabled and the main engine can write."""
+    global read_engine
+    close_read_engine()
+    if settings.SQLITE_READ_ENGINE_ENABLED and not settings.CATALOG_SNAPSHOT_PATH:
+        read_engine = create_database_engine(
+            read_only_database_url(settings.DATABASE_FILE_NAME), read_only=True
+        )
+
+
+def close_read_engine():
+    """Close the read-only search engine, if open."""
+    global read_engine
+    if read_engine is not None:
+        read_engine.dispose()
+        read_engine = None
+
+
+def is_read_only(bind: Engine) -> bool:
+    """Whether an engine opens the database read-only."""
+    return bind.url.query.get("mode") == "ro"
+
+
+def search_engine() -> Engine:
+    """Engine that search queries run on."""
+    return read_engine or engine
+
+
+def use_read_only_engine():
+    """Reopen the database read-only, for workers attaching to a catalog built elsewhere."""
+    global engine
+    close_read_engine()
+    engine.dispose()
+    engine = create_database_engine(
+        read_only_database_url(settings.DATABASE_FILE_NAME), read_only=True
+    )
+
 
+# FTS5 index mirroring the food table, used when FOOD_SEARCH_MODE is "fts"
+FTS_TABLE_NAME = "food_fts"
 
-def create_db_and_tables():
-    """Create database tables and import initial data."""
+# CatalogMetadata key holding the SHA-256 of the imported ingredients CSV
+CATALOG_HASH_KEY = "ingredients_csv_sha256"
+
+# Durability is not needed while bulk loading: the whole load is one transaction
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+
+def create_db_and_tables() -> CompactCatalog:
+    """Create database tables, import initial data and build the search indexes.
+
+    Returns the compact catalog the indexes were built over.
+    """
     SQLModel.metadata.create_all(engine)
-    import_ingredients()
+    fts_created = settings.FOOD_SEARCH_MODE == "fts" and create_fts_table()
+    # An unchanged CSV skips the import, but a new FTS table still needs filling
+    if not import_ingredients() and fts_created:
+        rebuild_fts_index()
+    open_read_engine()
+    return refresh_search_indexes()
+
+
+# Side files SQLite keeps next to a database in WAL mode
+WAL_SIDE_FILE_SUFFIXES = ("-wal", "-shm")
 
 
 def clear_db_and_tables():
     """Clear database tables and remove database file."""
+    close_read_engine()
+    engine.dispose()
     if os.path.exists(settings.DATABASE_FILE_NAME):
         try:
             os.remove(settings.DATABASE_FILE_NAME)
@@ -33,27 +170,211 @@ def clear_db_and_tables():
             logger.exception(f"Error deleting database file: {str(e)}")
     else:
         logger.info("Database file does not exist")
+    # A writable last connection checkpoints and removes these on close, but a
+    # read-only one (a worker attached to the shared catalog) leaves them behind
+    for suffix in WAL_SIDE_FILE_SUFFIXES:
+        side_file = settings.DATABASE_FILE_NAME + suffix
+        if os.path.exists(side_file):
+            try:
+                os.remove(side_file)
+            except OSError as e:
+                logger.exception(f"Error deleting {side_file}: {str(e)}")
+
 
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, mode="rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-def import_ingredients():
-    """Import ingredients from CSV file into the database."""
+
+def get_catalog_hash() -> Optional[str]:
+    """Return the content hash recorded by the last successful import."""
+    with Session(engine) as session:
+        metadata = session.get(CatalogMetadata, CATALOG_HASH_KEY)
+        return metadata.value if metadata else None
+
+
+def import_ingredients() -> bool:
+    """Import ingredients from the CSV file unless it is unchanged since the last import.
+
+    Returns True if the food table was (re)loaded.
+    """
     csv_file_path = settings.INGREDIENTS_CSV_PATH
     if not os.path.exists(csv_file_path):
         logger.warning(f"Ingredients CSV file not found: {csv_file_path}")
-        return
+        return False
+
+    content_hash = file_sha256(csv_file_path)
+    if get_catalog_hash() == content_hash:
+        logger.info("Ingredients CSV unchanged since last import, skipping")
+        return False
 
-    food_data = []
+    count = bulk_load_ingredients(csv_file_path, content_hash)
+    logger.info(f"Imported {count} ingredients")
+    food_search_cache.clear()
+    return True
+
+
+def bulk_load_ingredients(csv_file_path: str, content_hash: str, bind: Engine = None) -> int:
+    """Replace the food table with the CSV contents in a single transaction.
+
+    Rows are streamed from the CSV in IMPORT_CHUNK_SIZE chunks and inserted
+    with Core executemany, bypassing the ORM unit of work. The content hash
+    is recorded in the same transaction, so an interrupted load is retried.
+    The FTS5 index, if present, is rebuilt in that transaction too, whatever
+    the current FOOD_SEARCH_MODE, so it never outlives the rows it mirrors.
+    """
+    count = 0
+    bind = bind or engine
+    with bind.connect() as connection, open(csv_file_path, mode="r", encoding="utf-8") as file:
+        previous_synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+        for pragma in BULK_LOAD_PRAGMAS:
+            connection.exec_driver_sql(pragma)
+
+        try:
+            connection.execute(delete(Food))
+            rows = ({"name": row["descrip"]} for row in csv.DictReader(file))
+            while chunk := list(islice(rows, settings.IMPORT_CHUNK_SIZE)):
+                connection.execute(insert(Food), chunk)
+                count += len(chunk)
+
+            if inspect(connection).has_table(FTS_TABLE_NAME):
+                _rebuild_fts(connection)
+            _record_catalog_hash(connection, content_hash)
+            connection.commit()
+        finally:
+            connection.exec_driver_sql(f"PRAGMA synchronous = {previous_synchronous}")
+    return count
+
+
+def sync_ingredients(
+    csv_file_path: str, content_hash: str, bind: Engine = None
+) -> tuple[int, int]:
+    """Apply only the difference between the CSV and the food table.
+
+    Foods whose names are still in the CSV keep their ids; names missing
+    from the table are inserted and names no longer in the CSV are deleted,
+    all in one transaction. The FTS5 index, if present, is updated row by
+    row instead of being rebuilt. Returns ``(inserted, deleted)``.
+    """
     with open(csv_file_path, mode="r", encoding="utf-8") as file:
-        csv_reader = csv.DictReader(file)
-        for row in csv_reader:
-            food_data.append(row)
+        names = [row["descrip"] for row in csv.DictReader(file)]
 
-    with Session(engine) as session:
-        for row in food_data:
-            food = Food(name=row["descrip"])
-            session.add(food)
-        session.commit()
-        logger.info(f"Imported {len(food_data)} ingredients")
+    with (bind or engine).begin() as connection:
+        wanted = Counter(names)
+        removed = []
+        for food_id, name in connection.execute(select(Food.id, Food.name).order_by(Food.id)):
+            if wanted[name] > 0:
+                wanted[name] -= 1
+            else:
+                removed.append({"id": food_id, "name": name})
+        added = []
+        for name in names:
+            if wanted[name] > 0:
+                wanted[name] -= 1
+                added.append({"name": name})
+
+        has_fts = inspect(connection).has_table(FTS_TABLE_NAME)
+        if has_fts and removed:
+            connection.execute(text(
+                f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, name) "
+                "VALUES ('delete', :id, :name)"
+            ), removed)
+        for start in range(0, len(removed), settings.IMPORT_CHUNK_SIZE):
+            chunk = [row["id"] for row in removed[start:start + settings.IMPORT_CHUNK_SIZE]]
+            connection.execute(delete(Food).where(Food.id.in_(chunk)))
+
+        # New rows get ids above the current maximum
+        max_id = connection.execute(select(func.max(Food.id))).scalar() or 0
+        for start in range(0, len(added), settings.IMPORT_CHUNK_SIZE):
+            connection.execute(insert(Food), added[start:start + settings.IMPORT_CHUNK_SIZE])
+        if has_fts and added:
+            connection.execute(text(
+                f"INSERT INTO {FTS_TABLE_NAME}(rowid, name) "
+                "SELECT id, name FROM food WHERE id > :max_id"
+            ), {"max_id": max_id})
+
+        _record_catalog_hash(connection, content_hash)
+
+    logger.info(f"Synced ingredients: {len(added)} inserted, {len(removed)} deleted")
+    return len(added), len(removed)
+
+
+def _record_catalog_hash(connection, content_hash: str):
+    """Store the content hash of the imported CSV."""
+    connection.execute(delete(CatalogMetadata).where(CatalogMetadata.key == CATALOG_HASH_KEY))
+    connection.execute(insert(CatalogMetadata), {"key": CATALOG_HASH_KEY, "value": content_hash})
+
+
+def create_fts_table(bind: Engine = None) -> bool:
+    """Create the FTS5 virtual table mirroring the food table.
+
+    Returns True if the table did not exist yet (and so is still empty).
+    """
+    with (bind or engine).begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE_NAME},
+        ).first()
+        if exists:
+            return False
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} "
+            "USING fts5(name, content='food', content_rowid='id')"
+        ))
+    return True
+
+
+def rebuild_fts_index(bind: Engine = None):
+    """Repopulate the FTS5 index from the current contents of the food table."""
+    with (bind or engine).begin() as connection:
+        _rebuild_fts(connection)
+
+
+def _rebuild_fts(connection):
+    """Repopulate the FTS5 index on an open connection."""
+    connection.execute(text(
+        f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')"
+    ))
+    logger.info("Rebuilt full-text search index")
+
+
+def build_fts_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query that prefix-matches every token.
+
+    "butt sal" becomes '"butt"* "sal"*', which matches "butter with salt".
+    Returns None when the text contains no searchable tokens.
+    """
+    tokens = re.findall(r"\w+", query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def load_compact_catalog(bind: Engine = None) -> CompactCatalog:
+    """Pack the Food table into a compact read-only catalog."""
+    with Session(bind or engine) as session:
+        rows = session.exec(select(Food.id, Food.name)).all()
+    return CompactCatalog.from_rows(rows)
+
+
+def refresh_search_indexes() -> CompactCatalog:
+    """Rebuild the in-memory search indexes from the Food table."""
+    catalog = load_compact_catalog()
+    build_search_indexes(catalog)
+    return catalog
+
+
+def build_search_indexes(catalog: CompactCatalog):
+    """Build the in-memory search indexes over a compact catalog."""
+    trigram_index.build(catalog)
+    prefix_index.build(catalog, settings.MIN_SEARCH_LENGTH, settings.MAX_FOOD_RESULTS)
+    if settings.FUZZY_SEARCH_ENABLED:
+        fuzzy_index.build(catalog, settings.FUZZY_MAX_EDIT_DISTANCE)
+    logger.info(f"Search indexes ready over {len(catalog)} foods ({catalog.nbytes} byte catalog)")
 
 
 @contextmanager
@@ -63,12 +384,129 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
-def select_foods_containing_substring(substr: str, max_results: int = None) -> list[Food]:
-    """Search for foods containing the given substring."""
+def select_foods_containing_substring(
+    substr: str, max_results: int = None, after_id: int = None
+) -> list[Food]:
+    """Search for foods containing the given substring, ordered by id.
+
+    Passing the id of the last food from a previous page as ``after_id``
+    continues the search from there (keyset pagination).
+    """
     if max_results is None:
         max_results = settings.MAX_FOOD_RESULTS
 
-    with Session(engine) as session:
+    with Session(search_engine()) as session:
         statement = select(Food).where(Food.name.like(f"%{substr}%"))
-        results = session.exec(statement).all()
-        return results[:max_results]
+        if after_id is not None:
+            statement = statement.where(Food.id > after_id)
+        statement = statement.order_by(Food.id).limit(max_results)
+        return session.exec(statement).all()
+
+
+def select_foods_containing_substrings(
+    substrs: list[str], max_results: int = None
+) -> dict[str, list[Food]]:
+    """Search for several substrings at once in a single pass over the food table.
+
+    SQLite evaluates one LIKE per substring for every row, and the scan stops
+    as soon as every substring has ``max_results`` matches.
+    """
+    if max_results is None:
+        max_results = settings.MAX_FOOD_RESULTS
+
+    results: dict[str, list[Food]] = {substr: [] for substr in substrs}
+    substrs = list(results)
+    conditions = [Food.name.like(f"%{substr}%") for substr in substrs]
+    statement = select(Food.id, Food.name, *conditions).where(or_(*conditions)).order_by(Food.id)
+
+    with Session(search_engine()) as session:
+        pending = len(substrs)
+        for food_id, name, *matched in session.exec(statement):
+            for substr, is_match in zip(substrs, matched):
+                if is_match and len(results[substr]) < max_results:
+                    results[substr].append(Food(id=food_id, name=name))
+                    if len(results[substr]) == max_results:
+                        pending -= 1
+            if not pending:
+                break
+    return results
+
+
+def select_foods_with_word_prefix(prefix: str, max_results: int = None) -> list[Food]:
+    """Search for foods with a word starting with the given prefix, ordered by name."""
+    if max_results is None:
+        max_results = settings.MAX_FOOD_RESULTS
+
+    prefix = prefix.lstrip()
+    with Session(search_engine()) as session:
+        statement = (
+            select(Food)
+            .where(Food.name.like(f"{prefix}%") | Food.name.like(f"% {prefix}%"))
+            .order_by(Food.name, Food.id)
+            .limit(max_results)
+        )
+        return session.exec(statement).all()
+
+
+def select_foods_matching_fts(
+    query: str, max_results: int = None, after_id: int = None
+) -> list[Food]:
+    """Search foods through the FTS5 index, best bm25 matches first.
+
+    Results follow relevance order, so ``after_id`` continues after the food
+    with that id in the ranked list rather than comparing ids: the page is
+    keyed on ``(bm25 rank, id)`` after looking up the rank of ``after_id``.
+    """
+    if max_results is None:
+        max_results = settings.MAX_FOOD_RESULTS
+
+    with search_engine().connect() as connection:
+        return _match_fts(connection, query, max_results, after_id)
+
+
+def select_foods_matching_fts_many(
+    queries: list[str], max_results: int = None
+) -> dict[str, list[Food]]:
+    """Run several FTS5 searches over a single connection."""
+    if max_results is None:
+        max_results = settings.MAX_FOOD_RESULTS
+
+    with search_engine().connect() as connection:
+        return {query: _match_fts(connection, query, max_results) for query in queries}
+
+
+def _match_fts(connection, query: str, max_results: int, after_id: int = None) -> list[Food]:
+    """Run one ranked FTS5 search on an open connection."""
+    match = build_fts_match_query(query)
+    if match is None:
+        return []
+
+    parameters = {"match": match, "limit": max_results}
+    keyset = ""
+    if after_id is not None:
+        # Keyset on (rank, id), with the cursor's rank looked up first: binding
+        # it keeps SQLite from re-scoring the cursor row for every candidate
+        score = connection.execute(
+            text(
+                f"SELECT rank FROM {FTS_TABLE_NAME} "
+                f"WHERE {FTS_TABLE_NAME} MATCH :match AND rowid = :after_id"
+            ),
+            {"match": match, "after_id": after_id},
+        ).scalar()
+        if score is None:
+            # The cursor no longer matches the query
+            return []
+        keyset = (
+            f"AND ({FTS_TABLE_NAME}.rank > :score "
+            f"OR ({FTS_TABLE_NAME}.rank = :score AND food.id > :after_id)) "
+        )
+        parameters.update(score=score, after_id=after_id)
+    statement = (
+        f"SELECT food.id, food.name FROM {FTS_TABLE_NAME} "
+        f"JOIN food ON food.id = {FTS_TABLE_NAME}.rowid "
+        f"WHERE {FTS_TABLE_NAME} MATCH :match {keyset}"
+        f"ORDER BY {FTS_TABLE_NAME}.rank, food.id LIMIT :limit"
+    )
+    rows = connection.execute(text(statement), parameters).all()
+
+    return [Food(id=row.id, name=row.name) for row in rows]
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_search_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """Return the dedicated thread pool for blocking food search work."""
+    global _search_executor
+    with _lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=settings.SEARCH_EXECUTOR_WORKERS,
+                thread_name_prefix="food-search",
+            )
+            logger.info(
+                f"Started food search executor with {settings.SEARCH_EXECUTOR_WORKERS} workers"
+            )
+        return _search_executor
+
+
+def shutdown_search_executor() -> None:
+    """Stop the search thread pool; it is recreated on next use."""
+    global _search_executor
+    with _lock:
+        executor, _search_executor = _search_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def run_in_search_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the search thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_search_executor(), partial(func, *args, **kwargs))
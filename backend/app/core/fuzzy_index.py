@@ -0,0 +1,171 @@
+import logging
+import re
+from array import array
+from itertools import combinations
+from typing import NamedTuple, Optional
+
+from .catalog_index import CatalogIndex
+from .compact_catalog import CompactCatalog, fold_case
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a food name or query into case-folded alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(fold_case(text))
+
+
+def deletes(word: str, max_distance: int) -> set[str]:
+    """Return every string reachable from ``word`` by up to ``max_distance`` deletions."""
+    variants = {word}
+    for distance in range(1, min(max_distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), distance):
+            variants.add("".join(c for i, c in enumerate(word) if i not in positions))
+    return variants
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Optimal string alignment distance, or None if it exceeds ``max_distance``."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                previous_previous is not None and i > 1 and j > 1
+                and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        previous_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def allowed_distance(token: str, max_distance: int) -> int:
+    """Scale the permitted typos with token length so short words stay precise."""
+    if len(token) <= 2:
+        return 0
+    if len(token) <= 5:
+        return min(1, max_distance)
+    return max_distance
+
+
+class _IndexState(NamedTuple):
+    catalog: CompactCatalog
+    name_lengths: array
+    token_postings: dict[str, array]
+    delete_words: dict[str, tuple[str, ...]]
+    max_distance: int
+    max_word_length: int
+
+
+class FuzzyIndex(CatalogIndex[_IndexState]):
+    """Typo-tolerant food lookup backed by a SymSpell deletion dictionary.
+
+    Every catalog token is indexed under all of its deletion variants, so a
+    misspelled query token only needs its own deletion variants looked up to
+    find the vocabulary words within ``max_distance`` edits.
+    """
+
+    _state_type = _IndexState
+
+    def build(self, catalog: CompactCatalog, max_distance: int = 2) -> None:
+        """Build the index over a catalog and swap it in atomically."""
+        name_lengths = array("I")
+        token_postings: dict[str, list[int]] = {}
+
+        for position, (_, name) in enumerate(catalog.rows()):
+            name_lengths.append(len(name))
+            for token in set(tokenize(name)):
+                token_postings.setdefault(token, []).append(position)
+
+        delete_words: dict[str, list[str]] = {}
+        for token in token_postings:
+            for variant in deletes(token, allowed_distance(token, max_distance)):
+                delete_words.setdefault(variant, []).append(token)
+
+        self._state = _IndexState(
+            catalog=catalog,
+            name_lengths=name_lengths,
+            token_postings={token: array("I", positions) for token, positions in token_postings.items()},
+            delete_words={variant: tuple(words) for variant, words in delete_words.items()},
+            max_distance=max_distance,
+            max_word_length=max(map(len, token_postings), default=0),
+        )
+        logger.info(
+            f"Built fuzzy index over {len(token_postings)} tokens ({len(delete_words)} deletions)"
+        )
+
+    def word_count(self, word: str) -> int:
+        """Number of foods whose name contains ``word`` as a token."""
+        state = self._state
+        if state is None:
+            return 0
+        postings = state.token_postings.get(word)
+        return len(postings) if postings is not None else 0
+
+    def lookup(self, token: str) -> dict[str, int]:
+        """Return catalog words within the allowed edit distance of ``token``."""
+        state = self._state
+        if state is None:
+            return {}
+
+        max_distance = allowed_distance(token, state.max_distance)
+        if len(token) > state.max_word_length + max_distance:
+            # Too long to be near any catalog word; its deletions grow quadratically
+            return {}
+        matches: dict[str, int] = {}
+        for variant in deletes(token, max_distance):
+            for word in state.delete_words.get(variant, ()):
+                if word in matches:
+                    continue
+                distance = edit_distance(token, word, max_distance)
+                if distance is not None:
+                    matches[word] = distance
+        return matches
+
+    def search(self, query: str, max_results: int) -> list[tuple[int, str]]:
+        """Return ``(id, name)`` pairs whose tokens all approximately match the query.
+
+        Foods are ordered by total edit distance, then by name length so the
+        plainest entry for an ingredient comes first.
+        """
+        state = self._state
+        tokens = tokenize(query)
+        if state is None or not tokens:
+            return []
+
+        scores: Optional[dict[int, int]] = None
+        for token in dict.fromkeys(tokens):
+            token_scores: dict[int, int] = {}
+            for word, distance in self.lookup(token).items():
+                for position in state.token_postings[word]:
+                    if distance < token_scores.get(position, distance + 1):
+                        token_scores[position] = distance
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    position: score + token_scores[position]
+                    for position, score in scores.items()
+                    if position in token_scores
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(
+            scores,
+            key=lambda position: (scores[position], state.name_lengths[position], position),
+        )
+        return [state.catalog.row_at(position) for position in ranked[:max_results]]
+
+
+# Shared index instance, built at startup from the Food table
+fuzzy_index = FuzzyIndex()
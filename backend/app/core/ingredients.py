@@ -0,0 +1,83 @@
+import logging
+import re
+from typing import Iterable
+
+from .config import settings
+from .fuzzy_index import fuzzy_index
+
+logger = logging.getLogger(__name__)
+
+# Plural endings tried in order when folding a word onto its singular form
+_PLURAL_SUFFIXES = (("ies", "y"), ("s", ""), ("es", ""))
+# Words with these endings are usually not plurals (glass, hummus, anise)
+_NON_PLURAL_ENDINGS = ("ss", "us", "is")
+
+# The catalog abbreviates heavily ("noodl", "ckd") and misses many real words,
+# so only two kinds of one-edit slip in longer words are fixed: a dropped
+# letter ("brocoli") and swapped letters ("chikcen")
+_TYPO_MIN_LENGTH = 5
+
+# Unicode-aware words (unlike the ASCII catalog tokenizer), so "jalapeño" or
+# "豆腐" are kept whole rather than split or dropped
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def _singular(word: str) -> str:
+    """Singular form of ``word`` if the catalog knows it, otherwise ``word``."""
+    if len(word) <= 3 or word.endswith(_NON_PLURAL_ENDINGS):
+        return word
+    for suffix, replacement in _PLURAL_SUFFIXES:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)] + replacement
+            if fuzzy_index.word_count(stem):
+                return stem
+    return word
+
+
+def canonical_word(word: str) -> str:
+    """Map a word onto the catalog vocabulary.
+
+    Plurals become the singular form when the catalog has it; a longer word
+    the catalog does not know is corrected when it is a catalog word with one
+    letter dropped or two letters swapped (ties go to the word more foods use).
+    """
+    singular = _singular(word)
+    if singular != word or fuzzy_index.word_count(word) or len(word) < _TYPO_MIN_LENGTH:
+        return singular
+
+    candidates = [
+        match for match, distance in fuzzy_index.lookup(word).items()
+        if distance == 1 and (len(match) == len(word) + 1 or sorted(match) == sorted(word))
+    ]
+    if not candidates:
+        return word
+    best = min(candidates, key=lambda match: (-fuzzy_index.word_count(match), match))
+    return _singular(best)
+
+
+def canonicalize_ingredient(ingredient: str) -> str:
+    """Canonical spelling of one ingredient: case-folded words separated by spaces.
+
+    The catalog vocabulary is ASCII, so only ASCII words are mapped onto it;
+    other words are kept as written.
+    """
+    return " ".join(
+        canonical_word(word) if word.isascii() else word
+        for word in _WORD_PATTERN.findall(ingredient.casefold())
+    )
+
+
+def canonicalize_ingredients(ingredients: Iterable[str]) -> list[str]:
+    """Canonicalize ingredients, dropping empty entries and duplicates.
+
+    Keeps the first MAX_RECIPE_INGREDIENTS distinct ingredients, in request
+    order, and stops canonicalizing once it has them.
+    """
+    canonical: dict[str, None] = {}
+    for ingredient in ingredients:
+        if len(canonical) >= settings.MAX_RECIPE_INGREDIENTS:
+            break
+        word = canonicalize_ingredient(ingredient)
+        if word:
+            canonical[word] = None
+    return list(canonical)
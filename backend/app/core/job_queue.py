@@ -0,0 +1,186 @@
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from ..models.schemas import JobQueueStats
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a full queue."""
+
+
+class Job:
+    """A submitted job and, once finished, its outcome."""
+
+    def __init__(self, job_id: str, payload: Any, priority: int, created_at: float) -> None:
+        self.id = job_id
+        self.payload = payload
+        self.priority = priority
+        self.status = "queued"
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.created_at = created_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+
+
+class JobQueue:
+    """In-process priority queue of jobs processed by a pool of asyncio workers.
+
+    Jobs with a higher priority start first, in submission order within a
+    priority. Finished jobs stay retrievable for ``ttl`` seconds. The
+    queue and workers belong to the event loop that called ``start``.
+
+    Jobs live in this process only: with several server workers, a job can
+    only be polled on the worker that accepted it, so the jobs API needs a
+    single worker or sticky routing.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int,
+        maxsize: int,
+        ttl: float,
+        clock=time.time,
+    ) -> None:
+        self._handler = handler
+        self.worker_count = workers
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._jobs: dict[str, Job] = {}
+        # Finished jobs in finishing order, for expiring them oldest first
+        self._finished: deque[tuple[float, str]] = deque()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: list[asyncio.Task] = []
+        self._sequence = itertools.count()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether workers are processing the queue."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Create the queue and start the workers on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"job-worker-{number}")
+            for number in range(self.worker_count)
+        ]
+        logger.info(f"Started {self.worker_count} job workers")
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs still queued or running are marked failed."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        for job in self._jobs.values():
+            if job.status in ("queued", "running"):
+                self._finish(job, error=RuntimeError("Server shut down before the job finished"))
+        self._queue = None
+
+    def submit(self, payload: Any, priority: int = 0) -> Job:
+        """Queue a job and return it immediately."""
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        self._expire()
+        if self._queue.qsize() >= self.maxsize:
+            self.rejected += 1
+            raise QueueFullError("Job queue is full")
+
+        job = Job(uuid.uuid4().hex, payload, priority, self._clock())
+        self._jobs[job.id] = job
+        self._queue.put_nowait((-priority, next(self._sequence), job.id))
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if unknown or expired."""
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """Return a job once it finishes, or as it stands after ``timeout`` seconds."""
+        job = self.get(job_id)
+        if job is not None and timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def _work(self) -> None:
+        """Run queued jobs one at a time until cancelled."""
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+            job.status = "running"
+            job.started_at = self._clock()
+            try:
+                result = await self._handler(job.payload)
+            except asyncio.CancelledError:
+                self._finish(job, error=RuntimeError("Server shut down before the job finished"))
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                self._finish(job, error=e)
+            else:
+                self._finish(job, result=result)
+
+    def _finish(self, job: Job, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """Record a job's outcome and wake anyone waiting for it."""
+        job.finished_at = self._clock()
+        if error is None:
+            job.status, job.result = "succeeded", result
+            self.succeeded += 1
+        else:
+            job.status, job.error = "failed", error
+            self.failed += 1
+        self._finished.append((job.finished_at + self.ttl, job.id))
+        job.done.set()
+
+    def _expire(self) -> None:
+        """Forget finished jobs older than the TTL."""
+        now = self._clock()
+        while self._finished and self._finished[0][0] <= now:
+            _, job_id = self._finished.popleft()
+            self._jobs.pop(job_id, None)
+
+    def clear(self) -> None:
+        """Forget every finished job."""
+        for _, job_id in self._finished:
+            self._jobs.pop(job_id, None)
+        self._finished.clear()
+
+    def stats(self) -> JobQueueStats:
+        """Return queue depth and job counters."""
+        self._expire()
+        running = sum(job.status == "running" for job in self._jobs.values())
+        return JobQueueStats(
+            workers=len(self._workers),
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            running=running,
+            stored=len(self._jobs),
+            submitted=self.submitted,
+            succeeded=self.succeeded,
+            failed=self.failed,
+            rejected=self.rejected,
+        )
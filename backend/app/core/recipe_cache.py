@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import Column, Engine, Float, MetaData, String, Table, Text, delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from .cache import SearchCache
+from .config import settings
+from .database import create_database_engine
+from ..models.schemas import Recipe, RecipeCacheStats
+
+logger = logging.getLogger(__name__)
+
+_recipes_adapter = TypeAdapter(list[Recipe])
+
+# Kept out of SQLModel.metadata so the food database never gets this table
+_metadata = MetaData()
+recipe_cache_table = Table(
+    "recipe_cache",
+    _metadata,
+    Column("key", String, primary_key=True),
+    Column("recipes", Text, nullable=False),
+    Column("expires_at", Float, nullable=False, index=True),
+)
+
+
+class RecipeCache:
+    """Two-tier cache of generated recipes.
+
+    Lookups go to a bounded in-process LRU + TTL tier first, then to an
+    optional SQLite table that survives restarts and is shared by every
+    worker. Persistent hits are promoted into the in-process tier. The
+    ``*_async`` methods do the SQLite work on a worker thread, so the event
+    loop only ever touches the in-process tier.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, database_url: Optional[str] = None, clock=time.time
+    ) -> None:
+        self.ttl = ttl
+        self.database_url = database_url
+        self._memory = SearchCache(maxsize, ttl, name="recipe")
+        self._clock = clock
+        self._engine: Optional[Engine] = None
+        self._engine_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+
+    def _persistent_engine(self) -> Optional[Engine]:
+        """Open the SQLite tier on first use and drop expired entries."""
+        if self.database_url is None:
+            return None
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    engine = create_database_engine(self.database_url)
+                    _metadata.create_all(engine)
+                    with engine.begin() as connection:
+                        connection.execute(delete(recipe_cache_table).where(
+                            recipe_cache_table.c.expires_at <= self._clock()
+                        ))
+                    self._engine = engine
+        return self._engine
+
+    def get(self, key: str) -> Optional[list[Recipe]]:
+        """Return cached recipes for ``key``, or None on a miss."""
+        recipes = self._memory.get(key)
+        if recipes is not None or self.database_url is None:
+            return recipes
+        return self._get_persistent(key)
+
+    async def get_async(self, key: str) -> Optional[list[Recipe]]:
+        """Like ``get``, reading the SQLite tier on a worker thread."""
+        recipes = self._memory.get(key)
+        if recipes is not None or self.database_url is None:
+            return recipes
+        return await asyncio.to_thread(self._get_persistent, key)
+
+    def _get_persistent(self, key: str) -> Optional[list[Recipe]]:
+        """Look ``key`` up in the SQLite tier, promoting a hit into memory."""
+        engine = self._persistent_engine()
+        with engine.connect() as connection:
+            row = connection.execute(
+                select(recipe_cache_table.c.recipes).where(
+                    recipe_cache_table.c.key == key,
+                    recipe_cache_table.c.expires_at > self._clock(),
+                )
+            ).first()
+        with self._stats_lock:
+            if row is None:
+                self.persistent_misses += 1
+                return None
+            self.persistent_hits += 1
+        recipes = _recipes_adapter.validate_json(row.recipes)
+        self._memory.set(key, recipes)
+        return recipes
+
+    def set(self, key: str, recipes: list[Recipe]) -> None:
+        """Store recipes for ``key`` in both tiers."""
+        self._memory.set(key, recipes)
+        if self.database_url is not None:
+            self._set_persistent(key, recipes)
+
+    async def set_async(self, key: str, recipes: list[Recipe]) -> None:
+        """Like ``set``, writing the SQLite tier on a worker thread."""
+        self._memory.set(key, recipes)
+        if self.database_url is not None:
+            await asyncio.to_thread(self._set_persistent, key, recipes)
+
+    def _set_persistent(self, key: str, recipes: list[Recipe]) -> None:
+        """Write recipes for ``key`` to the SQLite tier."""
+        engine = self._persistent_engine()
+        values = {
+            "key": key,
+            "recipes": _recipes_adapter.dump_json(recipes).decode("utf-8"),
+            "expires_at": self._clock() + self.ttl,
+        }
+        statement = insert(recipe_cache_table).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[recipe_cache_table.c.key],
+            set_={"recipes": statement.excluded.recipes, "expires_at": statement.excluded.expires_at},
+        )
+        with engine.begin() as connection:
+            connection.execute(statement)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        self._memory.clear()
+        engine = self._persistent_engine()
+        if engine is not None:
+            with engine.begin() as connection:
+                connection.execute(delete(recipe_cache_table))
+
+    def close(self) -> None:
+        """Close the SQLite tier, if open."""
+        with self._engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    def stats(self) -> RecipeCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._stats_lock:
+            return RecipeCacheStats(
+                **self._memory.stats().model_dump(),
+                persistent_enabled=self.database_url is not None,
+                persistent_hits=self.persistent_hits,
+                persistent_misses=self.persistent_misses,
+            )
+
+
+# Shared cache for generated recipes
+recipe_cache = RecipeCache(
+    settings.RECIPE_CACHE_SIZE,
+    settings.RECIPE_CACHE_TTL_SECONDS,
+    settings.RECIPE_CACHE_DATABASE_URL,
+)
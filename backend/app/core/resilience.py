@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_random_exponential,
+)
+
+from .config import settings
+from ..models.schemas import ResilienceStats
+
+logger = logging.getLogger(__name__)
+
+# Upstream status codes that signal overload or a transient outage
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed call may succeed if repeated (timeouts, overload, outages)."""
+    # google.genai lets httpx transport failures (connect, read timeouts, dropped
+    # connections) through unwrapped, and they do not subclass ConnectionError
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    # google.genai APIError (and the fake backend's errors) carry the HTTP status
+    return getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Recipe generation is temporarily unavailable")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fail fast while upstream is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``recovery_seconds``. It then lets a single probe call
+    through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float, clock=time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """State, moving from open to half-open once recovery time has passed (lock held)."""
+        if self._state == "open" and self._clock() - self._opened_at >= self.recovery_seconds:
+            self._state = "half_open"
+        return self._state
+
+    def _retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through (lock held)."""
+        return max(0.0, self._opened_at + self.recovery_seconds - self._clock())
+
+    def status(self) -> tuple[str, float]:
+        """Current state and, when open, seconds until a probe is allowed."""
+        with self._lock:
+            state = self._current_state()
+            return state, self._retry_after() if state == "open" else 0.0
+
+    def before_call(self) -> None:
+        """Admit a call, or raise CircuitOpenError if the breaker is rejecting calls."""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self.rejected += 1
+            # A probe is already in flight when half-open; ask clients to come back soon
+            raise CircuitOpenError(self._retry_after() or 1.0)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            if self._state != "closed":
+                logger.info("Circuit breaker closed")
+            self._state = "closed"
+            self._probe_in_flight = False
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Count an upstream failure, opening the breaker at the threshold."""
+        with self._lock:
+            self.consecutive_failures += 1
+            probe_failed = self._state == "half_open"
+            self._probe_in_flight = False
+            if probe_failed or (
+                self._state == "closed" and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._state = "open"
+                self._opened_at = self._clock()
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuit breaker opened after {self.consecutive_failures} failures; "
+                    f"rejecting calls for {self.recovery_seconds}s"
+                )
+
+    def record_ignored(self) -> None:
+        """Release a probe whose call failed for a reason unrelated to upstream health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self) -> None:
+        """Close the breaker and zero its counters."""
+        with self._lock:
+            self._state = "closed"
+            self._probe_in_flight = False
+            self.consecutive_failures = 0
+            self.times_opened = 0
+            self.rejected = 0
+
+
+class RetryBudget:
+    """Cap retries at a share of calls so retries cannot multiply load during an outage.
+
+    Every call deposits ``ratio`` tokens and every retry spends one; a floor
+    of ``min_per_second`` tokens per second keeps low-traffic retries working.
+    The balance never exceeds ``max_tokens``.
+    """
+
+    def __init__(
+        self, ratio: float, min_per_second: float, max_tokens: float = 10.0, clock=time.monotonic
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._updated_at = clock()
+        self.exhausted = 0
+
+    def _refill(self, amount: float) -> None:
+        """Add time-based and explicit tokens (lock held)."""
+        now = self._clock()
+        amount += (now - self._updated_at) * self.min_per_second
+        self._updated_at = now
+        self._tokens = min(self.max_tokens, self._tokens + amount)
+
+    def deposit(self) -> None:
+        """Record a new call."""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for a retry, or return False if the budget is exhausted."""
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            self.exhausted += 1
+            return False
+
+    def reset(self) -> None:
+        """Refill the budget and zero its counter."""
+        with self._lock:
+            self._tokens = self.max_tokens
+            self._updated_at = self._clock()
+            self.exhausted = 0
+
+    @property
+    def tokens(self) -> float:
+        """Current balance."""
+        with self._lock:
+            self._refill(0.0)
+            return self._tokens
+
+
+class ResilientCaller:
+    """Run upstream calls behind a circuit breaker with budgeted, jittered retries.
+
+    Retryable failures (see ``is_retryable``) are retried up to
+    ``max_attempts`` times with full-jitter exponential backoff, as long as
+    the retry budget allows and the next attempt would start before
+    ``deadline_seconds`` have passed. Each attempt is checked against the
+    breaker and reports its outcome to it.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        budget: RetryBudget,
+        max_attempts: int,
+        deadline_seconds: float,
+        backoff_initial_seconds: float,
+        backoff_max_seconds: float,
+    ) -> None:
+        self.breaker = breaker
+        self.budget = budget
+        self.max_attempts = max_attempts
+        self.deadline_seconds = deadline_seconds
+        self.backoff_initial_seconds = backoff_initial_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.retries = 0
+
+    def _spend_retry(self, retry_state) -> bool:
+        """Tenacity stop condition: stop when the retry budget is exhausted."""
+        if not self.budget.try_spend():
+            logger.warning("Retry budget exhausted; not retrying")
+            return True
+        self.retries += 1
+        return False
+
+    def _policy(self) -> dict:
+        """Keyword arguments shared by the sync and async tenacity retry loops."""
+        return {
+            "retry": retry_if_exception(is_retryable),
+            # Budget last: a token is only spent when no other condition stops the retry
+            "stop": (
+                stop_after_attempt(self.max_attempts)
+                | stop_before_delay(self.deadline_seconds)
+                | self._spend_retry
+            ),
+            "wait": wait_random_exponential(
+                multiplier=self.backoff_initial_seconds, max=self.backoff_max_seconds
+            ),
+            "reraise": True,
+        }
+
+    def record_error(self, error: BaseException) -> None:
+        """Report a failed attempt to the breaker."""
+        if is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_ignored()
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """Run a blocking call with retries."""
+        self.budget.deposit()
+        for attempt in Retrying(**self._policy()):
+            with attempt:
+                self.breaker.before_call()
+                try:
+                    result = func()
+                except Exception as e:
+                    self.record_error(e)
+                    raise
+                self.breaker.record_success()
+        return result
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await a call with retries, sleeping between attempts without blocking."""
+        self.budget.deposit()
+        async for attempt in AsyncRetrying(**self._policy()):
+            with attempt:
+                self.breaker.before_call()
+                try:
+                    result = await func()
+                except Exception as e:
+                    self.record_error(e)
+                    raise
+                except asyncio.CancelledError:
+                    self.breaker.record_ignored()
+                    raise
+                self.breaker.record_success()
+        return result
+
+    def reset(self) -> None:
+        """Close the breaker, refill the retry budget and zero the counters."""
+        self.breaker.reset()
+        self.budget.reset()
+        self.retries = 0
+
+    def stats(self) -> ResilienceStats:
+        """Return breaker state and retry counters."""
+        state, retry_after = self.breaker.status()
+        return ResilienceStats(
+            state=state,
+            consecutive_failures=self.breaker.consecutive_failures,
+            times_opened=self.breaker.times_opened,
+            rejected_calls=self.breaker.rejected,
+            retry_after_seconds=retry_after,
+            retries=self.retries,
+            retry_budget_tokens=self.budget.tokens,
+            retry_budget_exhausted=self.budget.exhausted,
+        )
+
+
+# Shared resilience policy for recipe backend calls
+recipe_backend_resilience = ResilientCaller(
+    CircuitBreaker(
+        settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD, settings.CIRCUIT_BREAKER_RECOVERY_SECONDS
+    ),
+    RetryBudget(settings.GEMINI_RETRY_BUDGET_RATIO, settings.GEMINI_RETRY_BUDGET_MIN_PER_SECOND),
+    max_attempts=settings.GEMINI_MAX_ATTEMPTS,
+    deadline_seconds=settings.GEMINI_TIMEOUT_SECONDS,
+    backoff_initial_seconds=settings.GEMINI_BACKOFF_INITIAL_SECONDS,
+    backoff_max_seconds=settings.GEMINI_BACKOFF_MAX_SECONDS,
+)
@@ -0,0 +1,164 @@
+"""Share one food catalog between the worker processes of a server.
+
+With ``uvicorn --workers N`` or gunicorn every worker runs the app lifespan.
+Workers register themselves in a small PID file next to the database while
+holding an exclusive file lock. The first worker to register builds the
+database and writes the compact catalog beside it. Later workers wait for
+the lock, reopen the database read-only and memory-map the catalog. The
+last worker to leave removes the shared files.
+
+Each worker remembers the content hash of the catalog its in-memory
+indexes were built from, so it can tell when another worker has reloaded
+the catalog (see ``app.core.catalog_reload.refresh_catalog``).
+"""
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from . import database
+from .cache import food_search_cache
+from .compact_catalog import CompactCatalog
+from .config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE_SUFFIX = ".lock"
+WORKERS_FILE_SUFFIX = ".workers"
+CATALOG_FILE_SUFFIX = ".catalog"
+
+# Content hash of the catalog this process's search indexes were built from
+_indexed_hash: Optional[str] = None
+
+
+def lock_path() -> str:
+    """Path of the lock file guarding the shared catalog."""
+    return settings.DATABASE_FILE_NAME + LOCK_FILE_SUFFIX
+
+
+def workers_path() -> str:
+    """Path of the file listing the PIDs of attached workers."""
+    return settings.DATABASE_FILE_NAME + WORKERS_FILE_SUFFIX
+
+
+def catalog_path() -> str:
+    """Path of the compact catalog shared by attached workers."""
+    return settings.DATABASE_FILE_NAME + CATALOG_FILE_SUFFIX
+
+
+@contextmanager
+def catalog_lock() -> Iterator[None]:
+    """Hold an exclusive lock across processes while building or attaching."""
+    if fcntl is None:
+        logger.warning("File locking is unavailable; run a single worker per database")
+        yield
+        return
+    with open(lock_path(), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def is_process_alive(pid: int) -> bool:
+    """Check whether a process with ``pid`` exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_workers() -> set[int]:
+    """Return the PIDs of attached workers that are still running.
+
+    PIDs of workers that died without detaching are dropped, so a crash
+    does not keep the catalog alive forever.
+    """
+    try:
+        with open(workers_path(), encoding="utf-8") as file:
+            pids = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return set()
+    return {pid for pid in pids if is_process_alive(pid)}
+
+
+def write_workers(pids: set[int]) -> None:
+    """Atomically replace the list of attached workers."""
+    temp_path = f"{workers_path()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(sorted(pids), file)
+    os.replace(temp_path, workers_path())
+
+
+def indexed_catalog_hash() -> Optional[str]:
+    """Content hash of the catalog this process's search indexes were built from."""
+    return _indexed_hash
+
+
+def index_catalog(catalog: CompactCatalog, content_hash: Optional[str]) -> None:
+    """Build this process's search indexes over ``catalog`` and remember its hash."""
+    global _indexed_hash
+    database.build_search_indexes(catalog)
+    food_search_cache.clear()
+    _indexed_hash = content_hash
+
+
+def load_shared_catalog() -> CompactCatalog:
+    """Memory-map the shared compact catalog, or pack it from the database if absent."""
+    if os.path.exists(catalog_path()):
+        return CompactCatalog.load(catalog_path())
+    return database.load_compact_catalog()
+
+
+def attach_shared_catalog() -> bool:
+    """Attach this process to the shared catalog, building it if no worker has.
+
+    Returns True if this process built the catalog.
+    """
+    global _indexed_hash
+    pid = os.getpid()
+    with catalog_lock():
+        workers = read_workers() - {pid}
+        builder = not workers or not os.path.exists(catalog_path())
+        if builder:
+            catalog = database.create_db_and_tables()
+            catalog.save(catalog_path())
+            _indexed_hash = database.get_catalog_hash()
+        else:
+            # Read together under the lock, so a concurrent reload cannot split them
+            catalog = CompactCatalog.load(catalog_path())
+            content_hash = database.get_catalog_hash()
+        write_workers(workers | {pid})
+
+    if not builder:
+        database.use_read_only_engine()
+        index_catalog(catalog, content_hash)
+        logger.info(f"Worker {pid} attached read-only to the shared catalog")
+    return builder
+
+
+def detach_shared_catalog() -> None:
+    """Detach this process; the last worker out removes the shared files."""
+    pid = os.getpid()
+    with catalog_lock():
+        workers = read_workers() - {pid}
+        if workers:
+            write_workers(workers)
+            logger.info(f"Worker {pid} detached, {len(workers)} still attached")
+            return
+        for path in (workers_path(), catalog_path()):
+            if os.path.exists(path):
+                os.remove(path)
+        # Also removes the WAL side files; the lock file stays, since a worker
+        # blocked on it would otherwise lock a file that no longer has a name
+        database.clear_db_and_tables()
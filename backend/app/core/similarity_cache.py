@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+from .config import settings
+from ..models.schemas import SimilarityCacheStats
+
+logger = logging.getLogger(__name__)
+
+# Universal hashing modulo a Mersenne prime simulates random permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def _token_hash(token: str) -> int:
+    """Stable 64-bit hash of a token (unlike hash(), not salted per process)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def jaccard(first: frozenset, second: frozenset) -> float:
+    """Jaccard similarity of two sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    """Compute MinHash signatures whose agreement estimates Jaccard similarity."""
+
+    def __init__(self, num_permutations: int, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_permutations)
+        ]
+
+    def signature(self, tokens: frozenset) -> tuple[int, ...]:
+        """Return the MinHash signature of a non-empty token set."""
+        hashes = [_token_hash(token) for token in tokens]
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+            for a, b in self._permutations
+        )
+
+
+class _Entry(NamedTuple):
+    namespace: Hashable
+    tokens: frozenset
+    buckets: tuple
+    value: Any
+    expires_at: float
+
+
+class SimilarityCache:
+    """Bounded LRU + TTL cache looked up by approximate token-set similarity.
+
+    Each entry's MinHash signature is split into ``bands`` bands, and every
+    band is a bucket key in a locality-sensitive hashing index. A lookup
+    collects entries sharing at least one bucket, in the same namespace,
+    then returns the value of the candidate with the highest exact Jaccard
+    similarity, if it reaches ``threshold``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        threshold: float,
+        num_permutations: int = 64,
+        bands: int = 16,
+        timer=time.monotonic,
+    ) -> None:
+        if num_permutations % bands:
+            raise ValueError("num_permutations must be a multiple of bands")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._rows = num_permutations // bands
+        self._hasher = MinHasher(num_permutations)
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._buckets: dict[tuple, set[tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _bucket_keys(self, namespace: Hashable, tokens: frozenset) -> tuple:
+        """LSH bucket keys for a token set: one per signature band."""
+        signature = self._hasher.signature(tokens)
+        return tuple(
+            (namespace, band, signature[start:start + self._rows])
+            for band, start in enumerate(range(0, len(signature), self._rows))
+        )
+
+    def get(self, namespace: Hashable, tokens: frozenset) -> Optional[Any]:
+        """Return the value stored for the most similar token set, or None."""
+        if self.maxsize <= 0 or not tokens:
+            return None
+        buckets = self._bucket_keys(namespace, tokens)
+        now = self._timer()
+        with self._lock:
+            best_key, best_similarity = None, self.threshold
+            candidates = set().union(*(self._buckets.get(bucket, ()) for bucket in buckets))
+            for key in candidates:
+                entry = self._entries[key]
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    continue
+                similarity = jaccard(tokens, entry.tokens)
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+
+            if best_key is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key].value
+
+    def set(self, namespace: Hashable, tokens: frozenset, value: Any) -> None:
+        """Store a value for a token set, evicting the least recently used entry if full."""
+        if self.maxsize <= 0 or not tokens:
+            return
+        key = (namespace, tokens)
+        buckets = self._bucket_keys(namespace, tokens)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.maxsize:
+                self._remove(next(iter(self._entries)))
+            self._entries[key] = _Entry(namespace, tokens, buckets, value, self._timer() + self.ttl)
+            for bucket in buckets:
+                self._buckets.setdefault(bucket, set()).add(key)
+
+    def _remove(self, key: tuple) -> None:
+        """Drop an entry and its bucket memberships (lock held)."""
+        entry = self._entries.pop(key)
+        for bucket in entry.buckets:
+            members = self._buckets[bucket]
+            members.discard(key)
+            if not members:
+                del self._buckets[bucket]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> SimilarityCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return SimilarityCacheStats(
+                enabled=self.maxsize > 0,
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                threshold=self.threshold,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared approximate cache for generated recipes (size 0 when disabled)
+recipe_similarity_cache = SimilarityCache(
+    settings.RECIPE_SIMILARITY_CACHE_SIZE if settings.RECIPE_SIMILARITY_ENABLED else 0,
+    settings.RECIPE_CACHE_TTL_SECONDS,
+    settings.RECIPE_SIMILARITY_THRESHOLD,
+    num_permutations=settings.RECIPE_SIMILARITY_PERMUTATIONS,
+    bands=settings.RECIPE_SIMILARITY_BANDS,
+)
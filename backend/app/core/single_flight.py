@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Any, Awaitable, Callable, Hashable
+
+from ..models.schemas import SingleFlightStats
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesce concurrent async calls that share a key into one execution.
+
+    The first caller for a key starts the call as its own task; callers
+    arriving while it is in flight await the same task and receive the same
+    result or exception. Every caller awaits through ``asyncio.shield``, so
+    one caller disconnecting does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``func()``, sharing an in-flight call for ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(partial(self._finished, key))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a completed call so the next caller starts a fresh one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here too, in case every waiter went away first
+            logger.debug(f"Coalesced call failed: {task.exception()!r}")
+
+    def stats(self) -> SingleFlightStats:
+        """Return counters for executed and coalesced calls."""
+        requests = self.executions + self.coalesced
+        return SingleFlightStats(
+            executions=self.executions,
+            coalesced=self.coalesced,
+            in_flight=len(self._calls),
+            saved_ratio=self.coalesced / requests if requests else 0.0,
+        )
@@ -0,0 +1,207 @@
+"""Prebuilt, versioned catalog snapshots.
+
+A snapshot is a directory holding everything a worker needs to serve food
+searches without touching the ingredients CSV:
+
+    catalog-<version>/
+        manifest.json    format version, CSV hash, row count, index settings
+        database.db      SQLite food table plus its FTS5 index
+        catalog.bin      CompactCatalog, memory-mapped at startup
+        indexes.pickle   trigram, prefix and fuzzy index contents
+
+Build one with ``python -m app.core.snapshot build`` and start the API
+with ``CATALOG_SNAPSHOT_PATH`` pointing at it.
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlmodel import SQLModel, create_engine
+
+from .autocomplete import PrefixIndex, prefix_index
+from .cache import food_search_cache
+from .compact_catalog import CompactCatalog
+from .config import settings
+from .database import (
+    SNAPSHOT_DATABASE_FILE_NAME,
+    build_search_indexes,
+    bulk_load_ingredients,
+    create_fts_table,
+    file_sha256,
+    load_compact_catalog,
+)
+from .fuzzy_index import FuzzyIndex, fuzzy_index
+from .trigram_index import TrigramIndex, trigram_index
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 2
+MANIFEST_FILE_NAME = "manifest.json"
+CATALOG_FILE_NAME = "catalog.bin"
+INDEXES_FILE_NAME = "indexes.pickle"
+
+
+def snapshot_version(content_hash: str) -> str:
+    """Version string identifying a snapshot format and CSV content."""
+    return f"v{SNAPSHOT_FORMAT_VERSION}-{content_hash[:16]}"
+
+
+def index_settings() -> dict:
+    """Settings the stored indexes were built with; a mismatch forces a rebuild."""
+    return {
+        "hot_prefix_length": settings.MIN_SEARCH_LENGTH,
+        "hot_results": settings.MAX_FOOD_RESULTS,
+        "fuzzy_max_edit_distance": settings.FUZZY_MAX_EDIT_DISTANCE,
+    }
+
+
+def build_snapshot(output_dir: str, csv_path: Optional[str] = None) -> str:
+    """Build a snapshot of the ingredients CSV under ``output_dir``.
+
+    Returns the snapshot directory. Building is idempotent: if a snapshot
+    for the same CSV content and format already exists it is reused.
+    """
+    csv_path = csv_path or settings.INGREDIENTS_CSV_PATH
+    content_hash = file_sha256(csv_path)
+    version = snapshot_version(content_hash)
+    target = os.path.join(output_dir, f"catalog-{version}")
+    if os.path.exists(os.path.join(target, MANIFEST_FILE_NAME)):
+        logger.info(f"Catalog snapshot {version} already exists at {target}")
+        return target
+
+    os.makedirs(output_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".catalog-", dir=output_dir)
+    try:
+        build_engine = create_engine(
+            f"sqlite:///{os.path.join(staging, SNAPSHOT_DATABASE_FILE_NAME)}"
+        )
+        SQLModel.metadata.create_all(build_engine)
+        create_fts_table(build_engine)
+        food_count = bulk_load_ingredients(csv_path, content_hash, build_engine)
+        with build_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("VACUUM")
+        catalog = load_compact_catalog(build_engine)
+        build_engine.dispose()
+
+        catalog.save(os.path.join(staging, CATALOG_FILE_NAME))
+        with open(os.path.join(staging, INDEXES_FILE_NAME), "wb") as file:
+            pickle.dump(_build_index_states(catalog), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "version": version,
+            "csv_sha256": content_hash,
+            "food_count": food_count,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "index_settings": index_settings(),
+        }
+        with open(os.path.join(staging, MANIFEST_FILE_NAME), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+
+        # mkdtemp creates the directory 0700; the serving user may not be the builder
+        os.chmod(staging, 0o755)
+        os.rename(staging, target)
+    except OSError:
+        # Another builder may have published the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.exists(os.path.join(target, MANIFEST_FILE_NAME)):
+            raise
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info(f"Built catalog snapshot {version} at {target}")
+    return target
+
+
+def _build_index_states(catalog: CompactCatalog) -> dict:
+    """Build every search index over ``catalog`` and export their contents."""
+    trigram = TrigramIndex()
+    trigram.build(catalog)
+    prefix = PrefixIndex()
+    prefix.build(catalog, settings.MIN_SEARCH_LENGTH, settings.MAX_FOOD_RESULTS)
+    fuzzy = FuzzyIndex()
+    fuzzy.build(catalog, settings.FUZZY_MAX_EDIT_DISTANCE)
+    return {
+        "trigram": trigram.export_state(),
+        "prefix": prefix.export_state(),
+        "fuzzy": fuzzy.export_state(),
+    }
+
+
+def read_manifest(snapshot_path: str) -> dict:
+    """Read and validate a snapshot manifest."""
+    with open(os.path.join(snapshot_path, MANIFEST_FILE_NAME), encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported catalog snapshot format {manifest.get('format_version')} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    return manifest
+
+
+def open_snapshot(snapshot_path: str) -> dict:
+    """Map a snapshot's catalog and load its search indexes.
+
+    The database itself is opened read-only by the engine (see
+    ``snapshot_database_url``). Returns the snapshot manifest.
+    """
+    started = time.perf_counter()
+    manifest = read_manifest(snapshot_path)
+    catalog = CompactCatalog.load(os.path.join(snapshot_path, CATALOG_FILE_NAME))
+
+    if manifest["index_settings"] == index_settings():
+        with open(os.path.join(snapshot_path, INDEXES_FILE_NAME), "rb") as file:
+            states = pickle.load(file)
+        trigram_index.import_state(catalog, states["trigram"])
+        prefix_index.import_state(catalog, states["prefix"])
+        if settings.FUZZY_SEARCH_ENABLED:
+            fuzzy_index.import_state(catalog, states["fuzzy"])
+    else:
+        logger.warning("Snapshot indexes were built with different settings, rebuilding")
+        build_search_indexes(catalog)
+    food_search_cache.clear()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"Opened catalog snapshot {manifest['version']} "
+        f"({manifest['food_count']} foods) in {elapsed_ms:.1f} ms"
+    )
+    return manifest
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point for building and inspecting snapshots."""
+    parser = argparse.ArgumentParser(prog="python -m app.core.snapshot", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a snapshot from the ingredients CSV")
+    build.add_argument("--output", default=settings.CATALOG_SNAPSHOT_DIR,
+                       help="Directory to place the snapshot in")
+    build.add_argument("--csv", default=settings.INGREDIENTS_CSV_PATH,
+                       help="Ingredients CSV to build from")
+
+    inspect = commands.add_parser("inspect", help="Print a snapshot manifest")
+    inspect.add_argument("path", help="Snapshot directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        print(build_snapshot(args.output, args.csv))
+    else:
+        print(json.dumps(read_manifest(args.path), indent=2))
+
+
+if __name__ == "__main__":
+    from ..utils.logger import setup_logging
+
+    setup_logging()
+    main()
@@ -0,0 +1,98 @@
+import logging
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple, Optional
+
+from .catalog_index import CatalogIndex
+from .compact_catalog import CompactCatalog, fold_case
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_LENGTH = 3
+
+_LIKE_WILDCARDS = ("%", "_")
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the distinct trigrams of an already case-folded string."""
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+
+class _IndexState(NamedTuple):
+    catalog: CompactCatalog
+    postings: dict[str, array]
+
+
+class TrigramIndex(CatalogIndex[_IndexState]):
+    """In-memory trigram posting-list index over food names.
+
+    Posting lists hold row positions in a :class:`CompactCatalog`, which keeps
+    rows in ascending id order, so candidates come out in the same order
+    SQLite returns rows for an unordered ``LIKE`` scan and a search can stop
+    as soon as it has enough verified matches.
+    """
+
+    _state_type = _IndexState
+
+    def __len__(self) -> int:
+        state = self._state
+        return len(state.catalog) if state else 0
+
+    def build(self, catalog: CompactCatalog) -> None:
+        """Build the index over a catalog and swap it in atomically."""
+        postings: dict[str, list[int]] = {}
+        for position, (_, name) in enumerate(catalog.rows()):
+            for gram in trigrams(fold_case(name)):
+                postings.setdefault(gram, []).append(position)
+
+        self._state = _IndexState(
+            catalog=catalog,
+            postings={gram: array("I", positions) for gram, positions in postings.items()},
+        )
+        logger.info(f"Built trigram index over {len(catalog)} foods ({len(postings)} trigrams)")
+
+    def search(
+        self, substr: str, max_results: int, after_id: Optional[int] = None
+    ) -> Optional[list[tuple[int, str]]]:
+        """Return ``(id, name)`` pairs whose name contains ``substr``.
+
+        Returns ``None`` when the index cannot answer the query with exact
+        ``LIKE`` semantics (not built yet, or the query contains LIKE
+        wildcards), in which case the caller should query the database.
+        """
+        state = self._state
+        if state is None or any(wildcard in substr for wildcard in _LIKE_WILDCARDS):
+            return None
+
+        catalog = state.catalog
+        needle = fold_case(substr)
+        grams = trigrams(needle)
+        if not grams:
+            # Too short to have a trigram: scan the catalog buffer instead
+            return catalog.search(substr, max_results, after_id)
+
+        lists = []
+        for gram in grams:
+            posting = state.postings.get(gram)
+            if posting is None:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        candidates = lists[0]
+        if len(lists) > 1:
+            candidates = sorted(set(candidates).intersection(*lists[1:]))
+        start = catalog.position_after(after_id)
+        candidates = candidates[bisect_right(candidates, start - 1):]
+
+        results = []
+        encoded = needle.encode("utf-8")
+        for position in candidates:
+            if catalog.folded_contains(position, encoded):
+                results.append(catalog.row_at(position))
+                if len(results) >= max_results:
+                    break
+        return results
+
+
+# Shared index instance, built at startup from the Food table
+trigram_index = TrigramIndex()
@@ -1,11 +1,18 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
 from .api.v1 import foods, recipes
+from .core.catalog_reload import poll_catalog, watch_catalog
 from .core.config import settings
-from .core.database import clear_db_and_tables, create_db_and_tables
+from .core.executor import shutdown_search_executor
+from .core.recipe_cache import recipe_cache
 from .core.security import setup_cors
+from .core.shared_catalog import attach_shared_catalog, detach_shared_catalog
+from .core.snapshot import open_snapshot
+from .services.recipe_backends import recipe_backend
+from .services.recipe_service import recipe_jobs
 from .utils.logger import setup_logging
 
 # Setup logging
@@ -16,10 +23,28 @@ setup_logging()
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
     # Startup
-    create_db_and_tables()
+    if settings.CATALOG_SNAPSHOT_PATH:
+        open_snapshot(settings.CATALOG_SNAPSHOT_PATH)
+    else:
+        attach_shared_catalog()
+    stop_watching = asyncio.Event()
+    watchers = []
+    if not settings.CATALOG_SNAPSHOT_PATH:
+        if settings.CATALOG_WATCH_ENABLED:
+            watchers.append(asyncio.create_task(watch_catalog(stop_watching)))
+        if settings.CATALOG_REFRESH_INTERVAL_SECONDS > 0:
+            watchers.append(asyncio.create_task(poll_catalog(stop_watching)))
+    await recipe_jobs.start()
     yield
     # Shutdown
-    clear_db_and_tables()
+    await recipe_jobs.stop()
+    stop_watching.set()
+    await asyncio.gather(*watchers)
+    shutdown_search_executor()
+    recipe_cache.close()
+    if not settings.CATALOG_SNAPSHOT_PATH:
+        # Snapshots are shared, read-only artifacts and must outlive the process
+        detach_shared_catalog()
 
 
 def create_app() -> FastAPI:
@@ -44,10 +69,10 @@ def create_app() -> FastAPI:
 
     @app.get("/health")
     async def health_check():
-        from .services.recipe_service import client
         return {
             "status": "healthy",
-            "api_available": hasattr(client.models, "generate_content"),
+            "api_available": recipe_backend.available(),
+            "recipe_backend": recipe_backend.name,
         }
 
     return app
@@ -5,3 +5,9 @@ class Food(SQLModel, table=True):
     """Database model for food ingredients."""
     id: int | None = Field(default=None, primary_key=True)
     name: str = Field()
+
+
+class CatalogMetadata(SQLModel, table=True):
+    """Database model for key/value facts about the loaded catalog."""
+    key: str = Field(primary_key=True)
+    value: str = Field()
@@ -1,6 +1,9 @@
-from typing import List
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from ..core.config import settings
+from .database import Food
 
 
 class Recipe(BaseModel):
@@ -12,7 +15,7 @@ class Recipe(BaseModel):
 
 class RecipeRequest(BaseModel):
     """Schema for recipe generation request."""
-    ingredients: List[str]
+    ingredients: List[Annotated[str, Field(max_length=settings.MAX_INGREDIENT_LENGTH)]]
     max_recipes: int = 3
     cuisine_style: str = "any"
 
@@ -20,3 +23,135 @@ class RecipeRequest(BaseModel):
 class RecipeResponse(BaseModel):
     """Schema for recipe generation response."""
     recipes: List[Recipe]
+
+
+class RecipeJobRequest(RecipeRequest):
+    """Schema for submitting a background recipe generation job."""
+    priority: int = Field(0, ge=0, le=9, description="Jobs with a higher priority start first")
+
+
+class RecipeJobStatus(BaseModel):
+    """Schema for the state of a recipe generation job (times are Unix timestamps)."""
+    id: str
+    status: str
+    priority: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    recipes: Optional[List[Recipe]] = None
+    error: Optional[str] = None
+
+
+class PackedRecipes(BaseModel):
+    """Schema for one request's answer within a packed Gemini prompt."""
+    request_index: int
+    recipes: list[Recipe]
+
+
+class RecipeBatchRequest(BaseModel):
+    """Schema for generating recipes for several requests at once."""
+    requests: List[RecipeRequest] = Field(
+        ..., min_length=1, max_length=settings.MAX_BATCH_RECIPE_REQUESTS
+    )
+    pack_prompts: bool = False
+
+
+class RecipeBatchItem(BaseModel):
+    """Schema for the outcome of one request in a batch."""
+    index: int
+    recipes: Optional[List[Recipe]] = None
+    error: Optional[str] = None
+
+
+class RecipeBatchResponse(BaseModel):
+    """Schema for batch recipe generation response, in request order."""
+    results: List[RecipeBatchItem]
+
+
+class CacheStats(BaseModel):
+    """Schema for cache hit/miss statistics."""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hit_rate: float
+
+
+class RecipeCacheStats(CacheStats):
+    """Schema for recipe cache statistics, including the persistent tier."""
+    persistent_enabled: bool
+    persistent_hits: int
+    persistent_misses: int
+
+
+class SimilarityCacheStats(BaseModel):
+    """Schema for approximate (near-duplicate) recipe cache statistics."""
+    enabled: bool
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    threshold: float
+    hit_rate: float
+
+
+class ResilienceStats(BaseModel):
+    """Schema for circuit breaker state and retry counters."""
+    state: str
+    consecutive_failures: int
+    times_opened: int
+    rejected_calls: int
+    retry_after_seconds: float
+    retries: int
+    retry_budget_tokens: float
+    retry_budget_exhausted: int
+
+
+class JobQueueStats(BaseModel):
+    """Schema for background job queue statistics."""
+    workers: int
+    queued: int
+    running: int
+    stored: int
+    submitted: int
+    succeeded: int
+    failed: int
+    rejected: int
+
+
+class SingleFlightStats(BaseModel):
+    """Schema for request coalescing statistics."""
+    executions: int
+    coalesced: int
+    in_flight: int
+    saved_ratio: float
+
+
+class CatalogReloadResult(BaseModel):
+    """Schema for the outcome of reloading the ingredient catalog."""
+    inserted: int
+    deleted: int
+    food_count: int
+    content_hash: str
+    elapsed_ms: float
+
+
+class FoodBatchSearchRequest(BaseModel):
+    """Schema for resolving several ingredient strings at once."""
+    queries: List[str] = Field(..., min_length=1, max_length=settings.MAX_BATCH_SEARCH_QUERIES)
+    max_results: Optional[int] = Field(None, ge=1, le=settings.MAX_FOOD_PAGE_SIZE)
+
+
+class FoodBatchSearchResult(BaseModel):
+    """Schema for the matches of a single query in a batch search."""
+    query: str
+    foods: List[Food]
+    error: Optional[str] = None
+
+
+class FoodBatchSearchResponse(BaseModel):
+    """Schema for batch food search response."""
+    results: List[FoodBatchSearchResult]
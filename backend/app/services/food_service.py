@@ -1,9 +1,24 @@
+import asyncio
 import logging
 from typing import List
 
-from ..core.database import select_foods_containing_substring
+from ..core.autocomplete import prefix_index
+from ..core.cache import food_search_cache
+from ..core.catalog_reload import reload_catalog
+from ..core.compact_catalog import fold_case
+from ..core.database import (
+    select_foods_containing_substring,
+    select_foods_containing_substrings,
+    select_foods_matching_fts,
+    select_foods_matching_fts_many,
+    select_foods_with_word_prefix,
+)
 from ..core.config import settings
+from ..core.executor import run_in_search_executor
+from ..core.fuzzy_index import fuzzy_index
+from ..core.trigram_index import trigram_index
 from ..models.database import Food
+from ..models.schemas import CacheStats, CatalogReloadResult
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,12 +28,150 @@ class FoodService:
     """Service for handling food/ingredient search operations."""
 
     @staticmethod
-    def search_foods(query: str, max_results: int = None) -> List[Food]:
-        """Search for foods containing the given query string."""
+    def search_foods(query: str, max_results: int = None, after_id: int = None) -> List[Food]:
+        """Search for foods matching the given query string.
+
+        Substring modes return foods ordered by id; "fts" mode returns them
+        ordered by relevance.
+        """
+        if max_results is None:
+            max_results = settings.MAX_FOOD_RESULTS
+
+        cache_key = FoodService._cache_key(query, max_results, after_id)
+        cached = food_search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        results = FoodService._search_foods_uncached(query, max_results, after_id)
+        food_search_cache.set(cache_key, tuple(results))
+        return results
+
+    @staticmethod
+    def search_foods_batch(queries: List[str], max_results: int = None) -> List[List[Food]]:
+        """Search for several queries at once, returning matches in query order.
+
+        Cached queries are answered directly; the rest are resolved together
+        from the in-memory index or in a single pass over the database.
+        """
+        if max_results is None:
+            max_results = settings.MAX_FOOD_RESULTS
+
+        results: dict[str, List[Food]] = {}
+        misses = []
+        for query in dict.fromkeys(queries):
+            cached = food_search_cache.get(FoodService._cache_key(query, max_results))
+            if cached is not None:
+                results[query] = list(cached)
+            else:
+                misses.append(query)
+
+        if misses:
+            found = FoodService._search_foods_batch_uncached(misses, max_results)
+            for query, foods in found.items():
+                food_search_cache.set(FoodService._cache_key(query, max_results), tuple(foods))
+                results[query] = foods
+
+        return [results[query] for query in queries]
+
+    @staticmethod
+    def _cache_key(query: str, max_results: int, after_id: int = None) -> tuple:
+        """Build the search cache key for a query."""
+        # Every search mode is ASCII case-insensitive, so folded queries share entries
+        return (settings.FOOD_SEARCH_MODE, fold_case(query), max_results, after_id)
+
+    @staticmethod
+    def _search_foods_batch_uncached(
+        queries: List[str], max_results: int
+    ) -> dict[str, List[Food]]:
+        """Resolve several queries with one index pass or one database session."""
+        found: dict[str, List[Food]] = {}
+        if settings.FOOD_SEARCH_MODE == "fts":
+            found = select_foods_matching_fts_many(queries, max_results)
+        elif settings.FOOD_SEARCH_MODE == "trigram":
+            for query in queries:
+                matches = trigram_index.search(query, max_results)
+                if matches is not None:
+                    found[query] = [Food(id=food_id, name=name) for food_id, name in matches]
+
+        pending = [query for query in queries if query not in found]
+        if pending:
+            found.update(select_foods_containing_substrings(pending, max_results))
+
+        if settings.FUZZY_SEARCH_ENABLED:
+            for query, foods in found.items():
+                if not foods:
+                    found[query] = FoodService.fuzzy_search_foods(query, max_results)
+        return found
+
+    @staticmethod
+    def _search_foods_uncached(query: str, max_results: int, after_id: int) -> List[Food]:
+        """Run a food search against the configured index or the database."""
+        results = None
+        if settings.FOOD_SEARCH_MODE == "fts":
+            results = select_foods_matching_fts(query, max_results, after_id)
+        elif settings.FOOD_SEARCH_MODE == "trigram":
+            matches = trigram_index.search(query, max_results, after_id)
+            if matches is not None:
+                results = [Food(id=food_id, name=name) for food_id, name in matches]
+
+        if results is None:
+            results = select_foods_containing_substring(query, max_results, after_id)
+
+        # Only the first page falls back, fuzzy matches have no cursor order
+        if not results and after_id is None and settings.FUZZY_SEARCH_ENABLED:
+            results = FoodService.fuzzy_search_foods(query, max_results)
+        return results
+
+    @staticmethod
+    def fuzzy_search_foods(query: str, max_results: int = None) -> List[Food]:
+        """Search for foods whose names approximately match a misspelled query."""
+        if max_results is None:
+            max_results = settings.MAX_FOOD_RESULTS
+
+        matches = fuzzy_index.search(query, max_results)
+        return [Food(id=food_id, name=name) for food_id, name in matches]
+
+    @staticmethod
+    def autocomplete_foods(prefix: str, max_results: int = None) -> List[Food]:
+        """Complete a partially typed ingredient from the in-memory prefix index."""
         if max_results is None:
             max_results = settings.MAX_FOOD_RESULTS
 
-        return select_foods_containing_substring(query, max_results)
+        matches = prefix_index.complete(prefix, max_results)
+        if matches is None:
+            return select_foods_with_word_prefix(prefix, max_results)
+        return [Food(id=food_id, name=name) for food_id, name in matches]
+
+    async def search_foods_async(
+        self, query: str, max_results: int = None, after_id: int = None
+    ) -> List[Food]:
+        """Run search_foods on the search thread pool."""
+        return await run_in_search_executor(
+            self.search_foods, query, max_results=max_results, after_id=after_id
+        )
+
+    async def search_foods_batch_async(
+        self, queries: List[str], max_results: int = None
+    ) -> List[List[Food]]:
+        """Run search_foods_batch on the search thread pool."""
+        return await run_in_search_executor(
+            self.search_foods_batch, queries, max_results=max_results
+        )
+
+    async def autocomplete_foods_async(self, prefix: str, max_results: int = None) -> List[Food]:
+        """Run autocomplete_foods on the search thread pool."""
+        return await run_in_search_executor(
+            self.autocomplete_foods, prefix, max_results=max_results
+        )
+
+    async def reload_catalog_async(self) -> CatalogReloadResult:
+        """Reload the catalog from the CSV on a worker thread, off the search pool."""
+        return await asyncio.to_thread(reload_catalog)
+
+    @staticmethod
+    def cache_stats() -> CacheStats:
+        """Return hit/miss/eviction counters for the search result cache."""
+        return food_search_cache.stats()
 
     @staticmethod
     def validate_search_query(query: str) -> bool:
@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Protocol
+
+from ..core.config import settings
+from ..models.schemas import PackedRecipes, Recipe
+
+logger = logging.getLogger(__name__)
+
+# Gemini client, created on first use so that importing this module (and
+# starting the app) does not pay for importing google.genai
+client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared Gemini client, creating it on first use."""
+    global client
+    if client is None:
+        with _client_lock:
+            if client is None:
+                from google import genai
+
+                client = genai.Client()
+    return client
+
+
+def gemini_available() -> bool:
+    """Whether the Gemini SDK is installed and an API key is configured.
+
+    Checked without importing the SDK or constructing the client.
+    """
+    has_key = bool(os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"))
+    return has_key and importlib.util.find_spec("google.genai") is not None
+
+
+class RecipeBackend(Protocol):
+    """A model that answers recipe prompts.
+
+    ``config`` carries the response MIME type and schema; ``generate`` and
+    ``generate_async`` return the response parsed into that schema, and
+    ``stream_async`` yields the raw response text as it arrives.
+    """
+
+    name: str
+
+    def available(self) -> bool:
+        """Whether the backend is configured and can serve requests."""
+        ...
+
+    def generate(self, contents: str, config: dict) -> Any:
+        """Answer a prompt, blocking the calling thread."""
+        ...
+
+    async def generate_async(self, contents: str, config: dict) -> Any:
+        """Answer a prompt without blocking the event loop."""
+        ...
+
+    def stream_async(self, contents: str, config: dict) -> AsyncIterator[str]:
+        """Yield the text of the answer to a prompt chunk by chunk."""
+        ...
+
+
+class GeminiRecipeBackend:
+    """Recipe backend calling the Gemini API."""
+
+    name = "gemini"
+
+    def available(self) -> bool:
+        """Whether the Gemini SDK is installed and an API key is configured."""
+        return gemini_available()
+
+    def generate(self, contents: str, config: dict) -> Any:
+        """Answer a prompt with the sync Gemini client."""
+        response = get_client().models.generate_content(
+            model=settings.GEMINI_MODEL,
+            config=config,
+            contents=contents
+        )
+        return response.parsed
+
+    async def generate_async(self, contents: str, config: dict) -> Any:
+        """Answer a prompt with the async Gemini client."""
+        response = await get_client().aio.models.generate_content(
+            model=settings.GEMINI_MODEL,
+            config=config,
+            contents=contents
+        )
+        return response.parsed
+
+    async def stream_async(self, contents: str, config: dict) -> AsyncIterator[str]:
+        """Stream the answer to a prompt with the async Gemini client."""
+        stream = await get_client().aio.models.generate_content_stream(
+            model=settings.GEMINI_MODEL,
+            config=config,
+            contents=contents
+        )
+        async for chunk in stream:
+            yield chunk.text or ""
+
+
+class FakeBackendError(RuntimeError):
+    """Failure injected by the fake recipe backend."""
+
+    # Reported like an upstream 503, so it exercises retries and the circuit breaker
+    code = 503
+
+
+# Pieces of the prompts built by RecipeService that the fake backend reads back
+_MAX_RECIPES_PATTERN = re.compile(r"up to (\d+) recipes")
+_CUISINE_PATTERN = re.compile(r"in the style of (.+?) cuisine")
+_INGREDIENTS_PATTERN = re.compile(r"following ingredients: (.*)\.\s*$")
+_PACKED_QUERY_PATTERN = re.compile(r"^(\d+)\. (.*)$", re.MULTILINE)
+
+_FAKE_DISHES = ("Skillet", "Stew", "Salad", "Bake", "Soup", "Stir-Fry", "Bowl", "Curry")
+
+
+class FakeRecipeBackend:
+    """Deterministic local recipe backend for load testing without network access.
+
+    Answers are derived from the prompt alone, so the same prompt always gets
+    the same schema-valid recipes. Each call first waits for a latency drawn
+    from a log-normal distribution (``latency_median_ms``, ``latency_sigma``)
+    and then fails with probability ``error_rate``; the draws come from a
+    seeded generator, so a run is reproducible.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_median_ms: float = 0.0,
+        latency_sigma: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        stream_chunk_size: int = 64,
+    ) -> None:
+        self.latency_median_ms = latency_median_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.stream_chunk_size = stream_chunk_size
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def available(self) -> bool:
+        """The fake backend needs no configuration."""
+        return True
+
+    def _draw(self) -> tuple[float, bool]:
+        """Draw the latency (seconds) and whether the next call fails."""
+        with self._rng_lock:
+            latency = 0.0
+            if self.latency_median_ms > 0:
+                latency = self._rng.lognormvariate(0.0, self.latency_sigma)
+                latency *= self.latency_median_ms / 1000
+            return latency, self._rng.random() < self.error_rate
+
+    @staticmethod
+    def recipes_for(query: str) -> list[Recipe]:
+        """Build the recipes answering a single recipe query."""
+        max_match = _MAX_RECIPES_PATTERN.search(query)
+        cuisine_match = _CUISINE_PATTERN.search(query)
+        ingredients_match = _INGREDIENTS_PATTERN.search(query)
+        count = int(max_match.group(1)) if max_match else settings.DEFAULT_MAX_RECIPES
+        cuisine = f"{cuisine_match.group(1).title()} " if cuisine_match else ""
+        ingredients = ingredients_match.group(1).split(", ") if ingredients_match else []
+        main = ingredients[0].title() if ingredients else "Pantry"
+
+        seed = int.from_bytes(hashlib.sha256(query.encode("utf-8")).digest()[:4], "big")
+        return [
+            Recipe(
+                recipe_name=f"{cuisine}{main} {_FAKE_DISHES[(seed + number) % len(_FAKE_DISHES)]}",
+                ingredients=ingredients,
+                instructions=f"Combine {', '.join(ingredients) or 'what you have'} and cook.",
+            )
+            for number in range(count)
+        ]
+
+    def _respond(self, contents: str, config: dict) -> Any:
+        """Answer a prompt in the response schema requested by ``config``."""
+        if config.get("response_schema") == list[PackedRecipes]:
+            return [
+                PackedRecipes(request_index=int(number), recipes=self.recipes_for(query))
+                for number, query in _PACKED_QUERY_PATTERN.findall(contents)
+            ]
+        return self.recipes_for(contents)
+
+    def generate(self, contents: str, config: dict) -> Any:
+        """Answer a prompt after a simulated latency, sleeping the calling thread."""
+        latency, fails = self._draw()
+        time.sleep(latency)
+        if fails:
+            raise FakeBackendError("Simulated recipe backend failure")
+        return self._respond(contents, config)
+
+    async def generate_async(self, contents: str, config: dict) -> Any:
+        """Answer a prompt after a simulated latency."""
+        latency, fails = self._draw()
+        await asyncio.sleep(latency)
+        if fails:
+            raise FakeBackendError("Simulated recipe backend failure")
+        return self._respond(contents, config)
+
+    async def stream_async(self, contents: str, config: dict) -> AsyncIterator[str]:
+        """Stream the JSON answer in fixed-size chunks, spreading the latency across them."""
+        latency, fails = self._draw()
+        answer = json.dumps([
+            item.model_dump() if hasattr(item, "model_dump") else item
+            for item in self._respond(contents, config)
+        ])
+        chunks = [
+            answer[start:start + self.stream_chunk_size]
+            for start in range(0, len(answer), self.stream_chunk_size)
+        ]
+        await asyncio.sleep(latency / 2)
+        if fails:
+            raise FakeBackendError("Simulated recipe backend failure")
+        for chunk in chunks:
+            await asyncio.sleep(latency / 2 / len(chunks))
+            yield chunk
+
+
+def create_recipe_backend(name: str) -> RecipeBackend:
+    """Build the recipe backend selected by name ("gemini" or "fake")."""
+    if name == "gemini":
+        return GeminiRecipeBackend()
+    if name == "fake":
+        return FakeRecipeBackend(
+            latency_median_ms=settings.FAKE_RECIPE_LATENCY_MEDIAN_MS,
+            latency_sigma=settings.FAKE_RECIPE_LATENCY_SIGMA,
+            error_rate=settings.FAKE_RECIPE_ERROR_RATE,
+            seed=settings.FAKE_RECIPE_SEED,
+        )
+    raise ValueError(f"Unknown recipe backend: {name}")
+
+
+# Backend used by RecipeService
+recipe_backend = create_recipe_backend(settings.RECIPE_BACKEND)
@@ -1,28 +1,198 @@
+import asyncio
+import hashlib
+import json
 import logging
+import re
+from typing import AsyncIterator, Optional, Union
 
 from dotenv import load_dotenv
-from google import genai
 
 from ..core.config import settings
-from ..models.schemas import Recipe, RecipeRequest
+from ..core.executor import run_in_search_executor
+from ..core.ingredients import canonicalize_ingredients
+from ..core.job_queue import Job, JobQueue
+from ..core.recipe_cache import recipe_cache
+from ..core.resilience import CircuitOpenError, recipe_backend_resilience
+from ..core.similarity_cache import recipe_similarity_cache
+from ..core.single_flight import SingleFlight
+from ..models.schemas import (
+    JobQueueStats,
+    PackedRecipes,
+    Recipe,
+    RecipeBatchItem,
+    RecipeCacheStats,
+    RecipeJobRequest,
+    RecipeJobStatus,
+    RecipeRequest,
+    ResilienceStats,
+    SimilarityCacheStats,
+    SingleFlightStats,
+)
+from ..utils.json_stream import JsonArrayStreamParser
+from .recipe_backends import recipe_backend
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Gemini client
-client = genai.Client()
+# Bounds concurrent async generations so a burst cannot exhaust the API quota
+_generation_slots = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+# Identical requests arriving while a generation is in flight share its result
+_generation_flights = SingleFlight()
 
 RECIPE_CONFIG = {
     "response_mime_type": "application/json",
     "response_schema": list[Recipe],
 }
 
+PACKED_RECIPE_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": list[PackedRecipes],
+}
+
+PACKED_PROMPT_HEADER = (
+    "Answer each of the following numbered requests independently. For each one, "
+    "return its number as request_index together with its recipes.\n"
+)
+
+
+class NoIngredientsError(ValueError):
+    """Raised when a request has no usable ingredients once canonicalized."""
+
+    def __init__(self) -> None:
+        super().__init__("At least one ingredient is required")
+
+
+def _describe_error(error: Exception) -> str:
+    """Describe a generation failure for an API response."""
+    if isinstance(error, asyncio.TimeoutError):
+        return "Recipe generation timed out"
+    if isinstance(error, CircuitOpenError):
+        return str(error)
+    return f"Failed to generate recipes: {str(error)}"
+
+
+async def _generate_content_async(contents: str, config: dict):
+    """Call the recipe backend under the concurrency limit, retries and timeouts."""
+    async def attempt():
+        async with _generation_slots:
+            return await asyncio.wait_for(
+                recipe_backend.generate_async(contents, config),
+                timeout=settings.GEMINI_ATTEMPT_TIMEOUT_SECONDS,
+            )
+
+    return await asyncio.wait_for(
+        recipe_backend_resilience.call_async(attempt), timeout=settings.GEMINI_TIMEOUT_SECONDS
+    )
+
+
+def _normalize(text: str) -> str:
+    """Case-fold and collapse whitespace."""
+    return " ".join(text.split()).casefold()
+
+
+def canonicalize_request(request: RecipeRequest) -> RecipeRequest:
+    """Copy of the request with catalog-canonical, deduplicated and capped ingredients.
+
+    Equivalent requests ("Tomatoes ", "tomato") then share prompts and cache
+    entries, and prompts stay short.
+    """
+    if not settings.INGREDIENT_CANONICALIZATION_ENABLED:
+        return request
+    return request.model_copy(update={"ingredients": canonicalize_ingredients(request.ingredients)})
+
+
+def recipe_cache_key(request: RecipeRequest) -> str:
+    """Key identifying requests that differ only in ingredient order, case or whitespace.
+
+    Also used for coalescing. The backend and model are part of the key, so
+    recipes from one (e.g. the fake load-test backend) are never served for another.
+    """
+    ingredients = sorted({_normalize(ingredient) for ingredient in request.ingredients} - {""})
+    canonical = [
+        recipe_backend.name,
+        settings.GEMINI_MODEL,
+        ingredients,
+        _normalize(request.cuisine_style or settings.DEFAULT_CUISINE_STYLE),
+        request.max_recipes,
+    ]
+    return hashlib.sha256(json.dumps(canonical).encode("utf-8")).hexdigest()
+
+
+def recipe_similarity_key(request: RecipeRequest) -> tuple[tuple, frozenset]:
+    """Namespace and ingredient word set used by the approximate recipe cache.
+
+    Only requests with the same backend, model, cuisine style and recipe
+    count are compared; within that namespace, ingredients are compared
+    word by word.
+    """
+    namespace = (
+        recipe_backend.name,
+        settings.GEMINI_MODEL,
+        _normalize(request.cuisine_style or settings.DEFAULT_CUISINE_STYLE),
+        request.max_recipes,
+    )
+    words = frozenset(
+        word
+        for ingredient in request.ingredients
+        for word in re.findall(r"\w+", _normalize(ingredient))
+    )
+    return namespace, words
+
+
+def _cached_recipes(request: RecipeRequest, cache_key: str) -> Optional[list[Recipe]]:
+    """Look up recipes for the exact request, then for a near-duplicate one."""
+    cached = recipe_cache.get(cache_key)
+    if cached is None:
+        cached = recipe_similarity_cache.get(*recipe_similarity_key(request))
+    return cached
+
+
+def _store_recipes(request: RecipeRequest, cache_key: str, recipes: list[Recipe]) -> None:
+    """Cache generated recipes in the exact and approximate caches."""
+    recipe_cache.set(cache_key, recipes)
+    recipe_similarity_cache.set(*recipe_similarity_key(request), recipes)
+
+
+async def _cached_recipes_async(
+    request: RecipeRequest, cache_key: str
+) -> Optional[list[Recipe]]:
+    """Like _cached_recipes, without blocking the event loop on the persistent tier."""
+    cached = await recipe_cache.get_async(cache_key)
+    if cached is None:
+        cached = recipe_similarity_cache.get(*recipe_similarity_key(request))
+    return cached
+
+
+async def _store_recipes_async(
+    request: RecipeRequest, cache_key: str, recipes: list[Recipe]
+) -> None:
+    """Like _store_recipes, without blocking the event loop on the persistent tier."""
+    await recipe_cache.set_async(cache_key, recipes)
+    recipe_similarity_cache.set(*recipe_similarity_key(request), recipes)
+
 
 class RecipeService:
     """Service for handling recipe generation using Gemini AI."""
 
+    @staticmethod
+    def prepare_request(request: RecipeRequest) -> RecipeRequest:
+        """Canonicalize a request, raising NoIngredientsError if no ingredient is left."""
+        request = canonicalize_request(request)
+        if not request.ingredients:
+            raise NoIngredientsError()
+        return request
+
+    @classmethod
+    async def prepare_request_async(cls, request: RecipeRequest) -> RecipeRequest:
+        """Canonicalize a request on the search thread pool, off the event loop.
+
+        Raises NoIngredientsError if no ingredient is left.
+        """
+        return await run_in_search_executor(cls.prepare_request, request)
+
     @staticmethod
     def generate_recipe_query(request: RecipeRequest) -> str:
         """Generate a query string for recipe generation based on the request."""
@@ -37,20 +207,300 @@ class RecipeService:
 
     @staticmethod
     def generate_content(query: str) -> list[Recipe]:
-        """Generate recipe content using Gemini AI."""
-        response = client.models.generate_content(
-            model=settings.GEMINI_MODEL,
-            config=RECIPE_CONFIG,
-            contents=query
+        """Generate recipe content with the configured backend, retrying transient failures."""
+        return recipe_backend_resilience.call(
+            lambda: recipe_backend.generate(query, RECIPE_CONFIG)
         )
-        return response.parsed
+
+    @staticmethod
+    async def generate_content_async(query: str) -> list[Recipe]:
+        """Generate recipe content with the configured backend, asynchronously.
+
+        Each attempt waits for one of GEMINI_MAX_CONCURRENCY slots and is
+        bounded by GEMINI_ATTEMPT_TIMEOUT_SECONDS; transient failures are
+        retried with backoff, and everything together is bounded by
+        GEMINI_TIMEOUT_SECONDS (raises TimeoutError). Raises CircuitOpenError
+        while the backend is considered unhealthy.
+        """
+        return await _generate_content_async(query, RECIPE_CONFIG)
+
+    @staticmethod
+    async def generate_packed_content_async(queries: list[str]) -> list[Optional[list[Recipe]]]:
+        """Answer several recipe queries with a single prompt.
+
+        Returns the recipes for each query in order, or None for a query
+        the response did not answer.
+        """
+        prompt = PACKED_PROMPT_HEADER + "\n".join(
+            f"{number}. {query}" for number, query in enumerate(queries, start=1)
+        )
+        response = await _generate_content_async(prompt, PACKED_RECIPE_CONFIG)
+        answers = {packed.request_index: packed.recipes for packed in response or []}
+        return [answers.get(number) for number in range(1, len(queries) + 1)]
 
     @classmethod
     def generate_recipes(cls, request: RecipeRequest) -> list[Recipe]:
-        """Generate recipes based on the provided request."""
+        """Generate recipes based on the provided request, reusing cached results."""
+        request = cls.prepare_request(request)
+        cache_key = recipe_cache_key(request)
+        cached = _cached_recipes(request, cache_key)
+        if cached is not None:
+            return cached
+
         query = cls.generate_recipe_query(request)
-        return cls.generate_content(query)
+        recipes = cls.generate_content(query)
+        if recipes:
+            _store_recipes(request, cache_key, recipes)
+        return recipes
+
+    @classmethod
+    async def generate_recipes_async(cls, request: RecipeRequest) -> list[Recipe]:
+        """Generate recipes without blocking the event loop, reusing cached results."""
+        return await cls.generate_prepared_recipes_async(await cls.prepare_request_async(request))
+
+    @classmethod
+    async def generate_prepared_recipes_async(cls, request: RecipeRequest) -> list[Recipe]:
+        """Like generate_recipes_async, for a request already returned by prepare_request."""
+        cache_key = recipe_cache_key(request)
+        cached = await _cached_recipes_async(request, cache_key)
+        if cached is not None:
+            return cached
+        return await cls.generate_uncached_recipes_async(request, cache_key)
+
+    @classmethod
+    async def generate_uncached_recipes_async(
+        cls, request: RecipeRequest, cache_key: str
+    ) -> list[Recipe]:
+        """Generate and cache recipes for a prepared request the caches missed.
+
+        Concurrent calls with the same ``cache_key`` share one generation.
+        """
+        async def generate_and_cache() -> list[Recipe]:
+            recipes = await cls.generate_content_async(cls.generate_recipe_query(request))
+            if recipes:
+                await _store_recipes_async(request, cache_key, recipes)
+            return recipes
+
+        return await _generation_flights.run(cache_key, generate_and_cache)
+
+    @classmethod
+    async def generate_recipes_batch_async(
+        cls, requests: list[RecipeRequest], pack_prompts: bool = False
+    ) -> list[RecipeBatchItem]:
+        """Generate recipes for many requests with bounded parallelism.
+
+        Equivalent requests are generated once and cached results are reused.
+        At most RECIPE_BATCH_CONCURRENCY generations run at a time. With
+        ``pack_prompts``, uncached requests are sent RECIPE_BATCH_PACK_SIZE
+        per prompt, and any a packed response leaves out are retried on their
+        own. Failures are reported per item and do not fail the batch.
+        """
+        requests = await asyncio.gather(*(
+            run_in_search_executor(canonicalize_request, request) for request in requests
+        ))
+        keys = [recipe_cache_key(request) for request in requests]
+        outcomes: dict[str, Union[list[Recipe], Exception]] = {}
+        pending: dict[str, RecipeRequest] = {}
+        for key, request in zip(keys, requests):
+            if not request.ingredients or key in outcomes or key in pending:
+                continue
+            cached = await _cached_recipes_async(request, key)
+            if cached is not None:
+                outcomes[key] = cached
+            else:
+                pending[key] = request
+
+        slots = asyncio.Semaphore(settings.RECIPE_BATCH_CONCURRENCY)
+
+        async def generate_one(key: str, request: RecipeRequest) -> None:
+            async with slots:
+                try:
+                    # Already canonicalized and missed by the caches above
+                    outcomes[key] = await cls.generate_uncached_recipes_async(request, key)
+                except Exception as e:
+                    outcomes[key] = e
+
+        async def generate_pack(pack: list[tuple[str, RecipeRequest]]) -> None:
+            async with slots:
+                try:
+                    answers = await cls.generate_packed_content_async(
+                        [cls.generate_recipe_query(request) for _, request in pack]
+                    )
+                except Exception as e:
+                    for key, _ in pack:
+                        outcomes[key] = e
+                    return
+            missing = []
+            for (key, request), recipes in zip(pack, answers):
+                if recipes:
+                    outcomes[key] = recipes[:request.max_recipes]
+                    await _store_recipes_async(request, key, outcomes[key])
+                else:
+                    missing.append(generate_one(key, request))
+            await asyncio.gather(*missing)
+
+        pack_size = settings.RECIPE_BATCH_PACK_SIZE if pack_prompts else 1
+        queued = list(pending.items())
+        packs = [queued[start:start + pack_size] for start in range(0, len(queued), pack_size)]
+        await asyncio.gather(*(
+            generate_pack(pack) if len(pack) > 1 else generate_one(*pack[0]) for pack in packs
+        ))
+
+        results = []
+        for index, (key, request) in enumerate(zip(keys, requests)):
+            if not request.ingredients:
+                results.append(RecipeBatchItem(index=index, error=str(NoIngredientsError())))
+            elif isinstance(outcomes[key], Exception):
+                results.append(RecipeBatchItem(index=index, error=_describe_error(outcomes[key])))
+            else:
+                results.append(RecipeBatchItem(index=index, recipes=outcomes[key]))
+        return results
+
+    @classmethod
+    async def stream_recipes_async(cls, request: RecipeRequest) -> AsyncIterator[Recipe]:
+        """Yield recipes one by one as the backend streams them.
+
+        The JSON array is parsed incrementally, so each recipe is yielded as
+        soon as its closing brace arrives. GEMINI_TIMEOUT_SECONDS bounds the
+        wait for a slot and for each chunk. Complete results are cached.
+        Streams are not retried (recipes may already have been sent), but
+        they honour and feed the circuit breaker.
+        """
+        request = await cls.prepare_request_async(request)
+        async for recipe in cls.stream_prepared_recipes_async(request):
+            yield recipe
+
+    @classmethod
+    async def stream_prepared_recipes_async(
+        cls, request: RecipeRequest
+    ) -> AsyncIterator[Recipe]:
+        """Like stream_recipes_async, for a request already returned by prepare_request.
+
+        Lets callers reject requests without usable ingredients before
+        streaming starts, without canonicalizing them twice.
+        """
+        cache_key = recipe_cache_key(request)
+        cached = await _cached_recipes_async(request, cache_key)
+        if cached is not None:
+            for recipe in cached:
+                yield recipe
+            return
+
+        query = cls.generate_recipe_query(request)
+        timeout = settings.GEMINI_TIMEOUT_SECONDS
+        breaker = recipe_backend_resilience.breaker
+        breaker.before_call()
+        try:
+            await asyncio.wait_for(_generation_slots.acquire(), timeout=timeout)
+        except BaseException:
+            breaker.record_ignored()
+            raise
+        chunks = aiter(recipe_backend.stream_async(query, RECIPE_CONFIG))
+        try:
+            parser = JsonArrayStreamParser()
+            recipes = []
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                for item in parser.feed(chunk):
+                    recipe = Recipe.model_validate(item)
+                    recipes.append(recipe)
+                    yield recipe
+        except Exception as e:
+            recipe_backend_resilience.record_error(e)
+            raise
+        except BaseException:
+            # The client went away; says nothing about upstream health
+            breaker.record_ignored()
+            raise
+        else:
+            breaker.record_success()
+        finally:
+            _generation_slots.release()
+            await chunks.aclose()
+
+        if recipes and parser.done:
+            await _store_recipes_async(request, cache_key, recipes)
+
+    @staticmethod
+    async def submit_job(request: RecipeJobRequest) -> RecipeJobStatus:
+        """Queue a background generation and return its job status right away.
+
+        Raises NoIngredientsError for requests without usable ingredients and
+        QueueFullError when RECIPE_JOB_QUEUE_SIZE jobs are waiting.
+        """
+        recipe_request = await RecipeService.prepare_request_async(
+            RecipeRequest(**request.model_dump(exclude={"priority"}))
+        )
+        return _job_status(recipe_jobs.submit(recipe_request, priority=request.priority))
+
+    @staticmethod
+    async def get_job(job_id: str, wait: float = 0) -> Optional[RecipeJobStatus]:
+        """Return a job's status, waiting up to ``wait`` seconds for it to finish.
+
+        Returns None for unknown jobs and for jobs finished more than
+        RECIPE_JOB_TTL_SECONDS ago.
+        """
+        job = await recipe_jobs.wait(job_id, wait)
+        return _job_status(job) if job is not None else None
+
+    @staticmethod
+    def job_stats() -> JobQueueStats:
+        """Return queue depth and counters for background recipe jobs."""
+        return recipe_jobs.stats()
+
+    @staticmethod
+    def cache_stats() -> RecipeCacheStats:
+        """Return hit/miss counters for the recipe cache."""
+        return recipe_cache.stats()
+
+    @staticmethod
+    def similarity_stats() -> SimilarityCacheStats:
+        """Return hit/miss counters for the approximate recipe cache."""
+        return recipe_similarity_cache.stats()
+
+    @staticmethod
+    def resilience_stats() -> ResilienceStats:
+        """Return circuit breaker state and retry counters for backend calls."""
+        return recipe_backend_resilience.stats()
+
+    @staticmethod
+    def coalescing_stats() -> SingleFlightStats:
+        """Return how many Gemini calls were saved by coalescing identical requests."""
+        return _generation_flights.stats()
+
+
+async def _run_recipe_job(request: RecipeRequest) -> list[Recipe]:
+    """Job handler: generate recipes through the usual cached, coalesced path.
+
+    Requests are prepared by submit_job before they are queued.
+    """
+    return await RecipeService.generate_prepared_recipes_async(request)
+
+
+def _job_status(job: Job) -> RecipeJobStatus:
+    """Describe a recipe job for an API response."""
+    return RecipeJobStatus(
+        id=job.id,
+        status=job.status,
+        priority=job.priority,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        recipes=job.result,
+        error=_describe_error(job.error) if job.error is not None else None,
+    )
+
 
+# Background recipe jobs; workers are started and stopped by the app lifespan
+recipe_jobs = JobQueue(
+    _run_recipe_job,
+    workers=settings.RECIPE_JOB_WORKERS,
+    maxsize=settings.RECIPE_JOB_QUEUE_SIZE,
+    ttl=settings.RECIPE_JOB_TTL_SECONDS,
+)
 
 # Create service instance
 recipe_service = RecipeService()
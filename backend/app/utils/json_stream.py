@@ -0,0 +1,88 @@
+import json
+from typing import Any, Optional
+
+
+class JsonArrayStreamParser:
+    """Incrementally parse the elements of a JSON array arriving in chunks.
+
+    Feed text as it arrives; every element whose closing character has been
+    seen is decoded and returned, without waiting for the rest of the array.
+    Anything before the opening ``[`` (such as a Markdown code fence) is
+    skipped. Consumed text is dropped, so memory stays bounded by the
+    largest element.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element_start: Optional[int] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Consume a chunk of text and return the elements it completed."""
+        if self.done:
+            return []
+        self._buffer += chunk
+        elements = []
+
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer):
+            char = buffer[position]
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+                self._start_element(position)
+            elif char in "{[":
+                self._start_element(position)
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._element_start is not None:
+                    elements.append(self._take_element(buffer, position + 1))
+                elif self._depth == 0:
+                    # End of the array; a trailing scalar element ends here too
+                    if self._element_start is not None:
+                        elements.append(self._take_element(buffer, position))
+                    self.done = True
+                    position += 1
+                    break
+            elif char == "," and self._depth == 1:
+                if self._element_start is not None:
+                    elements.append(self._take_element(buffer, position))
+            elif not char.isspace():
+                self._start_element(position)
+            position += 1
+
+        # Keep only the unfinished element, if any
+        keep_from = self._element_start if self._element_start is not None else position
+        self._buffer = buffer[keep_from:]
+        self._position = position - keep_from
+        if self._element_start is not None:
+            self._element_start = 0
+        return elements
+
+    def _start_element(self, position: int) -> None:
+        """Mark the start of a top-level element."""
+        if self._depth == 1 and self._element_start is None:
+            self._element_start = position
+
+    def _take_element(self, buffer: str, end: int) -> Any:
+        """Decode the top-level element ending at ``end``."""
+        text = buffer[self._element_start:end]
+        self._element_start = None
+        return json.loads(text)
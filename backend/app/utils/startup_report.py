@@ -0,0 +1,106 @@
+"""Report where application startup time goes.
+
+    python -m app.utils.startup_report [--top 15] [--budget-ms 3000]
+
+Runs two fresh interpreters. The first imports the app under
+``-X importtime`` and ranks modules by cumulative import time. The second
+imports the app, runs its lifespan and serves a first ``/health`` request,
+timing each phase. With ``--budget-ms`` the exit status is non-zero when
+time to first request exceeds the budget, so CI can catch regressions.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import NamedTuple
+
+APP_MODULE = "app.main"
+
+_IMPORTTIME_PREFIX = "import time:"
+
+# Runs in a child process; the last stdout line is the JSON result
+_FIRST_REQUEST_PROBE = """
+import json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    ready_started = time.perf_counter()
+    client.get("/health")
+    answered = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready_started - imported) * 1000,
+    "first_request_ms": (answered - ready_started) * 1000,
+}))
+"""
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse ``-X importtime`` output into per-module timings."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith(_IMPORTTIME_PREFIX):
+            continue
+        fields = line[len(_IMPORTTIME_PREFIX):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # column header
+        timings.append(ImportTiming(fields[2].strip(), int(fields[0]), int(fields[1])))
+    return timings
+
+
+def measure_imports(module: str = APP_MODULE) -> list[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and return its import timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_first_request() -> dict[str, float]:
+    """Time app import, lifespan startup and the first request in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", _FIRST_REQUEST_PROBE], capture_output=True, text=True, check=True,
+    )
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    phases["total_ms"] = sum(phases.values())
+    return phases
+
+
+def main(argv=None) -> int:
+    """Print the startup report; return a non-zero status when over budget."""
+    parser = argparse.ArgumentParser(prog="python -m app.utils.startup_report", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail if time to first request exceeds this")
+    args = parser.parse_args(argv)
+
+    timings = sorted(measure_imports(), key=lambda timing: timing.cumulative_us, reverse=True)
+    print(f"Slowest imports under {APP_MODULE} (cumulative / self):")
+    for timing in timings[:args.top]:
+        print(f"  {timing.cumulative_us / 1000:9.1f} ms {timing.self_us / 1000:9.1f} ms  "
+              f"{timing.module}")
+
+    phases = measure_first_request()
+    print("\nTime to first request:")
+    print(f"  import app       {phases['import_ms']:9.1f} ms")
+    print(f"  lifespan startup {phases['startup_ms']:9.1f} ms")
+    print(f"  first request    {phases['first_request_ms']:9.1f} ms")
+    print(f"  total            {phases['total_ms']:9.1f} ms")
+
+    if args.budget_ms is not None and phases["total_ms"] > args.budget_ms:
+        print(f"\nStartup exceeded the {args.budget_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
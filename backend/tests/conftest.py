@@ -1,5 +1,6 @@
 import os
 import tempfile
+from contextlib import asynccontextmanager
 from typing import Generator
 
 import pytest
@@ -8,10 +9,56 @@ from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from app.main import create_app
+from app.core.cache import food_search_cache
+from app.core.recipe_cache import recipe_cache
+from app.core.resilience import recipe_backend_resilience
+from app.core.similarity_cache import recipe_similarity_cache
 from app.core.database import get_session
 from app.models.database import Food
 
 
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    """Keep cached search results from leaking between tests."""
+    food_search_cache.clear()
+    yield
+    food_search_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_recipe_cache():
+    """Keep cached recipes from leaking between tests."""
+    recipe_cache.clear()
+    recipe_similarity_cache.clear()
+    yield
+    recipe_cache.clear()
+    recipe_similarity_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_recipe_resilience():
+    """Start every test with a closed circuit breaker and a full retry budget."""
+    recipe_backend_resilience.reset()
+    yield
+    recipe_backend_resilience.reset()
+
+
+class FakeClock:
+    """Manually advanced clock, usable wherever a ``time.time``-like callable is expected."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """A clock that only moves when a test advances ``fake_clock.now``."""
+    return FakeClock()
+
+
 @pytest.fixture(scope="session")
 def test_db_url():
     """Create a temporary database URL for testing."""
@@ -51,15 +98,26 @@ def test_client(test_engine):
         with Session(test_engine) as session:
             yield session
 
-    # Create app without lifespan to avoid database conflicts
+    # Create app without the database lifespan to avoid database conflicts;
+    # only the background recipe job workers are run
     from fastapi import FastAPI
     from app.core.config import settings
     from app.core.security import setup_cors
     from app.api.v1 import foods, recipes
 
+    from app.services.recipe_service import recipe_jobs
+
+    @asynccontextmanager
+    async def run_recipe_jobs(app):
+        await recipe_jobs.start()
+        yield
+        await recipe_jobs.stop()
+        recipe_jobs.clear()
+
     app = FastAPI(
         title=settings.APP_TITLE,
-        version=settings.APP_VERSION
+        version=settings.APP_VERSION,
+        lifespan=run_recipe_jobs
     )
 
     # Setup CORS
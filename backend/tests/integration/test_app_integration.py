@@ -33,7 +33,7 @@ class TestAppIntegration:
         # FastAPI TestClient doesn't fully test CORS, but we can verify the endpoint exists
         assert response.status_code in [200, 405]  # OPTIONS might not be implemented
 
-    @patch('app.api.v1.recipes.recipe_service.generate_recipes')
+    @patch('app.api.v1.recipes.recipe_service.generate_recipes_async')
     def test_full_recipe_generation_flow(self, mock_generate, test_client, populated_test_session):
         """Test the complete recipe generation flow."""
         # Setup mock
@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import patch
 
+from app.core.catalog_reload import CatalogReloadError
 from app.models.database import Food
+from app.models.schemas import CatalogReloadResult
 
 
 @pytest.mark.unit
@@ -38,6 +40,12 @@ class TestFoodsAPI:
         assert response.status_code == 400
         assert "Enter at least 3 characters" in response.json()["detail"]
 
+    def test_search_foods_long_query(self, test_client):
+        """Test food search with a query longer than the maximum."""
+        response = test_client.get(f"/api/v1/foods?q={'a' * 201}")
+
+        assert response.status_code == 422  # Validation error
+
     def test_search_foods_missing_query(self, test_client):
         """Test food search with missing query parameter."""
         response = test_client.get("/api/v1/foods")
@@ -73,4 +81,170 @@ class TestFoodsAPI:
             response = test_client.get("/api/v1/foods?q=%20chicken%20")
 
             assert response.status_code == 200
-            mock_search.assert_called_once_with(" chicken ")
+            mock_search.assert_called_once_with(" chicken ", max_results=None, after_id=None)
+
+    def test_search_foods_pagination(self, test_client):
+        """Test cursor pagination parameters and next cursor header."""
+        with patch('app.api.v1.foods.food_service.search_foods') as mock_search:
+            mock_search.return_value = [
+                Food(id=4, name="chicken thigh"),
+                Food(id=9, name="chicken wing")
+            ]
+
+            response = test_client.get("/api/v1/foods?q=chicken&limit=2&after_id=3")
+
+            assert response.status_code == 200
+            mock_search.assert_called_once_with("chicken", max_results=2, after_id=3)
+            assert response.headers["X-Next-Cursor"] == "9"
+
+    def test_search_foods_last_page(self, test_client):
+        """Test that a partial page has no next cursor."""
+        with patch('app.api.v1.foods.food_service.search_foods') as mock_search:
+            mock_search.return_value = [Food(id=9, name="chicken wing")]
+
+            response = test_client.get("/api/v1/foods?q=chicken&limit=2&after_id=3")
+
+            assert response.status_code == 200
+            assert "X-Next-Cursor" not in response.headers
+
+    def test_search_foods_invalid_limit(self, test_client):
+        """Test that the page size is bounded."""
+        response = test_client.get("/api/v1/foods?q=chicken&limit=1000")
+
+        assert response.status_code == 422
+
+    def test_autocomplete_foods_success(self, test_client):
+        """Test successful food autocompletion."""
+        with patch('app.api.v1.foods.food_service.autocomplete_foods') as mock_complete:
+            mock_complete.return_value = [Food(id=1, name="cheese blue")]
+
+            response = test_client.get("/api/v1/foods/autocomplete?q=che&limit=5")
+
+            assert response.status_code == 200
+            mock_complete.assert_called_once_with("che", max_results=5)
+            assert response.json() == [{"id": 1, "name": "cheese blue"}]
+
+    def test_autocomplete_foods_short_query(self, test_client):
+        """Test autocompletion with a prefix that is too short."""
+        response = test_client.get("/api/v1/foods/autocomplete?q=ch")
+
+        assert response.status_code == 400
+        assert "Enter at least 3 characters" in response.json()["detail"]
+
+    def test_autocomplete_foods_service_error(self, test_client):
+        """Test autocompletion when the service fails."""
+        with patch('app.api.v1.foods.food_service.autocomplete_foods') as mock_complete:
+            mock_complete.side_effect = Exception("Service error")
+
+            response = test_client.get("/api/v1/foods/autocomplete?q=che")
+
+            assert response.status_code == 500
+            assert "Failed to autocomplete foods" in response.json()["detail"]
+
+    def test_food_search_cache_stats(self, test_client):
+        """Test reporting cache statistics."""
+        response = test_client.get("/api/v1/foods/cache/stats")
+
+        assert response.status_code == 200
+        assert {"hits", "misses", "evictions", "size", "maxsize"} <= response.json().keys()
+
+    def test_batch_search_foods_success(self, test_client):
+        """Test resolving several ingredient strings at once."""
+        with patch('app.api.v1.foods.food_service.search_foods_batch') as mock_batch:
+            mock_batch.return_value = [
+                [Food(id=1, name="chicken breast")],
+                []
+            ]
+
+            response = test_client.post(
+                "/api/v1/foods/batch-search",
+                json={"queries": ["chicken", "unobtainium"], "max_results": 5}
+            )
+
+            assert response.status_code == 200
+            mock_batch.assert_called_once_with(["chicken", "unobtainium"], max_results=5)
+            results = response.json()["results"]
+            assert results[0] == {
+                "query": "chicken", "foods": [{"id": 1, "name": "chicken breast"}], "error": None
+            }
+            assert results[1] == {"query": "unobtainium", "foods": [], "error": None}
+
+    def test_batch_search_foods_invalid_queries(self, test_client):
+        """Test that unsearchable queries get per-query errors and the rest resolve."""
+        with patch('app.api.v1.foods.food_service.search_foods_batch') as mock_batch:
+            mock_batch.return_value = [[Food(id=1, name="chicken breast")]]
+
+            response = test_client.post(
+                "/api/v1/foods/batch-search", json={"queries": ["ab", "chicken", "x" * 201]}
+            )
+
+            assert response.status_code == 200
+            mock_batch.assert_called_once_with(["chicken"], max_results=None)
+            results = response.json()["results"]
+            assert [result["query"] for result in results] == ["ab", "chicken", "x" * 201]
+            assert results[0]["foods"] == [] and "at least 3" in results[0]["error"]
+            assert results[1]["foods"] == [{"id": 1, "name": "chicken breast"}]
+            assert results[1]["error"] is None
+            assert results[2]["foods"] == [] and "at most 200" in results[2]["error"]
+
+    def test_batch_search_foods_all_invalid(self, test_client):
+        """Test that a batch of only unsearchable queries does not search at all."""
+        with patch('app.api.v1.foods.food_service.search_foods_batch') as mock_batch:
+            response = test_client.post("/api/v1/foods/batch-search", json={"queries": ["ab"]})
+
+            assert response.status_code == 200
+            assert response.json()["results"][0]["error"]
+            mock_batch.assert_not_called()
+
+    def test_batch_search_foods_empty(self, test_client):
+        """Test batch search requires at least one query."""
+        response = test_client.post("/api/v1/foods/batch-search", json={"queries": []})
+
+        assert response.status_code == 422
+
+    def test_reload_catalog_requires_token(self, test_client):
+        """Test that reloading is refused without the admin token."""
+        with patch('app.api.v1.foods.settings.CATALOG_ADMIN_TOKEN', "secret"):
+            missing = test_client.post("/api/v1/foods/catalog/reload")
+            wrong = test_client.post(
+                "/api/v1/foods/catalog/reload", headers={"X-Admin-Token": "guess"}
+            )
+
+        assert missing.status_code == 403
+        assert wrong.status_code == 403
+
+    def test_reload_catalog_disabled_without_token(self, test_client):
+        """Test that reloading is disabled when no admin token is configured."""
+        with patch('app.api.v1.foods.settings.CATALOG_ADMIN_TOKEN', None):
+            response = test_client.post(
+                "/api/v1/foods/catalog/reload", headers={"X-Admin-Token": ""}
+            )
+
+        assert response.status_code == 403
+
+    def test_reload_catalog_success(self, test_client):
+        """Test reloading the catalog with the admin token."""
+        result = CatalogReloadResult(
+            inserted=2, deleted=1, food_count=8, content_hash="abc", elapsed_ms=12.5
+        )
+        with patch('app.api.v1.foods.settings.CATALOG_ADMIN_TOKEN', "secret"), \
+                patch('app.services.food_service.reload_catalog', return_value=result):
+            response = test_client.post(
+                "/api/v1/foods/catalog/reload", headers={"X-Admin-Token": "secret"}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 2
+        assert response.json()["deleted"] == 1
+
+    def test_reload_catalog_conflict(self, test_client):
+        """Test reloading when the deployment cannot reload, e.g. from a snapshot."""
+        with patch('app.api.v1.foods.settings.CATALOG_ADMIN_TOKEN', "secret"), \
+                patch('app.services.food_service.reload_catalog',
+                      side_effect=CatalogReloadError("read-only snapshot")):
+            response = test_client.post(
+                "/api/v1/foods/catalog/reload", headers={"X-Admin-Token": "secret"}
+            )
+
+        assert response.status_code == 409
+        assert "read-only snapshot" in response.json()["detail"]
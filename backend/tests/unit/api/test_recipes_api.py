@@ -1,7 +1,11 @@
+import json
+
+import httpx
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from app.models.schemas import Recipe
+from app.core.resilience import CircuitOpenError
+from app.models.schemas import Recipe, RecipeBatchItem
 
 
 @pytest.mark.unit
@@ -10,7 +14,7 @@ class TestRecipesAPI:
 
     def test_generate_recipes_success(self, test_client):
         """Test successful recipe generation."""
-        with patch('app.api.v1.recipes.recipe_service.generate_recipes') as mock_generate:
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
             mock_generate.return_value = [
                 Recipe(
                     recipe_name="Test Recipe",
@@ -47,6 +51,17 @@ class TestRecipesAPI:
         assert response.status_code == 400
         assert "At least one ingredient is required" in response.json()["detail"]
 
+    def test_generate_recipes_no_usable_ingredients(self, test_client):
+        """Test that ingredients with no words left after canonicalization are rejected."""
+        with patch('app.services.recipe_service.RecipeService.generate_content_async') as mock_content:
+            response = test_client.post(
+                "/api/v1/recipes/generate", json={"ingredients": ["!!", " - "]}
+            )
+
+            assert response.status_code == 400
+            assert "At least one ingredient is required" in response.json()["detail"]
+            mock_content.assert_not_called()
+
     def test_generate_recipes_missing_ingredients(self, test_client):
         """Test recipe generation with missing ingredients field."""
         response = test_client.post(
@@ -60,7 +75,7 @@ class TestRecipesAPI:
 
     def test_generate_recipes_service_error(self, test_client):
         """Test recipe generation when service fails."""
-        with patch('app.api.v1.recipes.recipe_service.generate_recipes') as mock_generate:
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
             mock_generate.side_effect = Exception("Service error")
 
             response = test_client.post(
@@ -74,9 +89,76 @@ class TestRecipesAPI:
             assert response.status_code == 500
             assert "Failed to generate recipes" in response.json()["detail"]
 
+    def test_generate_recipes_timeout(self, test_client):
+        """Test recipe generation when Gemini does not answer in time."""
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
+            mock_generate.side_effect = TimeoutError()
+
+            response = test_client.post(
+                "/api/v1/recipes/generate",
+                json={
+                    "ingredients": ["chicken"],
+                    "max_recipes": 1
+                }
+            )
+
+            assert response.status_code == 504
+            assert "timed out" in response.json()["detail"]
+
+    def test_generate_recipes_circuit_open(self, test_client):
+        """Test that an open circuit breaker fails fast with 503 and Retry-After."""
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
+            mock_generate.side_effect = CircuitOpenError(retry_after=12.3)
+
+            response = test_client.post(
+                "/api/v1/recipes/generate",
+                json={
+                    "ingredients": ["chicken"],
+                    "max_recipes": 1
+                }
+            )
+
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "13"
+            assert "temporarily unavailable" in response.json()["detail"]
+
+    def test_generate_recipes_upstream_unavailable(self, test_client):
+        """Test that an upstream overload surviving retries maps to 503."""
+        overloaded = Exception("Resource exhausted")
+        overloaded.code = 429
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
+            mock_generate.side_effect = overloaded
+
+            response = test_client.post(
+                "/api/v1/recipes/generate",
+                json={
+                    "ingredients": ["chicken"],
+                    "max_recipes": 1
+                }
+            )
+
+            assert response.status_code == 503
+            assert "Retry-After" in response.headers
+
+    def test_generate_recipes_network_failure(self, test_client):
+        """Test that an unwrapped httpx network failure maps to 503."""
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
+            mock_generate.side_effect = httpx.ConnectError("Connection refused")
+
+            response = test_client.post(
+                "/api/v1/recipes/generate",
+                json={
+                    "ingredients": ["chicken"],
+                    "max_recipes": 1
+                }
+            )
+
+            assert response.status_code == 503
+            assert "Retry-After" in response.headers
+
     def test_generate_recipes_default_values(self, test_client):
         """Test recipe generation with default values."""
-        with patch('app.api.v1.recipes.recipe_service.generate_recipes') as mock_generate:
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_async') as mock_generate:
             mock_generate.return_value = []
 
             response = test_client.post(
@@ -92,3 +174,199 @@ class TestRecipesAPI:
             call_args = mock_generate.call_args[0][0]
             assert call_args.max_recipes == 3  # Default value
             assert call_args.cuisine_style == "any"  # Default value
+
+    def test_recipe_job_lifecycle(self, test_client):
+        """Test submitting a job and long-polling for its recipes."""
+        with patch('app.services.recipe_service.RecipeService.generate_prepared_recipes_async') as mock_generate:
+            mock_generate.return_value = [
+                Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+            ]
+
+            response = test_client.post(
+                "/api/v1/recipes/jobs", json={"ingredients": ["chicken"], "priority": 3}
+            )
+            assert response.status_code == 202
+            job = response.json()
+            assert job["priority"] == 3
+            assert response.headers["Location"].endswith(f"/api/v1/recipes/jobs/{job['id']}")
+
+            response = test_client.get(f"/api/v1/recipes/jobs/{job['id']}", params={"wait": 5})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "succeeded"
+        assert data["recipes"][0]["recipe_name"] == "Test Recipe"
+        assert mock_generate.call_args[0][0].ingredients == ["chicken"]
+
+    def test_recipe_job_canonicalizes_once(self, test_client):
+        """Test that a queued job is not canonicalized again when it runs."""
+        with patch('app.services.recipe_service.canonicalize_ingredients',
+                   side_effect=lambda ingredients: [i[:-1] for i in ingredients]) \
+                as mock_canonicalize, \
+                patch('app.services.recipe_service.RecipeService.generate_content_async',
+                      AsyncMock(return_value=[])) as mock_content:
+            job = test_client.post("/api/v1/recipes/jobs", json={"ingredients": ["tomatoes"]}).json()
+            data = test_client.get(f"/api/v1/recipes/jobs/{job['id']}", params={"wait": 5}).json()
+
+        assert data["status"] == "succeeded"
+        mock_canonicalize.assert_called_once()
+        assert mock_content.await_args.args[0].endswith("ingredients: tomatoe.")
+
+    def test_recipe_job_failure(self, test_client):
+        """Test that a failed generation is reported on the job."""
+        with patch('app.services.recipe_service.RecipeService.generate_prepared_recipes_async') as mock_generate:
+            mock_generate.side_effect = Exception("API Error")
+
+            job = test_client.post("/api/v1/recipes/jobs", json={"ingredients": ["chicken"]}).json()
+            data = test_client.get(f"/api/v1/recipes/jobs/{job['id']}", params={"wait": 5}).json()
+
+        assert data["status"] == "failed"
+        assert data["error"] == "Failed to generate recipes: API Error"
+
+    def test_recipe_job_not_found(self, test_client):
+        """Test polling an unknown job."""
+        response = test_client.get("/api/v1/recipes/jobs/missing")
+
+        assert response.status_code == 404
+
+    def test_recipe_job_empty_ingredients(self, test_client):
+        """Test submitting a job without ingredients."""
+        response = test_client.post("/api/v1/recipes/jobs", json={"ingredients": []})
+
+        assert response.status_code == 400
+
+    def test_recipe_job_no_usable_ingredients(self, test_client):
+        """Test that jobs are validated after canonicalization, before queueing."""
+        response = test_client.post("/api/v1/recipes/jobs", json={"ingredients": ["?"]})
+
+        assert response.status_code == 400
+
+    def test_recipe_job_stats(self, test_client):
+        """Test reporting job queue statistics."""
+        response = test_client.get("/api/v1/recipes/jobs/stats")
+
+        assert response.status_code == 200
+        assert {"workers", "queued", "running", "submitted"} <= response.json().keys()
+
+    def test_recipe_cache_stats(self, test_client):
+        """Test reporting recipe cache statistics."""
+        response = test_client.get("/api/v1/recipes/cache/stats")
+
+        assert response.status_code == 200
+        assert {"hits", "misses", "persistent_enabled", "persistent_hits"} <= response.json().keys()
+
+    def test_recipe_resilience_stats(self, test_client):
+        """Test reporting circuit breaker state."""
+        response = test_client.get("/api/v1/recipes/resilience/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["state"] == "closed"
+        assert {"retries", "retry_budget_tokens", "rejected_calls"} <= data.keys()
+
+    def test_recipe_coalescing_stats(self, test_client):
+        """Test reporting request coalescing statistics."""
+        response = test_client.get("/api/v1/recipes/coalescing/stats")
+
+        assert response.status_code == 200
+        assert {"executions", "coalesced", "in_flight", "saved_ratio"} <= response.json().keys()
+
+    def test_generate_recipes_stream(self, test_client):
+        """Test streaming recipes as server-sent events."""
+        async def fake_stream(request):
+            yield Recipe(recipe_name="Soup", ingredients=["onion"], instructions="Simmer")
+            yield Recipe(recipe_name="Stew", ingredients=["beef"], instructions="Braise")
+
+        with patch('app.api.v1.recipes.recipe_service.stream_prepared_recipes_async', fake_stream):
+            response = test_client.post(
+                "/api/v1/recipes/generate/stream", json={"ingredients": ["onion"]}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [block for block in response.text.split("\n\n") if block]
+        assert [block.split("\n")[0] for block in events] == [
+            "event: recipe", "event: recipe", "event: done"
+        ]
+        assert json.loads(events[0].split("data: ")[1])["recipe_name"] == "Soup"
+
+    def test_generate_recipes_stream_error(self, test_client):
+        """Test that a failure part way through is reported as an error event."""
+        async def failing_stream(request):
+            yield Recipe(recipe_name="Soup", ingredients=["onion"], instructions="Simmer")
+            raise Exception("Service error")
+
+        with patch('app.api.v1.recipes.recipe_service.stream_prepared_recipes_async', failing_stream):
+            response = test_client.post(
+                "/api/v1/recipes/generate/stream", json={"ingredients": ["onion"]}
+            )
+
+        assert "event: recipe" in response.text
+        assert "event: error" in response.text
+        assert "Service error" in response.text
+
+    def test_generate_recipes_stream_canonicalizes_once(self, test_client):
+        """Test that the streamed prompt uses ingredients canonicalized only once."""
+        async def stream():
+            yield Mock(text='[{"recipe_name": "Soup", "ingredients": [], "instructions": ""}]')
+
+        # Not idempotent, like plural stripping applied to an already singular word
+        def strip_last_letter(ingredients):
+            return [ingredient[:-1] for ingredient in ingredients]
+
+        with patch('app.services.recipe_service.canonicalize_ingredients',
+                   side_effect=strip_last_letter) as mock_canonicalize, \
+                patch('app.services.recipe_backends.client') as mock_client:
+            mock_client.aio.models.generate_content_stream = AsyncMock(return_value=stream())
+            response = test_client.post(
+                "/api/v1/recipes/generate/stream", json={"ingredients": ["tomatoes"]}
+            )
+
+        assert "event: done" in response.text
+        mock_canonicalize.assert_called_once()
+        prompt = mock_client.aio.models.generate_content_stream.call_args.kwargs["contents"]
+        assert prompt.endswith("ingredients: tomatoe.")
+
+    def test_generate_recipes_stream_empty_ingredients(self, test_client):
+        """Test that streaming validates the request before starting."""
+        response = test_client.post("/api/v1/recipes/generate/stream", json={"ingredients": []})
+
+        assert response.status_code == 400
+
+    def test_generate_recipes_stream_no_usable_ingredients(self, test_client):
+        """Test that streaming validates canonicalized ingredients before starting."""
+        response = test_client.post(
+            "/api/v1/recipes/generate/stream", json={"ingredients": ["..."]}
+        )
+
+        assert response.status_code == 400
+
+    def test_generate_recipes_batch(self, test_client):
+        """Test generating recipes for several requests in one call."""
+        with patch('app.api.v1.recipes.recipe_service.generate_recipes_batch_async') as mock_batch:
+            mock_batch.return_value = [
+                RecipeBatchItem(index=0, recipes=[
+                    Recipe(recipe_name="Soup", ingredients=["onion"], instructions="Simmer")
+                ]),
+                RecipeBatchItem(index=1, error="Failed to generate recipes: API Error"),
+            ]
+
+            response = test_client.post(
+                "/api/v1/recipes/generate/batch",
+                json={
+                    "requests": [{"ingredients": ["onion"]}, {"ingredients": ["beef"]}],
+                    "pack_prompts": True
+                }
+            )
+
+            assert response.status_code == 200
+            results = response.json()["results"]
+            assert results[0]["recipes"][0]["recipe_name"] == "Soup"
+            assert results[1]["error"] == "Failed to generate recipes: API Error"
+            assert mock_batch.call_args.kwargs == {"pack_prompts": True}
+
+    def test_generate_recipes_batch_empty(self, test_client):
+        """Test that an empty batch is rejected."""
+        response = test_client.post("/api/v1/recipes/generate/batch", json={"requests": []})
+
+        assert response.status_code == 422
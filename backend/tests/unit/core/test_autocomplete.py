@@ -0,0 +1,53 @@
+import pytest
+
+from app.core.autocomplete import PrefixIndex, word_starts
+from app.core.compact_catalog import CompactCatalog
+
+
+@pytest.fixture
+def index():
+    """Prefix index built over a handful of catalog names."""
+    index = PrefixIndex()
+    index.build(CompactCatalog.from_rows([
+        (1, "cheese blue"),
+        (2, "blueberries raw"),
+        (3, "cheese brick"),
+        (4, "chervil dried"),
+        (5, "butter with salt"),
+    ]), hot_prefix_length=3, hot_results=2)
+    return index
+
+
+@pytest.mark.unit
+class TestPrefixIndex:
+    """Test cases for the autocomplete prefix index."""
+
+    def test_word_starts(self):
+        """Test locating word boundaries."""
+        assert word_starts("cheese  blue") == [0, 8]
+
+    def test_complete_hot_prefix(self, index):
+        """Test completing a precomputed three-character prefix."""
+        assert index.complete("che", 2) == [(1, "cheese blue"), (3, "cheese brick")]
+
+    def test_complete_matches_word_starts(self, index):
+        """Test completing words in the middle of a name."""
+        assert index.complete("blue", 5) == [(2, "blueberries raw"), (1, "cheese blue")]
+
+    def test_complete_longer_prefix(self, index):
+        """Test completing prefixes longer than the precomputed length."""
+        assert index.complete("CHEESE B", 5) == [(1, "cheese blue"), (3, "cheese brick")]
+        assert index.complete("cherv", 5) == [(4, "chervil dried")]
+
+    def test_complete_beyond_precomputed_results(self, index):
+        """Test that larger limits scan the sorted array."""
+        assert len(index.complete("che", 5)) == 3
+
+    def test_complete_no_match(self, index):
+        """Test completing an unknown prefix."""
+        assert index.complete("xyz", 5) == []
+        assert index.complete("heese", 5) == []
+
+    def test_complete_unbuilt_index(self):
+        """Test completing before the index is built."""
+        assert PrefixIndex().complete("che", 5) is None
@@ -0,0 +1,61 @@
+import pytest
+
+from app.core.cache import SearchCache
+
+
+@pytest.mark.unit
+class TestSearchCache:
+    """Test cases for the food search result cache."""
+
+    def test_hit_and_miss(self):
+        """Test that lookups are counted as hits and misses."""
+        cache = SearchCache(maxsize=10, ttl=60)
+
+        assert cache.get("chicken") is None
+        cache.set("chicken", ("result",))
+        assert cache.get("chicken") == ("result",)
+
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.size == 1
+        assert stats.hit_rate == 0.5
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SearchCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats().evictions == 1
+
+    def test_ttl_expiration(self):
+        """Test that entries expire after the TTL."""
+        now = [0]
+        cache = SearchCache(maxsize=10, ttl=60, timer=lambda: now[0])
+        cache.set("a", 1)
+        now[0] = 100
+
+        assert cache.get("a") is None
+        assert cache.stats().expirations == 1
+
+    def test_clear_is_not_eviction(self):
+        """Test that invalidating the cache does not count evictions."""
+        cache = SearchCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert cache.stats().evictions == 0
+
+    def test_disabled_cache(self):
+        """Test that a zero-sized cache stores nothing."""
+        cache = SearchCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats().size == 0
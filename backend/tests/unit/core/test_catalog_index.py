@@ -0,0 +1,54 @@
+import pytest
+
+from app.core.autocomplete import PrefixIndex
+from app.core.catalog_index import CatalogIndex
+from app.core.compact_catalog import CompactCatalog
+from app.core.fuzzy_index import FuzzyIndex
+from app.core.trigram_index import TrigramIndex
+
+
+@pytest.fixture
+def catalog():
+    """A small compact catalog."""
+    return CompactCatalog.from_rows([(1, "butter with salt"), (2, "salt table")])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("index_type", [TrigramIndex, FuzzyIndex, PrefixIndex])
+class TestCatalogIndex:
+    """Test cases for the lifecycle shared by the catalog search indexes."""
+
+    def test_is_catalog_index(self, index_type):
+        """Test that every search index uses the shared lifecycle."""
+        assert issubclass(index_type, CatalogIndex)
+
+    def test_export_and_import_state(self, index_type, catalog):
+        """Test restoring an exported index over the same catalog."""
+        built = index_type()
+        assert built.export_state() is None
+        built.build(catalog)
+
+        exported = built.export_state()
+        restored = index_type()
+        restored.import_state(catalog, exported)
+
+        assert None in exported
+        assert restored.is_ready
+        assert restored._state == built._state
+
+    def test_import_state_rejects_other_fields(self, index_type, catalog):
+        """Test that state stored with different fields is refused."""
+        built = index_type()
+        built.build(catalog)
+
+        with pytest.raises(ValueError, match=index_type.__name__):
+            index_type().import_state(catalog, built.export_state()[:-1])
+
+    def test_clear(self, index_type, catalog):
+        """Test dropping a built index."""
+        index = index_type()
+        index.build(catalog)
+
+        index.clear()
+
+        assert not index.is_ready
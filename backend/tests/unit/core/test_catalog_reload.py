@@ -0,0 +1,131 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.autocomplete import PrefixIndex
+from app.core.catalog_reload import (
+    CatalogReloadError,
+    poll_catalog,
+    refresh_catalog,
+    reload_catalog,
+    watch_catalog,
+)
+from app.core.fuzzy_index import FuzzyIndex
+from app.core.trigram_index import TrigramIndex
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Ingredients CSV matching the sample food data plus one new food."""
+    csv_file = tmp_path / "ingredients.csv"
+    csv_file.write_text(
+        "descrip\nchicken breast\ntomato\nonion\ngarlic\nolive oil\nsalt\nblack pepper\npaprika\n",
+        encoding="utf-8",
+    )
+    return csv_file
+
+
+@pytest.fixture
+def reload_env(test_engine, populated_test_session, csv_file, tmp_path):
+    """Point reloading at the test database, a temp CSV and fresh indexes."""
+    trigram = TrigramIndex()
+    with patch('app.core.catalog_reload.settings.INGREDIENTS_CSV_PATH', str(csv_file)), \
+            patch('app.core.catalog_reload.settings.CATALOG_SNAPSHOT_PATH', None), \
+            patch('app.core.shared_catalog.settings.DATABASE_FILE_NAME',
+                  str(tmp_path / "database.db")), \
+            patch('app.core.shared_catalog._indexed_hash', None), \
+            patch('app.core.database.engine', test_engine), \
+            patch('app.core.database.read_engine', None), \
+            patch('app.core.database.trigram_index', trigram), \
+            patch('app.core.database.prefix_index', PrefixIndex()), \
+            patch('app.core.database.fuzzy_index', FuzzyIndex()), \
+            patch('app.core.catalog_reload.trigram_index', trigram):
+        yield trigram
+
+
+@pytest.mark.unit
+class TestCatalogReload:
+    """Test cases for reloading the catalog without a restart."""
+
+    def test_reload_applies_diff_and_rebuilds_indexes(self, reload_env):
+        """Test that a reload inserts new foods and makes them searchable."""
+        with patch('app.core.shared_catalog.food_search_cache') as mock_cache:
+            result = reload_catalog()
+
+        assert (result.inserted, result.deleted, result.food_count) == (1, 0, 8)
+        assert [name for _, name in reload_env.search("paprika", 20)] == ["paprika"]
+        mock_cache.clear.assert_called_once()
+
+    def test_reload_unchanged_skips_rebuild(self, reload_env):
+        """Test that reloading an unchanged CSV does no work the second time."""
+        reload_catalog()
+
+        with patch('app.core.catalog_reload.database.build_search_indexes') as mock_build, \
+                patch('app.core.catalog_reload.database.sync_ingredients') as mock_sync:
+            result = reload_catalog()
+
+        mock_sync.assert_not_called()
+        mock_build.assert_not_called()
+        assert (result.inserted, result.deleted, result.food_count) == (0, 0, 8)
+
+    def test_reload_refused_in_snapshot_mode(self):
+        """Test that a read-only snapshot cannot be reloaded."""
+        with patch('app.core.catalog_reload.settings.CATALOG_SNAPSHOT_PATH', "/snapshots/v1"):
+            with pytest.raises(CatalogReloadError):
+                reload_catalog()
+
+    def test_reload_missing_csv(self, reload_env):
+        """Test reloading when the CSV file is gone."""
+        with patch('app.core.catalog_reload.settings.INGREDIENTS_CSV_PATH', "missing.csv"):
+            with pytest.raises(CatalogReloadError):
+                reload_catalog()
+
+    def test_refresh_picks_up_reload_by_another_worker(self, reload_env, csv_file):
+        """Test that a worker rebuilds its indexes after another worker reloads."""
+        reload_catalog()
+        assert refresh_catalog() is False
+
+        # Another worker reloads: the database changes but these indexes do not
+        csv_file.write_text("descrip\nsaffron\n", encoding="utf-8")
+        with patch('app.core.catalog_reload.index_catalog'):
+            reload_catalog()
+        assert reload_env.search("saffron", 20) == []
+
+        assert refresh_catalog() is True
+        assert [name for _, name in reload_env.search("saffron", 20)] == ["saffron"]
+        assert refresh_catalog() is False
+
+    async def test_poll_catalog_refreshes_until_stopped(self):
+        """Test that polling refreshes periodically and exits when stopped."""
+        stop_event = asyncio.Event()
+        refreshed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def fake_refresh():
+            loop.call_soon_threadsafe(refreshed.set)
+
+        with patch('app.core.catalog_reload.settings.CATALOG_REFRESH_INTERVAL_SECONDS', 0.01), \
+                patch('app.core.catalog_reload.refresh_catalog', side_effect=fake_refresh):
+            poller = asyncio.create_task(poll_catalog(stop_event))
+            await asyncio.wait_for(refreshed.wait(), timeout=10)
+            stop_event.set()
+            await asyncio.wait_for(poller, timeout=10)
+
+    async def test_watch_catalog_reloads_on_change(self, csv_file):
+        """Test that changing the CSV triggers a reload."""
+        stop_event = asyncio.Event()
+        reloaded = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def fake_reload():
+            loop.call_soon_threadsafe(reloaded.set)
+
+        with patch('app.core.catalog_reload.settings.INGREDIENTS_CSV_PATH', str(csv_file)), \
+                patch('app.core.catalog_reload.reload_catalog', side_effect=fake_reload):
+            watcher = asyncio.create_task(watch_catalog(stop_event))
+            await asyncio.sleep(0.3)
+            csv_file.write_text("descrip\nsalt\n", encoding="utf-8")
+            await asyncio.wait_for(reloaded.wait(), timeout=10)
+            stop_event.set()
+            await asyncio.wait_for(watcher, timeout=10)
@@ -0,0 +1,69 @@
+import pytest
+
+from app.core.compact_catalog import CompactCatalog
+
+
+@pytest.fixture
+def catalog(sample_food_data):
+    """Compact catalog over the sample food data, stored out of id order."""
+    rows = [(i, food["name"]) for i, food in enumerate(sample_food_data, start=1)]
+    return CompactCatalog.from_rows(reversed(rows))
+
+
+@pytest.mark.unit
+class TestCompactCatalog:
+    """Test cases for the compact array-backed catalog."""
+
+    def test_rows_in_id_order(self, catalog):
+        """Test that rows are packed in ascending id order."""
+        assert len(catalog) == 7
+        assert catalog.row_at(0) == (1, "chicken breast")
+        assert list(catalog.rows())[-1] == (7, "black pepper")
+
+    def test_search(self, catalog):
+        """Test scanning the buffer for a substring."""
+        assert catalog.search("ON", 10) == [(3, "onion")]
+        assert catalog.search("o", 2) == [(2, "tomato"), (3, "onion")]
+
+    def test_search_after_id(self, catalog):
+        """Test resuming a scan after a cursor."""
+        assert catalog.search("o", 2, after_id=3) == [(5, "olive oil")]
+
+    def test_search_does_not_span_rows(self, catalog):
+        """Test that a match cannot run across two names."""
+        assert catalog.search("tomatoonion", 10) == []
+        assert catalog.search("tomato\nonion", 10) == []
+
+    def test_search_unicode_names(self):
+        """Test that non-ASCII names round-trip and fold like SQLite."""
+        catalog = CompactCatalog.from_rows([(1, "Crème Fraîche"), (2, "CRÈME brûlée")])
+
+        assert catalog.name_at(0) == "Crème Fraîche"
+        assert catalog.search("crème", 10) == [(1, "Crème Fraîche")]
+
+    def test_save_and_load_mmap(self, catalog, tmp_path):
+        """Test round-tripping the catalog through a memory-mapped file."""
+        path = str(tmp_path / "catalog.bin")
+        catalog.save(path)
+
+        loaded = CompactCatalog.load(path)
+        try:
+            assert list(loaded.rows()) == list(catalog.rows())
+            assert loaded.search("pepper", 10) == [(7, "black pepper")]
+        finally:
+            loaded.close()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        """Test loading a file that is not a catalog."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\x00" * 32)
+
+        with pytest.raises(ValueError):
+            CompactCatalog.load(str(path))
+
+    def test_empty_catalog(self):
+        """Test an empty catalog."""
+        catalog = CompactCatalog.from_rows([])
+
+        assert len(catalog) == 0
+        assert catalog.search("a", 10) == []
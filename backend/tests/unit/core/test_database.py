@@ -1,19 +1,56 @@
 import os
 import tempfile
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 
 import pytest
-from sqlmodel import Session, create_engine
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
 
 from app.core.database import (
+    build_fts_match_query,
+    create_database_engine,
     create_db_and_tables,
     clear_db_and_tables,
+    create_fts_table,
+    get_catalog_hash,
     import_ingredients,
-    select_foods_containing_substring
+    open_read_engine,
+    read_only_database_url,
+    rebuild_fts_index,
+    select_foods_containing_substring,
+    select_foods_containing_substrings,
+    select_foods_matching_fts,
+    select_foods_matching_fts_many,
+    select_foods_with_word_prefix,
+    search_engine,
+    sync_ingredients,
 )
 from app.models.database import Food
 
 
+@pytest.fixture
+def fts_engine():
+    """In-memory engine with foods loaded into the FTS5 index."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            Food(name="butter with salt"),
+            Food(name="butter whipped w salt"),
+            Food(name="peanut butter smooth"),
+            Food(name="salt table"),
+        ])
+        session.commit()
+
+    with patch('app.core.database.engine', engine):
+        create_fts_table()
+        rebuild_fts_index()
+        yield engine
+
+
 @pytest.mark.unit
 class TestDatabaseOperations:
     """Test cases for database operations."""
@@ -39,6 +76,28 @@ class TestDatabaseOperations:
 
             assert not db_file.exists()
 
+    def test_clear_db_and_tables_after_read_only_worker(self, tmp_path):
+        """Test that the WAL side files go too when the last connection was read-only."""
+        database_file = tmp_path / "food.db"
+        writer = create_database_engine(f"sqlite:///{database_file}")
+        SQLModel.metadata.create_all(writer)
+        with Session(writer) as session:
+            session.add(Food(name="onion"))
+            session.commit()
+        reader = create_database_engine(
+            read_only_database_url(str(database_file)), read_only=True
+        )
+        with reader.connect() as connection:
+            connection.execute(text("SELECT name FROM food")).all()
+        writer.dispose()
+
+        with patch('app.core.database.settings.DATABASE_FILE_NAME', str(database_file)), \
+                patch('app.core.database.engine', reader), \
+                patch('app.core.database.read_engine', None):
+            clear_db_and_tables()
+
+        assert os.listdir(tmp_path) == []
+
     def test_clear_db_and_tables_file_not_exists(self):
         """Test clearing database when file doesn't exist."""
         with patch('app.core.database.settings') as mock_settings:
@@ -47,30 +106,80 @@ class TestDatabaseOperations:
             # Should not raise an exception
             clear_db_and_tables()
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('csv.DictReader')
-    def test_import_ingredients_success(self, mock_csv_reader, mock_file, test_session):
+    def test_import_ingredients_success(self, test_engine, tmp_path):
         """Test successful ingredient import."""
-        # Mock CSV data
-        mock_csv_reader.return_value = [
-            {"descrip": "chicken breast"},
-            {"descrip": "tomato"},
-            {"descrip": "onion"}
-        ]
+        csv_file = tmp_path / "ingredients.csv"
+        csv_file.write_text("descrip\nchicken breast\ntomato\nonion\n", encoding="utf-8")
+
+        with patch('app.core.database.engine', test_engine), \
+                patch('app.core.database.settings.INGREDIENTS_CSV_PATH', str(csv_file)), \
+                patch('app.core.database.settings.IMPORT_CHUNK_SIZE', 2):
+            assert import_ingredients() is True
+
+        from sqlmodel import select
+        with Session(test_engine) as session:
+            foods = session.exec(select(Food).order_by(Food.id)).all()
+        assert [food.name for food in foods] == ["chicken breast", "tomato", "onion"]
 
-        with patch('app.core.database.Session') as mock_session_class:
-            mock_session_instance = test_session
-            mock_session_class.return_value.__enter__.return_value = mock_session_instance
+    def test_import_ingredients_skips_unchanged_csv(self, test_engine, tmp_path):
+        """Test that re-importing an unchanged CSV does not duplicate rows."""
+        csv_file = tmp_path / "ingredients.csv"
+        csv_file.write_text("descrip\nchicken breast\ntomato\n", encoding="utf-8")
 
-            import_ingredients()
+        with patch('app.core.database.engine', test_engine), \
+                patch('app.core.database.settings.INGREDIENTS_CSV_PATH', str(csv_file)):
+            assert import_ingredients() is True
+            assert import_ingredients() is False
 
-            # Verify foods were added to the session
-            from sqlmodel import select
-            foods = test_session.exec(select(Food)).all()
-            assert len(foods) == 3
-            assert foods[0].name == "chicken breast"
-            assert foods[1].name == "tomato"
-            assert foods[2].name == "onion"
+            csv_file.write_text("descrip\nonion\n", encoding="utf-8")
+            assert import_ingredients() is True
+
+        from sqlmodel import select
+        with Session(test_engine) as session:
+            foods = session.exec(select(Food)).all()
+        assert [food.name for food in foods] == ["onion"]
+
+    def test_fts_index_filled_when_csv_unchanged(self, tmp_path):
+        """Test that switching to FTS on an existing database fills the new index."""
+        csv_file = tmp_path / "ingredients.csv"
+        csv_file.write_text("descrip\nbutter with salt\ntomato\n", encoding="utf-8")
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'food.db'}")
+
+        with patch('app.core.database.engine', engine), \
+                patch('app.core.database.settings.INGREDIENTS_CSV_PATH', str(csv_file)), \
+                patch('app.core.database.open_read_engine'), \
+                patch('app.core.database.refresh_search_indexes'):
+            with patch('app.core.database.settings.FOOD_SEARCH_MODE', "trigram"):
+                create_db_and_tables()
+            with patch('app.core.database.settings.FOOD_SEARCH_MODE', "fts"):
+                create_db_and_tables()
+                assert import_ingredients() is False
+
+            assert [food.name for food in select_foods_matching_fts("butt")] == ["butter with salt"]
+        engine.dispose()
+
+    def test_fts_index_follows_reimport_in_other_mode(self, tmp_path):
+        """Test that a reimport outside FTS mode keeps an existing FTS index current."""
+        csv_file = tmp_path / "ingredients.csv"
+        csv_file.write_text("descrip\nbutter with salt\ntomato\n", encoding="utf-8")
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'food.db'}")
+
+        with patch('app.core.database.engine', engine), \
+                patch('app.core.database.settings.INGREDIENTS_CSV_PATH', str(csv_file)), \
+                patch('app.core.database.open_read_engine'), \
+                patch('app.core.database.refresh_search_indexes'):
+            with patch('app.core.database.settings.FOOD_SEARCH_MODE', "fts"):
+                create_db_and_tables()
+            csv_file.write_text("descrip\nbutter whipped\npeanut butter\n", encoding="utf-8")
+            with patch('app.core.database.settings.FOOD_SEARCH_MODE', "like"):
+                create_db_and_tables()
+            with patch('app.core.database.settings.FOOD_SEARCH_MODE', "fts"):
+                create_db_and_tables()
+
+            assert {food.name for food in select_foods_matching_fts("butt")} == {
+                "butter whipped", "peanut butter"
+            }
+        engine.dispose()
 
     def test_import_ingredients_file_not_found(self):
         """Test ingredient import when CSV file doesn't exist."""
@@ -135,3 +244,228 @@ class TestDatabaseOperations:
         # Limit to 2 results manually since we're testing the query logic
         limited_results = results[:2]
         assert len(limited_results) == 2
+
+    def test_select_foods_containing_substring_limit_in_sql(self, test_engine, populated_test_session):
+        """Test that the result limit and cursor are applied by the query."""
+        populated_test_session.add_all([Food(name="chicken thigh"), Food(name="chicken wing")])
+        populated_test_session.commit()
+
+        with patch('app.core.database.engine', test_engine):
+            first_page = select_foods_containing_substring("chicken", max_results=2)
+            second_page = select_foods_containing_substring(
+                "chicken", max_results=2, after_id=first_page[-1].id
+            )
+
+        assert [food.name for food in first_page] == ["chicken breast", "chicken thigh"]
+        assert [food.name for food in second_page] == ["chicken wing"]
+
+    def test_select_foods_with_word_prefix(self, test_engine, populated_test_session):
+        """Test the SQL fallback for autocompletion."""
+        with patch('app.core.database.engine', test_engine):
+            results = select_foods_with_word_prefix("pep")
+
+        assert [food.name for food in results] == ["black pepper"]
+
+    def test_select_foods_containing_substrings(self, test_engine, populated_test_session):
+        """Test searching several substrings in one pass."""
+        with patch('app.core.database.engine', test_engine):
+            results = select_foods_containing_substrings(["on", "PEPPER", "xyz"], max_results=1)
+
+        assert [food.name for food in results["on"]] == ["onion"]
+        assert [food.name for food in results["PEPPER"]] == ["black pepper"]
+        assert results["xyz"] == []
+
+
+@pytest.mark.unit
+class TestFullTextSearch:
+    """Test cases for the FTS5 search mode."""
+
+    def test_build_fts_match_query(self):
+        """Test converting free text into a prefix FTS5 query."""
+        assert build_fts_match_query("Butt sal") == '"butt"* "sal"*'
+        assert build_fts_match_query('"; drop') == '"drop"*'
+        assert build_fts_match_query("  --  ") is None
+
+    def test_select_foods_matching_fts_prefix(self, fts_engine):
+        """Test token-prefix matching."""
+        results = select_foods_matching_fts("butt sal")
+
+        assert {food.name for food in results} == {"butter with salt", "butter whipped w salt"}
+
+    def test_select_foods_matching_fts_ranked(self, fts_engine):
+        """Test results are ordered by bm25 relevance."""
+        results = select_foods_matching_fts("salt")
+
+        assert results[0].name == "salt table"
+        assert len(results) == 3
+
+    def test_select_foods_matching_fts_pagination(self, fts_engine):
+        """Test continuing a ranked search after a cursor."""
+        ranked = select_foods_matching_fts("salt")
+
+        first_page = select_foods_matching_fts("salt", max_results=2)
+        second_page = select_foods_matching_fts("salt", max_results=2, after_id=first_page[-1].id)
+
+        assert [food.id for food in first_page + second_page] == [food.id for food in ranked]
+
+    def test_select_foods_matching_fts_pagination_ties(self, fts_engine):
+        """Test foods with equal rank are paged by id, neither skipped nor repeated."""
+        ranked = select_foods_matching_fts("butter")
+        paged = []
+        page = select_foods_matching_fts("butter", max_results=1)
+        while page:
+            paged += page
+            page = select_foods_matching_fts("butter", max_results=1, after_id=page[-1].id)
+
+        # "butter with salt" and "peanut butter smooth" have the same bm25 rank
+        assert [food.id for food in paged] == [food.id for food in ranked] == [1, 3, 2]
+
+    def test_select_foods_matching_fts_cursor_not_matching(self, fts_engine):
+        """Test a cursor outside the results ends the listing."""
+        assert select_foods_matching_fts("salt", after_id=3) == []
+
+    def test_select_foods_matching_fts_no_tokens(self, fts_engine):
+        """Test searching with no searchable tokens."""
+        assert select_foods_matching_fts("!!!") == []
+
+    def test_select_foods_matching_fts_many(self, fts_engine):
+        """Test several FTS5 searches over one connection."""
+        results = select_foods_matching_fts_many(["peanut", "table"])
+
+        assert [food.name for food in results["peanut"]] == ["peanut butter smooth"]
+        assert [food.name for food in results["table"]] == ["salt table"]
+
+
+@pytest.mark.unit
+class TestPerformanceProfile:
+    """Test cases for the SQLite connection profile and read-only search engine."""
+
+    @staticmethod
+    def pragma(connection, name):
+        """Read a pragma value on a connection."""
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_writer_pragmas(self, tmp_path):
+        """Test that new connections get the performance profile."""
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'food.db'}")
+
+        with engine.connect() as connection:
+            assert self.pragma(connection, "journal_mode") == "wal"
+            assert self.pragma(connection, "synchronous") == 1  # NORMAL
+            assert self.pragma(connection, "temp_store") == 2  # MEMORY
+            assert self.pragma(connection, "cache_size") == -64 * 1024
+            assert self.pragma(connection, "query_only") == 0
+        assert engine.pool.size() == 8
+        engine.dispose()
+
+    def test_reader_is_query_only(self, tmp_path):
+        """Test that read-only connections refuse writes."""
+        database_file = tmp_path / "food.db"
+        writer = create_database_engine(f"sqlite:///{database_file}")
+        SQLModel.metadata.create_all(writer)
+        reader = create_database_engine(read_only_database_url(str(database_file)), read_only=True)
+
+        with reader.connect() as connection:
+            assert self.pragma(connection, "query_only") == 1
+            with pytest.raises(Exception):
+                connection.execute(text("INSERT INTO food (name) VALUES ('salt')"))
+        reader.dispose()
+        writer.dispose()
+
+    def test_profile_disabled(self, tmp_path):
+        """Test that the profile can be switched off."""
+        with patch('app.core.database.settings.SQLITE_PERFORMANCE_PROFILE', False):
+            engine = create_database_engine(f"sqlite:///{tmp_path / 'food.db'}")
+
+        with engine.connect() as connection:
+            assert self.pragma(connection, "journal_mode") == "delete"
+        engine.dispose()
+
+    def test_in_memory_engine(self):
+        """Test that in-memory databases skip pool sizing."""
+        engine = create_database_engine("sqlite://")
+
+        with engine.connect() as connection:
+            assert self.pragma(connection, "temp_store") == 2
+
+    def test_searches_use_read_engine(self, tmp_path, test_engine):
+        """Test that searches go through the read-only engine once it is open."""
+        database_file = tmp_path / "food.db"
+        writer = create_database_engine(f"sqlite:///{database_file}")
+        SQLModel.metadata.create_all(writer)
+        with Session(writer) as session:
+            session.add(Food(name="onion"))
+            session.commit()
+
+        with patch('app.core.database.settings.DATABASE_FILE_NAME', str(database_file)), \
+                patch('app.core.database.engine', test_engine), \
+                patch('app.core.database.read_engine', None):
+            assert search_engine() is test_engine
+            open_read_engine()
+            assert search_engine() is not test_engine
+            assert [food.name for food in select_foods_containing_substring("on")] == ["onion"]
+            clear_db_and_tables()
+            assert search_engine() is test_engine
+
+        assert not database_file.exists()
+        writer.dispose()
+
+    def test_read_engine_disabled(self, test_engine):
+        """Test that searches share the main engine when the read engine is disabled."""
+        with patch('app.core.database.settings.SQLITE_READ_ENGINE_ENABLED', False), \
+                patch('app.core.database.engine', test_engine), \
+                patch('app.core.database.read_engine', None):
+            open_read_engine()
+
+            assert search_engine() is test_engine
+
+
+@pytest.mark.unit
+class TestSyncIngredients:
+    """Test cases for applying CSV changes to an existing food table."""
+
+    @staticmethod
+    def foods(engine):
+        """Return the food table as ``{name: id}``."""
+        from sqlmodel import select
+        with Session(engine) as session:
+            return {food.name: food.id for food in session.exec(select(Food)).all()}
+
+    def test_sync_applies_only_differences(self, test_engine, populated_test_session, tmp_path):
+        """Test that unchanged foods keep their ids while others are added or removed."""
+        before = self.foods(test_engine)
+        csv_file = tmp_path / "ingredients.csv"
+        csv_file.write_text(
+            "descrip\nchicken breast\ntomato\nonion\ngarlic\nolive oil\nblack pepper\n"
+            "paprika\nsalt\n",
+            encoding="utf-8",
+        )
+
+        inserted, deleted = sync_ingredients(str(csv_file), "hash", test_engine)
+
+        after = self.foods(test_engine)
+        assert (inserted, deleted) == (1, 0)
+        assert {name: after[name] for name in before} == before
+        assert after["paprika"] > max(before.values())
+
+        csv_file.write_text("descrip\ntomato\nsalt\n", encoding="utf-8")
+        assert sync_ingredients(str(csv_file), "hash2", test_engine) == (0, 6)
+        assert self.foods(test_engine) == {"tomato": before["tomato"], "salt": before["salt"]}
+        with patch('app.core.database.engine', test_engine):
+            assert get_catalog_hash() == "hash2"
+
+    def test_sync_updates_fts_index(self, fts_engine, tmp_path):
+        """Test that the FTS5 index follows inserted and deleted rows."""
+        csv_file = tmp_path / "ingredients.csv"
+        csv_file.write_text(
+            "descrip\nbutter with salt\npeanut butter smooth\nsalt table\nsea salt\n",
+            encoding="utf-8",
+        )
+
+        assert sync_ingredients(str(csv_file), "hash", fts_engine) == (1, 1)
+
+        assert [food.name for food in select_foods_matching_fts("whipped")] == []
+        assert [food.name for food in select_foods_matching_fts("sea")] == ["sea salt"]
+        with fts_engine.connect() as connection:
+            integrity = "INSERT INTO food_fts(food_fts, rank) VALUES ('integrity-check', 1)"
+            connection.execute(text(integrity))
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.executor import (
+    get_search_executor,
+    run_in_search_executor,
+    shutdown_search_executor,
+)
+
+
+@pytest.mark.unit
+class TestSearchExecutor:
+    """Test cases for the dedicated search thread pool."""
+
+    async def test_runs_off_the_event_loop(self):
+        """Test that blocking work does not stall other coroutines."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        def blocking_search():
+            time.sleep(0.1)
+            return threading.current_thread().name
+
+        thread_name, _ = await asyncio.gather(run_in_search_executor(blocking_search), ticker())
+
+        assert thread_name.startswith("food-search")
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.1
+
+    async def test_passes_arguments(self):
+        """Test forwarding positional and keyword arguments."""
+        result = await run_in_search_executor(lambda a, b=0: a + b, 1, b=2)
+
+        assert result == 3
+
+    def test_shutdown_recreates_executor(self):
+        """Test that the executor is recreated after shutdown."""
+        first = get_search_executor()
+        shutdown_search_executor()
+
+        assert get_search_executor() is not first
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import patch
+
+from app.core.compact_catalog import CompactCatalog
+from app.core.fuzzy_index import FuzzyIndex, deletes, edit_distance, tokenize
+
+
+@pytest.fixture
+def index():
+    """Fuzzy index built over a handful of catalog names."""
+    index = FuzzyIndex()
+    index.build(CompactCatalog.from_rows([
+        (1, "broccoli raw"),
+        (2, "broccoli raab raw"),
+        (3, "cheese parmesan grated"),
+        (4, "parmesan chs topping fat free"),
+        (5, "rice white"),
+    ]))
+    return index
+
+
+@pytest.mark.unit
+class TestFuzzyIndex:
+    """Test cases for the typo-tolerant fuzzy index."""
+
+    def test_tokenize(self):
+        """Test tokenizing names and queries."""
+        assert tokenize("Cheese, Parmesan  grated") == ["cheese", "parmesan", "grated"]
+
+    def test_deletes(self):
+        """Test generating deletion variants."""
+        assert deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+        assert "a" in deletes("abc", 2)
+
+    def test_edit_distance(self):
+        """Test bounded optimal string alignment distance."""
+        assert edit_distance("brocoli", "broccoli", 2) == 1
+        assert edit_distance("parmesean", "parmesan", 2) == 1
+        assert edit_distance("ricw", "rice", 2) == 1
+        assert edit_distance("form", "from", 1) == 1  # transposition
+        assert edit_distance("broccoli", "bro", 2) is None
+
+    def test_search_misspelling(self, index):
+        """Test finding foods despite typos, plainest names first."""
+        assert index.search("brocoli", 5) == [(1, "broccoli raw"), (2, "broccoli raab raw")]
+        assert index.search("parmesean", 1) == [(3, "cheese parmesan grated")]
+
+    def test_search_requires_every_token(self, index):
+        """Test that all query tokens must match."""
+        assert index.search("brocoli raab", 5) == [(2, "broccoli raab raw")]
+        assert index.search("brocoli chese", 5) == []
+
+    def test_search_short_tokens_exact(self, index):
+        """Test that very short tokens do not tolerate typos."""
+        assert index.search("rw", 5) == []
+
+    def test_search_unbuilt_index(self):
+        """Test searching before the index is built."""
+        assert FuzzyIndex().search("brocoli", 5) == []
+
+    def test_word_count(self, index):
+        """Test counting the foods that use a word."""
+        assert index.word_count("raw") == 2
+        assert index.word_count("parmesan") == 2
+        assert index.word_count("brocoli") == 0
+        assert FuzzyIndex().word_count("raw") == 0
+
+    def test_lookup_skips_tokens_longer_than_any_word(self, index):
+        """Test that very long tokens are rejected without generating their deletions."""
+        assert index.lookup("parmesann") == {"parmesan": 1}
+        with patch('app.core.fuzzy_index.deletes') as mock_deletes:
+            assert index.lookup("a" * 300) == {}
+            assert index.search("broccoli " + "x" * 300, 5) == []
+        mock_deletes.assert_called_once_with("broccoli", 2)
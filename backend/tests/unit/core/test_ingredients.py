@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import patch
+
+from app.core.compact_catalog import CompactCatalog
+from app.core.fuzzy_index import FuzzyIndex
+from app.core.ingredients import (
+    canonical_word,
+    canonicalize_ingredient,
+    canonicalize_ingredients,
+)
+
+
+@pytest.fixture(autouse=True)
+def catalog_index():
+    """Serve canonicalization from a fuzzy index over a small catalog."""
+    index = FuzzyIndex()
+    index.build(CompactCatalog.from_rows([
+        (1, "tomato  green"),
+        (2, "tomatoes sundried"),
+        (3, "broccoli raw"),
+        (4, "chicken breast raw"),
+        (5, "cherry sweet raw"),
+        (6, "noodl egg ckd"),
+        (7, "hummus"),
+    ]))
+    with patch('app.core.ingredients.fuzzy_index', index):
+        yield index
+
+
+@pytest.mark.unit
+class TestCanonicalWord:
+    """Test cases for mapping words onto the catalog vocabulary."""
+
+    def test_plurals_fold_to_catalog_singular(self):
+        """Test that plural forms become the singular the catalog uses."""
+        assert canonical_word("tomatoes") == "tomato"
+        assert canonical_word("cherries") == "cherry"
+        assert canonical_word("breasts") == "breast"
+
+    def test_non_plural_endings_are_kept(self):
+        """Test that words that only look plural are left alone."""
+        assert canonical_word("hummus") == "hummus"
+
+    def test_typos_are_corrected(self):
+        """Test that a dropped letter or swapped letters are fixed."""
+        assert canonical_word("brocoli") == "broccoli"
+        assert canonical_word("chikcen") == "chicken"
+
+    def test_unknown_words_are_not_forced_onto_the_catalog(self):
+        """Test that real words are not replaced by abbreviations or short words."""
+        assert canonical_word("noodle") == "noodle"
+        assert canonical_word("glass") == "glass"
+        assert canonical_word("kale") == "kale"
+
+
+@pytest.mark.unit
+class TestCanonicalizeIngredients:
+    """Test cases for canonicalizing ingredient lists."""
+
+    def test_equivalent_spellings_collapse(self):
+        """Test that case, spacing and plural variants become one ingredient."""
+        assert canonicalize_ingredients(["Tomatoes ", "tomato", "TOMATO"]) == ["tomato"]
+
+    def test_punctuation_and_spacing(self):
+        """Test that ingredients are rewritten as space-separated words."""
+        assert canonicalize_ingredient("  Chicken-Breasts, ") == "chicken breast"
+
+    def test_non_ascii_words_are_kept(self):
+        """Test that words outside the ASCII catalog vocabulary survive intact."""
+        assert canonicalize_ingredients(["Jalapeño", "crème fraîche", "açaí", "豆腐", "キムチ"]) == [
+            "jalapeño", "crème fraîche", "açaí", "豆腐", "キムチ"
+        ]
+
+    def test_mixed_words_canonicalize_ascii_only(self):
+        """Test that ASCII words are canonicalized next to non-ASCII ones."""
+        assert canonicalize_ingredient("Tomatoes à la provençale") == "tomato à la provençale"
+
+    def test_drops_empty_and_keeps_order(self):
+        """Test that blank entries are dropped and request order is kept."""
+        assert canonicalize_ingredients(["brocoli", " ", "Chicken", "broccoli"]) == [
+            "broccoli", "chicken"
+        ]
+
+    def test_bounds_the_list(self):
+        """Test that at most MAX_RECIPE_INGREDIENTS ingredients are kept."""
+        with patch('app.core.ingredients.settings.MAX_RECIPE_INGREDIENTS', 2):
+            assert canonicalize_ingredients(["a1", "b2", "c3"]) == ["a1", "b2"]
+
+    def test_stops_once_the_list_is_full(self):
+        """Test that ingredients past the cap are not canonicalized at all."""
+        with patch('app.core.ingredients.settings.MAX_RECIPE_INGREDIENTS', 1), \
+                patch('app.core.ingredients.canonical_word', side_effect=str) as mock_word:
+            assert canonicalize_ingredients(["a1", "b2", "c3"]) == ["a1"]
+        mock_word.assert_called_once_with("a1")
+
+    def test_without_catalog_only_normalizes(self):
+        """Test canonicalization before the catalog indexes are built."""
+        with patch('app.core.ingredients.fuzzy_index', FuzzyIndex()):
+            assert canonicalize_ingredients(["Tomatoes ", "tomatoes"]) == ["tomatoes"]
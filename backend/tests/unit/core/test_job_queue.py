@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from app.core.job_queue import JobQueue, QueueFullError
+
+
+async def echo(payload):
+    """Job handler returning its payload."""
+    return payload
+
+
+@pytest.mark.unit
+class TestJobQueue:
+    """Test cases for the in-process priority job queue."""
+
+    async def test_runs_jobs(self):
+        """Test that a submitted job runs and its result is kept."""
+        queue = JobQueue(echo, workers=2, maxsize=10, ttl=60)
+        await queue.start()
+
+        job = queue.submit("payload")
+        finished = await queue.wait(job.id, timeout=1)
+
+        assert finished.status == "succeeded"
+        assert finished.result == "payload"
+        assert finished.started_at is not None and finished.finished_at is not None
+        await queue.stop()
+
+    async def test_higher_priority_runs_first(self):
+        """Test that queued jobs start by priority, then in submission order."""
+        started = []
+        release = asyncio.Event()
+
+        async def handler(payload):
+            started.append(payload)
+            if payload == "blocker":
+                await release.wait()
+
+        queue = JobQueue(handler, workers=1, maxsize=10, ttl=60)
+        await queue.start()
+        queue.submit("blocker")
+        await asyncio.sleep(0)
+        jobs = [queue.submit("low"), queue.submit("high", priority=5), queue.submit("low 2")]
+
+        release.set()
+        for job in jobs:
+            await queue.wait(job.id, timeout=1)
+
+        assert started == ["blocker", "high", "low", "low 2"]
+        await queue.stop()
+
+    async def test_failures_are_recorded(self):
+        """Test that a failing handler marks the job failed."""
+        async def handler(payload):
+            raise ValueError("boom")
+
+        queue = JobQueue(handler, workers=1, maxsize=10, ttl=60)
+        await queue.start()
+
+        job = await queue.wait(queue.submit("payload").id, timeout=1)
+
+        assert job.status == "failed"
+        assert str(job.error) == "boom"
+        assert queue.stats().failed == 1
+        await queue.stop()
+
+    async def test_wait_times_out(self):
+        """Test that long-polling returns the unfinished job after the timeout."""
+        async def handler(payload):
+            await asyncio.sleep(10)
+
+        queue = JobQueue(handler, workers=1, maxsize=10, ttl=60)
+        await queue.start()
+
+        job = await queue.wait(queue.submit("payload").id, timeout=0.01)
+
+        assert job.status in ("queued", "running")
+        await queue.stop()
+        assert job.status == "failed"
+
+    async def test_rejects_when_full(self):
+        """Test that submissions beyond the queue bound are rejected."""
+        release = asyncio.Event()
+
+        async def handler(payload):
+            await release.wait()
+
+        queue = JobQueue(handler, workers=1, maxsize=1, ttl=60)
+        await queue.start()
+        queue.submit("running")
+        await asyncio.sleep(0)
+        queue.submit("queued")
+
+        with pytest.raises(QueueFullError):
+            queue.submit("rejected")
+        assert queue.stats().rejected == 1
+        release.set()
+        await queue.stop()
+
+    async def test_finished_jobs_expire(self, fake_clock):
+        """Test that finished jobs are forgotten after the TTL."""
+        queue = JobQueue(echo, workers=1, maxsize=10, ttl=60, clock=fake_clock)
+        await queue.start()
+        job = await queue.wait(queue.submit("payload").id, timeout=1)
+
+        fake_clock.now += 59
+        assert queue.get(job.id) is job
+        fake_clock.now += 1
+        assert queue.get(job.id) is None
+        await queue.stop()
+
+    def test_submit_requires_running_queue(self):
+        """Test that jobs cannot be submitted before the workers start."""
+        with pytest.raises(RuntimeError):
+            JobQueue(echo, workers=1, maxsize=10, ttl=60).submit("payload")
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.recipe_cache import RecipeCache
+from app.models.schemas import Recipe
+
+
+@pytest.fixture
+def recipes():
+    """A generated recipe list."""
+    return [Recipe(recipe_name="Soup", ingredients=["onion"], instructions="Simmer")]
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """URL of a temporary persistent cache database."""
+    return f"sqlite:///{tmp_path / 'recipes.db'}"
+
+
+@pytest.mark.unit
+class TestRecipeCache:
+    """Test cases for the two-tier recipe cache."""
+
+    def test_memory_only(self, recipes):
+        """Test caching without a persistent tier."""
+        cache = RecipeCache(maxsize=2, ttl=60)
+
+        assert cache.get("key") is None
+        cache.set("key", recipes)
+
+        assert cache.get("key") == recipes
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert not stats.persistent_enabled
+
+    def test_persistent_tier_survives_restart(self, recipes, database_url):
+        """Test that a new cache instance finds entries stored by another."""
+        first = RecipeCache(maxsize=2, ttl=60, database_url=database_url)
+        first.set("key", recipes)
+        first.close()
+
+        second = RecipeCache(maxsize=2, ttl=60, database_url=database_url)
+
+        assert second.get("key") == recipes
+        assert second.get("key") == recipes
+        stats = second.stats()
+        assert (stats.persistent_hits, stats.hits) == (1, 1)
+        second.close()
+
+    def test_persistent_entries_expire(self, fake_clock, recipes, database_url):
+        """Test that persistent entries past their TTL are not returned."""
+        cache = RecipeCache(maxsize=0, ttl=60, database_url=database_url, clock=fake_clock)
+        cache.set("key", recipes)
+
+        fake_clock.now += 61
+
+        assert cache.get("key") is None
+        assert cache.stats().persistent_misses == 1
+        cache.close()
+
+    def test_set_overwrites(self, recipes, database_url):
+        """Test that storing a key again replaces the persistent entry."""
+        cache = RecipeCache(maxsize=0, ttl=60, database_url=database_url)
+        replacement = [Recipe(recipe_name="Stew", ingredients=["onion"], instructions="Braise")]
+
+        cache.set("key", recipes)
+        cache.set("key", replacement)
+
+        assert cache.get("key") == replacement
+        cache.close()
+
+    def test_clear(self, recipes, database_url):
+        """Test clearing both tiers."""
+        cache = RecipeCache(maxsize=2, ttl=60, database_url=database_url)
+        cache.set("key", recipes)
+
+        cache.clear()
+
+        assert cache.get("key") is None
+        cache.close()
+
+    async def test_async_methods_use_worker_threads(self, recipes, database_url):
+        """Test that the async methods hand SQLite work to a worker thread."""
+        first = RecipeCache(maxsize=2, ttl=60, database_url=database_url)
+        second = RecipeCache(maxsize=2, ttl=60, database_url=database_url)
+
+        with patch('app.core.recipe_cache.asyncio.to_thread', wraps=asyncio.to_thread) as to_thread:
+            await first.set_async("key", recipes)
+            assert await second.get_async("key") == recipes
+            assert await second.get_async("key") == recipes
+
+        assert to_thread.call_count == 2
+        assert second.stats().persistent_hits == 1
+        first.close()
+        second.close()
+
+    async def test_async_methods_memory_only(self, recipes):
+        """Test that without a persistent tier no thread is involved."""
+        cache = RecipeCache(maxsize=2, ttl=60)
+
+        with patch('app.core.recipe_cache.asyncio.to_thread') as to_thread:
+            await cache.set_async("key", recipes)
+            assert await cache.get_async("key") == recipes
+
+        to_thread.assert_not_called()
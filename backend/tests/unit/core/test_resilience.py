@@ -0,0 +1,229 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientCaller,
+    RetryBudget,
+    is_retryable,
+)
+
+
+class UpstreamError(Exception):
+    """Error carrying an HTTP status, like google.genai APIError."""
+
+    def __init__(self, code):
+        super().__init__(f"upstream {code}")
+        self.code = code
+
+
+def caller(breaker=None, budget=None, max_attempts=3, deadline_seconds=5.0):
+    """Build a caller with negligible backoff."""
+    return ResilientCaller(
+        breaker or CircuitBreaker(failure_threshold=100, recovery_seconds=30),
+        budget or RetryBudget(ratio=0.2, min_per_second=0),
+        max_attempts=max_attempts,
+        deadline_seconds=deadline_seconds,
+        backoff_initial_seconds=0.001,
+        backoff_max_seconds=0.001,
+    )
+
+
+def flaky(failures, error):
+    """Callable that raises ``error`` ``failures`` times, then returns "ok"."""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+
+    call.calls = calls
+    return call
+
+
+@pytest.mark.unit
+class TestIsRetryable:
+    """Test cases for classifying failures."""
+
+    def test_classification(self):
+        """Test that overload, outages and timeouts are retryable and bad requests are not."""
+        assert is_retryable(UpstreamError(429))
+        assert is_retryable(UpstreamError(503))
+        assert is_retryable(asyncio.TimeoutError())
+        assert is_retryable(httpx.ConnectError("refused"))
+        assert is_retryable(httpx.ReadTimeout("timed out"))
+        assert is_retryable(httpx.RemoteProtocolError("disconnected"))
+        assert not is_retryable(UpstreamError(400))
+        assert not is_retryable(ValueError("bad"))
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test cases for the circuit breaker."""
+
+    def test_opens_after_threshold_and_fails_fast(self, fake_clock):
+        """Test that consecutive failures open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=30, clock=fake_clock)
+
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+
+        fake_clock.now += 10
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_call()
+        assert error.value.retry_after == 20
+        assert breaker.status() == ("open", 20)
+        assert breaker.rejected == 1
+
+    def test_success_resets_failures(self):
+        """Test that only consecutive failures count."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=30)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_allows_one_probe(self, fake_clock):
+        """Test recovery through a single probe call."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=30, clock=fake_clock)
+        breaker.record_failure()
+
+        fake_clock.now += 30
+        breaker.before_call()
+        assert breaker.state == "half_open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self, fake_clock):
+        """Test that a failing probe opens the breaker for another recovery period."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=30, clock=fake_clock)
+        breaker.record_failure()
+
+        fake_clock.now += 30
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.status() == ("open", 30)
+        assert breaker.times_opened == 2
+
+
+@pytest.mark.unit
+class TestRetryBudget:
+    """Test cases for the retry budget."""
+
+    def test_spends_and_refills(self, fake_clock):
+        """Test that retries are limited to deposited and time-based tokens."""
+        budget = RetryBudget(ratio=0.5, min_per_second=1, max_tokens=1, clock=fake_clock)
+
+        assert budget.try_spend()
+        assert not budget.try_spend()
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_spend()
+
+        fake_clock.now += 1
+        assert budget.try_spend()
+        assert budget.exhausted == 1
+
+
+@pytest.mark.unit
+class TestResilientCaller:
+    """Test cases for retrying calls behind the breaker."""
+
+    def test_retries_transient_failures(self):
+        """Test that retryable failures are retried until success."""
+        resilient = caller()
+        call = flaky(2, UpstreamError(503))
+
+        assert resilient.call(call) == "ok"
+        assert len(call.calls) == 3
+        assert resilient.stats().retries == 2
+
+    def test_does_not_retry_permanent_failures(self):
+        """Test that non-retryable failures are raised at once."""
+        resilient = caller()
+        call = flaky(1, UpstreamError(400))
+
+        with pytest.raises(UpstreamError):
+            resilient.call(call)
+        assert len(call.calls) == 1
+
+    def test_stops_after_max_attempts(self):
+        """Test that the last failure is raised once attempts run out."""
+        resilient = caller(max_attempts=2)
+        call = flaky(5, UpstreamError(429))
+
+        with pytest.raises(UpstreamError):
+            resilient.call(call)
+        assert len(call.calls) == 2
+
+    def test_retry_budget_limits_retries(self):
+        """Test that an exhausted budget stops retrying."""
+        resilient = caller(budget=RetryBudget(ratio=0, min_per_second=0, max_tokens=1))
+        call = flaky(5, UpstreamError(503))
+
+        with pytest.raises(UpstreamError):
+            resilient.call(call)
+        assert len(call.calls) == 2
+        assert resilient.stats().retry_budget_exhausted == 1
+
+    def test_deadline_stops_retrying(self):
+        """Test that no attempt starts after the deadline."""
+        resilient = caller(max_attempts=10, deadline_seconds=0)
+        call = flaky(5, UpstreamError(503))
+
+        with pytest.raises(UpstreamError):
+            resilient.call(call)
+        assert len(call.calls) == 1
+
+    def test_open_breaker_fails_fast(self):
+        """Test that failures open the breaker and later calls are rejected without calling."""
+        resilient = caller(breaker=CircuitBreaker(failure_threshold=2, recovery_seconds=30))
+        call = flaky(10, UpstreamError(503))
+
+        with pytest.raises(CircuitOpenError):
+            resilient.call(call)
+
+        assert len(call.calls) == 2
+        stats = resilient.stats()
+        assert stats.state == "open"
+        assert stats.retry_after_seconds > 0
+
+    def test_transport_failures_retry_and_open_breaker(self):
+        """Test that unwrapped httpx network failures are retried and counted by the breaker."""
+        resilient = caller()
+        call = flaky(1, httpx.ConnectError("refused"))
+        assert resilient.call(call) == "ok"
+        assert len(call.calls) == 2
+
+        resilient = caller(breaker=CircuitBreaker(failure_threshold=2, recovery_seconds=30))
+        call = flaky(10, httpx.ReadTimeout("timed out"))
+        with pytest.raises(CircuitOpenError):
+            resilient.call(call)
+        assert len(call.calls) == 2
+        assert resilient.stats().state == "open"
+
+    async def test_call_async_retries(self):
+        """Test the async retry loop."""
+        resilient = caller()
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise asyncio.TimeoutError()
+            return "ok"
+
+        assert await resilient.call_async(call) == "ok"
+        assert len(attempts) == 2
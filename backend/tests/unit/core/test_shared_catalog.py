@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from app.core.compact_catalog import CompactCatalog
+from app.core.shared_catalog import (
+    attach_shared_catalog,
+    catalog_path,
+    detach_shared_catalog,
+    indexed_catalog_hash,
+    is_process_alive,
+    read_workers,
+    workers_path,
+    write_workers,
+)
+
+
+@pytest.fixture
+def database_file(tmp_path):
+    """Point the database, and so every shared catalog file, into a temp dir."""
+    database_file = tmp_path / "database.db"
+    with patch('app.core.shared_catalog.settings.DATABASE_FILE_NAME', str(database_file)):
+        yield database_file
+
+
+@pytest.fixture
+def mock_database():
+    """Replace the database operations the shared catalog drives."""
+    catalog = CompactCatalog.from_rows([(1, "chicken breast"), (2, "tomato")])
+    with patch('app.core.shared_catalog.database') as mock_database, \
+            patch('app.core.shared_catalog._indexed_hash', None):
+        mock_database.create_db_and_tables.return_value = catalog
+        mock_database.get_catalog_hash.return_value = "abc123"
+        yield mock_database
+
+
+@pytest.fixture
+def dead_pid():
+    """PID of a process that has already exited."""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@pytest.mark.unit
+class TestSharedCatalog:
+    """Test cases for sharing the catalog between worker processes."""
+
+    def test_is_process_alive(self, dead_pid):
+        """Test detecting running and exited processes."""
+        assert is_process_alive(os.getpid())
+        assert not is_process_alive(dead_pid)
+
+    def test_read_workers_drops_dead_processes(self, database_file, dead_pid):
+        """Test that workers that died without detaching are forgotten."""
+        write_workers({os.getpid(), dead_pid})
+
+        assert read_workers() == {os.getpid()}
+
+    def test_read_workers_missing_file(self, database_file):
+        """Test reading workers before any attached."""
+        assert read_workers() == set()
+
+    def test_first_worker_builds(self, database_file, mock_database):
+        """Test that the first worker builds the database and shares the catalog."""
+        assert attach_shared_catalog() is True
+
+        mock_database.create_db_and_tables.assert_called_once()
+        mock_database.use_read_only_engine.assert_not_called()
+        assert os.path.exists(catalog_path())
+        assert read_workers() == {os.getpid()}
+        assert indexed_catalog_hash() == "abc123"
+
+    def test_later_worker_attaches_read_only(self, database_file, mock_database):
+        """Test that a worker joining a built catalog does not rebuild it."""
+        CompactCatalog.from_rows([(1, "onion")]).save(catalog_path())
+        write_workers({os.getppid()})
+
+        assert attach_shared_catalog() is False
+
+        mock_database.create_db_and_tables.assert_not_called()
+        mock_database.use_read_only_engine.assert_called_once()
+        catalog = mock_database.build_search_indexes.call_args.args[0]
+        assert list(catalog.rows()) == [(1, "onion")]
+        assert read_workers() == {os.getpid(), os.getppid()}
+        assert indexed_catalog_hash() == "abc123"
+
+    def test_worker_rebuilds_when_catalog_missing(self, database_file, mock_database):
+        """Test that a missing catalog file is rebuilt even with workers attached."""
+        write_workers({os.getppid()})
+
+        assert attach_shared_catalog() is True
+
+    def test_detach_keeps_catalog_for_other_workers(self, database_file, mock_database):
+        """Test that detaching leaves the catalog while other workers remain."""
+        attach_shared_catalog()
+        write_workers(read_workers() | {os.getppid()})
+
+        detach_shared_catalog()
+
+        mock_database.clear_db_and_tables.assert_not_called()
+        assert os.path.exists(catalog_path())
+        with open(workers_path()) as file:
+            assert json.load(file) == [os.getppid()]
+
+    def test_last_worker_cleans_up(self, database_file, mock_database):
+        """Test that the last worker to detach removes the shared files."""
+        attach_shared_catalog()
+
+        detach_shared_catalog()
+
+        mock_database.clear_db_and_tables.assert_called_once()
+        assert not os.path.exists(catalog_path())
+        assert not os.path.exists(workers_path())
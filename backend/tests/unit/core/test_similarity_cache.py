@@ -0,0 +1,110 @@
+import pytest
+
+from app.core.similarity_cache import MinHasher, SimilarityCache, jaccard
+
+
+def words(text):
+    """Token set of a space-separated string."""
+    return frozenset(text.split())
+
+
+@pytest.mark.unit
+class TestMinHasher:
+    """Test cases for MinHash signatures."""
+
+    def test_signature_is_deterministic(self):
+        """Test that signatures do not depend on the instance or token order."""
+        tokens = words("chicken rice garlic")
+
+        assert MinHasher(32).signature(tokens) == MinHasher(32).signature(frozenset(sorted(tokens)))
+
+    def test_signature_agreement_estimates_jaccard(self):
+        """Test that the share of equal signature values approximates Jaccard similarity."""
+        hasher = MinHasher(256)
+        first = frozenset(f"t{i}" for i in range(30))
+        second = frozenset(f"t{i}" for i in range(10, 40))
+
+        agreement = sum(
+            a == b for a, b in zip(hasher.signature(first), hasher.signature(second))
+        ) / 256
+
+        assert agreement == pytest.approx(jaccard(first, second), abs=0.1)
+
+
+@pytest.mark.unit
+class TestSimilarityCache:
+    """Test cases for the approximate similarity cache."""
+
+    def test_returns_value_for_similar_set(self):
+        """Test that a set above the threshold is served from the cache."""
+        cache = SimilarityCache(maxsize=8, ttl=60, threshold=0.6)
+        cache.set("any", words("chicken rice garlic onion"), "stir fry")
+
+        assert cache.get("any", words("chicken rice garlic onion ginger")) == "stir fry"
+        assert cache.get("any", words("beef potato carrot")) is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    def test_threshold_is_exact(self):
+        """Test that candidates are checked against the threshold by exact Jaccard."""
+        cache = SimilarityCache(maxsize=8, ttl=60, threshold=0.6)
+        cache.set("any", words("chicken rice garlic onion"), "stir fry")
+
+        # Jaccard 3/5 and 2/5
+        assert cache.get("any", words("chicken rice garlic ginger")) == "stir fry"
+        assert cache.get("any", words("chicken rice ginger")) is None
+
+    def test_namespaces_are_separate(self):
+        """Test that equal sets in another namespace do not match."""
+        cache = SimilarityCache(maxsize=8, ttl=60, threshold=0.6)
+        cache.set("thai", words("chicken rice"), "curry")
+
+        assert cache.get("italian", words("chicken rice")) is None
+
+    def test_returns_most_similar(self):
+        """Test that the closest of several matching entries wins."""
+        cache = SimilarityCache(maxsize=8, ttl=60, threshold=0.5)
+        cache.set("any", words("a b c d"), "far")
+        cache.set("any", words("a b c d e f"), "near")
+
+        assert cache.get("any", words("a b c d e")) == "near"
+        assert cache.get("any", words("a b c d e f g")) == "near"
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted when full."""
+        cache = SimilarityCache(maxsize=2, ttl=60, threshold=1.0)
+        cache.set("any", words("a"), 1)
+        cache.set("any", words("b"), 2)
+        cache.get("any", words("a"))
+        cache.set("any", words("c"), 3)
+
+        assert cache.get("any", words("b")) is None
+        assert cache.get("any", words("a")) == 1
+        assert len(cache) == 2
+
+    def test_entries_expire(self, fake_clock):
+        """Test that entries past their TTL are dropped on lookup."""
+        cache = SimilarityCache(maxsize=8, ttl=60, threshold=1.0, timer=fake_clock)
+        cache.set("any", words("a b"), "value")
+
+        fake_clock.now += 61
+
+        assert cache.get("any", words("a b")) is None
+        assert len(cache) == 0
+
+    def test_disabled_and_clear(self):
+        """Test that a zero-size cache stores nothing and clear drops everything."""
+        disabled = SimilarityCache(maxsize=0, ttl=60, threshold=1.0)
+        disabled.set("any", words("a"), 1)
+        assert disabled.get("any", words("a")) is None
+        assert not disabled.stats().enabled
+
+        cache = SimilarityCache(maxsize=8, ttl=60, threshold=1.0)
+        cache.set("any", words("a"), 1)
+        cache.clear()
+        assert cache.get("any", words("a")) is None
+
+    def test_bands_must_divide_permutations(self):
+        """Test that an uneven band split is rejected."""
+        with pytest.raises(ValueError):
+            SimilarityCache(maxsize=8, ttl=60, threshold=0.5, num_permutations=10, bands=3)
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test cases for coalescing concurrent identical calls."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that callers with the same key share one call and its result."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def generate():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["recipe"]
+
+        results = await asyncio.gather(*(flights.run("key", generate) for _ in range(5)))
+
+        assert calls == 1
+        assert results == [["recipe"]] * 5
+        stats = flights.stats()
+        assert (stats.executions, stats.coalesced, stats.in_flight) == (1, 4, 0)
+        assert stats.saved_ratio == 0.8
+
+    async def test_different_keys_run_separately(self):
+        """Test that different keys are not coalesced."""
+        flights = SingleFlight()
+
+        async def echo(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flights.run("a", lambda: echo("a")), flights.run("b", lambda: echo("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert flights.stats().coalesced == 0
+
+    async def test_errors_reach_every_waiter(self):
+        """Test that a failed call raises in every coalesced caller."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(
+            *(flights.run("key", fail) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.stats().executions == 1
+
+    async def test_completed_calls_are_not_reused(self):
+        """Test that a later call for the same key starts a new execution."""
+        flights = SingleFlight()
+
+        async def generate():
+            return 1
+
+        await flights.run("key", generate)
+        await flights.run("key", generate)
+
+        assert flights.stats().executions == 2
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that one caller going away leaves the shared call running."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def generate():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flights.run("key", generate))
+        second = asyncio.create_task(flights.run("key", generate))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
@@ -0,0 +1,128 @@
+import json
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from app.core.autocomplete import PrefixIndex
+from app.core.database import snapshot_database_url
+from app.core.fuzzy_index import FuzzyIndex
+from app.core.snapshot import build_snapshot, open_snapshot, read_manifest, snapshot_version
+from app.core.trigram_index import TrigramIndex
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Small ingredients CSV."""
+    csv_file = tmp_path / "ingredients.csv"
+    csv_file.write_text("descrip\nchicken breast\ntomato\nonion\n", encoding="utf-8")
+    return csv_file
+
+
+@pytest.fixture
+def fresh_indexes():
+    """Replace the shared search indexes with empty ones."""
+    indexes = TrigramIndex(), PrefixIndex(), FuzzyIndex()
+    with patch('app.core.snapshot.trigram_index', indexes[0]), \
+            patch('app.core.snapshot.prefix_index', indexes[1]), \
+            patch('app.core.snapshot.fuzzy_index', indexes[2]):
+        yield indexes
+
+
+@pytest.mark.unit
+class TestCatalogSnapshot:
+    """Test cases for building and opening catalog snapshots."""
+
+    def test_build_snapshot(self, csv_file, tmp_path):
+        """Test that a snapshot holds the database, catalog, indexes and manifest."""
+        path = build_snapshot(str(tmp_path / "snapshots"), str(csv_file))
+
+        assert sorted(os.listdir(path)) == [
+            "catalog.bin", "database.db", "indexes.pickle", "manifest.json"
+        ]
+        manifest = read_manifest(path)
+        assert manifest["food_count"] == 3
+        assert os.path.basename(path) == f"catalog-{manifest['version']}"
+        assert manifest["version"] == snapshot_version(manifest["csv_sha256"])
+
+    def test_build_snapshot_is_readable_by_other_users(self, csv_file, tmp_path):
+        """Test that the published snapshot directory is not private to the builder."""
+        path = build_snapshot(str(tmp_path / "snapshots"), str(csv_file))
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+
+    def test_build_snapshot_is_idempotent(self, csv_file, tmp_path):
+        """Test that rebuilding the same CSV reuses the existing snapshot."""
+        output = str(tmp_path / "snapshots")
+        first = build_snapshot(output, str(csv_file))
+
+        with patch('app.core.snapshot.bulk_load_ingredients') as mock_load:
+            second = build_snapshot(output, str(csv_file))
+
+        assert second == first
+        mock_load.assert_not_called()
+        assert os.listdir(output) == [os.path.basename(first)]
+
+    def test_build_snapshot_new_version_for_changed_csv(self, csv_file, tmp_path):
+        """Test that different CSV content produces a new snapshot."""
+        output = str(tmp_path / "snapshots")
+        first = build_snapshot(output, str(csv_file))
+        csv_file.write_text("descrip\nsalt\n", encoding="utf-8")
+
+        second = build_snapshot(output, str(csv_file))
+
+        assert second != first
+        assert read_manifest(second)["food_count"] == 1
+
+    def test_open_snapshot_loads_indexes(self, csv_file, tmp_path, fresh_indexes):
+        """Test that opening a snapshot makes every index searchable."""
+        trigram, prefix, fuzzy = fresh_indexes
+        path = build_snapshot(str(tmp_path / "snapshots"), str(csv_file))
+
+        manifest = open_snapshot(path)
+
+        assert manifest["food_count"] == 3
+        assert trigram.search("chick", 20) == [(1, "chicken breast")]
+        assert prefix.complete("oni", 20) == [(3, "onion")]
+        assert fuzzy.search("tomatto", 20) == [(2, "tomato")]
+
+    def test_open_snapshot_rebuilds_on_settings_mismatch(self, csv_file, tmp_path, fresh_indexes):
+        """Test that indexes built with other settings are rebuilt, not loaded."""
+        path = build_snapshot(str(tmp_path / "snapshots"), str(csv_file))
+
+        with patch('app.core.snapshot.settings.FUZZY_MAX_EDIT_DISTANCE', 1), \
+                patch('app.core.snapshot.build_search_indexes') as mock_build:
+            open_snapshot(path)
+
+        mock_build.assert_called_once()
+
+    def test_open_snapshot_rejects_unknown_format(self, csv_file, tmp_path):
+        """Test that a snapshot from another format version is refused."""
+        path = build_snapshot(str(tmp_path / "snapshots"), str(csv_file))
+        manifest_path = os.path.join(path, "manifest.json")
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        manifest["format_version"] = 999
+        with open(manifest_path, "w") as file:
+            json.dump(manifest, file)
+
+        with pytest.raises(ValueError):
+            open_snapshot(path)
+
+    def test_snapshot_database_is_read_only(self, csv_file, tmp_path):
+        """Test that the snapshot database is served read-only with FTS intact."""
+        path = build_snapshot(str(tmp_path / "snapshots"), str(csv_file))
+        engine = create_engine(snapshot_database_url(path))
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM food")).scalar() == 3
+            matches = connection.execute(
+                text("SELECT rowid FROM food_fts WHERE food_fts MATCH 'onion'")
+            ).all()
+            assert matches == [(3,)]
+            with pytest.raises(Exception):
+                connection.execute(text("INSERT INTO food (name) VALUES ('salt')"))
+        engine.dispose()
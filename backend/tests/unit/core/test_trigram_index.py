@@ -0,0 +1,77 @@
+import pytest
+
+from app.core.compact_catalog import CompactCatalog, fold_case
+from app.core.trigram_index import TrigramIndex, trigrams
+
+
+@pytest.fixture
+def index(sample_food_data):
+    """Trigram index built over the sample food data."""
+    index = TrigramIndex()
+    index.build(CompactCatalog.from_rows(
+        (i, food["name"]) for i, food in enumerate(sample_food_data, start=1)
+    ))
+    return index
+
+
+@pytest.mark.unit
+class TestTrigramIndex:
+    """Test cases for the in-memory trigram index."""
+
+    def test_trigrams(self):
+        """Test trigram extraction."""
+        assert trigrams("salt") == {"sal", "alt"}
+        assert trigrams("ab") == set()
+
+    def test_fold_case_ascii_only(self):
+        """Test case folding matches SQLite LIKE (ASCII only)."""
+        assert fold_case("CHICKEN") == "chicken"
+        assert fold_case("CRÈME") == "crÈme"
+
+    def test_search_before_build(self):
+        """Test that an unbuilt index defers to the database."""
+        index = TrigramIndex()
+
+        assert not index.is_ready
+        assert index.search("chicken", 20) is None
+
+    def test_search_substring(self, index):
+        """Test searching for a substring."""
+        assert index.search("chicken", 20) == [(1, "chicken breast")]
+        assert index.search("PEPP", 20) == [(7, "black pepper")]
+
+    def test_search_verifies_candidates(self, index):
+        """Test that trigram candidates are checked exactly."""
+        # "oil" and "liv" trigrams both occur in "olive oil" but not "oliv oil"
+        assert index.search("oliv oil", 20) == []
+        assert index.search("olive oil", 20) == [(5, "olive oil")]
+
+    def test_search_no_match(self, index):
+        """Test searching for an unknown trigram."""
+        assert index.search("xyz", 20) == []
+
+    def test_search_short_query_scans(self, index):
+        """Test queries shorter than a trigram still match."""
+        assert index.search("on", 20) == [(3, "onion")]
+
+    def test_search_max_results(self, index):
+        """Test that results are limited and returned in id order."""
+        results = index.search("a", 2)
+
+        assert results == [(1, "chicken breast"), (2, "tomato")]
+
+    def test_search_after_id(self, index):
+        """Test resuming a search after a given id."""
+        assert index.search("o", 2, after_id=2) == [(3, "onion"), (5, "olive oil")]
+
+    def test_search_like_wildcards_fall_back(self, index):
+        """Test that LIKE wildcards are left to the database."""
+        assert index.search("chi%en", 20) is None
+        assert index.search("sal_", 20) is None
+
+    def test_clear(self, index):
+        """Test clearing the index."""
+        index.clear()
+
+        assert not index.is_ready
+        assert len(index) == 0
@@ -67,6 +67,11 @@ class TestRecipeRequestSchema:
         with pytest.raises(ValidationError):
             RecipeRequest(ingredients=None)  # None ingredients should fail
 
+    def test_recipe_request_bounds_ingredient_length(self):
+        """Test that overlong ingredients are rejected."""
+        with pytest.raises(ValidationError):
+            RecipeRequest(ingredients=["a" * 101])
+
 
 @pytest.mark.unit
 class TestRecipeResponseSchema:
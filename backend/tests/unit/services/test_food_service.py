@@ -33,7 +33,7 @@ class TestFoodService:
 
         result = FoodService.search_foods("chicken")
 
-        mock_select.assert_called_once_with("chicken", 20)  # Default max_results from settings
+        mock_select.assert_called_once_with("chicken", 20, None)  # Default max_results from settings
         assert len(result) == 2
         assert result[0].name == "chicken breast"
         assert result[1].name == "chicken thigh"
@@ -46,7 +46,7 @@ class TestFoodService:
 
         result = FoodService.search_foods("chicken", max_results=5)
 
-        mock_select.assert_called_once_with("chicken", 5)
+        mock_select.assert_called_once_with("chicken", 5, None)
         assert len(result) == 1
 
     @patch('app.services.food_service.select_foods_containing_substring')
@@ -65,3 +65,141 @@ class TestFoodService:
 
         with pytest.raises(Exception, match="Database error"):
             FoodService.search_foods("chicken")
+
+    @patch('app.services.food_service.select_foods_containing_substring')
+    @patch('app.services.food_service.trigram_index')
+    def test_search_foods_uses_trigram_index(self, mock_index, mock_select):
+        """Test food search served from the in-memory index."""
+        mock_index.search.return_value = [(1, "chicken breast")]
+
+        result = FoodService.search_foods("chicken")
+
+        mock_index.search.assert_called_once_with("chicken", 20, None)
+        mock_select.assert_not_called()
+        assert result[0].id == 1
+        assert result[0].name == "chicken breast"
+
+    @patch('app.services.food_service.select_foods_containing_substring')
+    @patch('app.services.food_service.trigram_index')
+    def test_search_foods_index_fallback(self, mock_index, mock_select):
+        """Test food search falls back to SQL when the index cannot answer."""
+        mock_index.search.return_value = None
+        mock_select.return_value = []
+
+        FoodService.search_foods("chicken")
+
+        mock_select.assert_called_once_with("chicken", 20, None)
+
+    @patch('app.services.food_service.select_foods_containing_substring')
+    def test_search_foods_after_id(self, mock_select):
+        """Test food search continuing from a cursor."""
+        mock_select.return_value = []
+
+        FoodService.search_foods("chicken", max_results=5, after_id=42)
+
+        mock_select.assert_called_once_with("chicken", 5, 42)
+
+    @patch('app.services.food_service.select_foods_matching_fts')
+    def test_search_foods_fts_mode(self, mock_fts):
+        """Test food search through the FTS5 index."""
+        mock_fts.return_value = [Food(id=1, name="butter with salt")]
+
+        with patch('app.services.food_service.settings.FOOD_SEARCH_MODE', "fts"):
+            result = FoodService.search_foods("butt sal")
+
+        mock_fts.assert_called_once_with("butt sal", 20, None)
+        assert result[0].name == "butter with salt"
+
+    @patch('app.services.food_service.fuzzy_index')
+    @patch('app.services.food_service.select_foods_containing_substring')
+    def test_search_foods_fuzzy_fallback(self, mock_select, mock_fuzzy):
+        """Test falling back to fuzzy matching when nothing matches exactly."""
+        mock_select.return_value = []
+        mock_fuzzy.search.return_value = [(7, "broccoli raw")]
+
+        result = FoodService.search_foods("brocoli")
+
+        mock_fuzzy.search.assert_called_once_with("brocoli", 20)
+        assert [food.name for food in result] == ["broccoli raw"]
+
+    @patch('app.services.food_service.fuzzy_index')
+    @patch('app.services.food_service.select_foods_containing_substring')
+    def test_search_foods_no_fuzzy_fallback_when_paging(self, mock_select, mock_fuzzy):
+        """Test that later pages do not fall back to fuzzy matching."""
+        mock_select.return_value = []
+
+        assert FoodService.search_foods("brocoli", after_id=10) == []
+        mock_fuzzy.search.assert_not_called()
+
+    @patch('app.services.food_service.select_foods_with_word_prefix')
+    @patch('app.services.food_service.prefix_index')
+    def test_autocomplete_foods(self, mock_index, mock_select):
+        """Test autocompletion served from the prefix index."""
+        mock_index.complete.return_value = [(1, "cheese blue")]
+
+        result = FoodService.autocomplete_foods("che")
+
+        mock_index.complete.assert_called_once_with("che", 20)
+        mock_select.assert_not_called()
+        assert [food.name for food in result] == ["cheese blue"]
+
+    @patch('app.services.food_service.select_foods_with_word_prefix')
+    @patch('app.services.food_service.prefix_index')
+    def test_autocomplete_foods_index_not_built(self, mock_index, mock_select):
+        """Test autocompletion falls back to SQL before the index is built."""
+        mock_index.complete.return_value = None
+        mock_select.return_value = []
+
+        FoodService.autocomplete_foods("che", max_results=5)
+
+        mock_select.assert_called_once_with("che", 5)
+
+    @patch('app.services.food_service.select_foods_containing_substring')
+    def test_search_foods_cached(self, mock_select):
+        """Test that repeated searches are served from the cache."""
+        mock_select.return_value = [Food(id=1, name="chicken breast")]
+
+        with patch('app.services.food_service.settings.FOOD_SEARCH_MODE', "like"):
+            first = FoodService.search_foods("chicken")
+            second = FoodService.search_foods("CHICKEN")
+
+        mock_select.assert_called_once()
+        assert first == second
+
+    @patch('app.services.food_service.select_foods_containing_substrings')
+    def test_search_foods_batch_single_pass(self, mock_select_many):
+        """Test that batch misses are resolved in one database pass."""
+        mock_select_many.return_value = {
+            "chicken": [Food(id=1, name="chicken breast")],
+            "onion": [Food(id=3, name="onion")],
+        }
+
+        with patch('app.services.food_service.settings.FOOD_SEARCH_MODE', "like"):
+            result = FoodService.search_foods_batch(["chicken", "onion", "chicken"])
+
+        mock_select_many.assert_called_once_with(["chicken", "onion"], 20)
+        assert [[food.name for food in foods] for foods in result] == [
+            ["chicken breast"], ["onion"], ["chicken breast"]
+        ]
+
+    @patch('app.services.food_service.select_foods_containing_substrings')
+    @patch('app.services.food_service.trigram_index')
+    def test_search_foods_batch_uses_index_and_cache(self, mock_index, mock_select_many):
+        """Test that batch searches use the index and fill the cache."""
+        mock_index.search.return_value = [(1, "chicken breast")]
+
+        FoodService.search_foods_batch(["chicken"])
+        result = FoodService.search_foods("chicken")
+
+        mock_index.search.assert_called_once_with("chicken", 20)
+        mock_select_many.assert_not_called()
+        assert result[0].name == "chicken breast"
+
+    async def test_search_foods_async(self):
+        """Test the async search path delegates to search_foods."""
+        service = FoodService()
+        with patch.object(service, 'search_foods', return_value=[Food(id=1, name="onion")]) as mock_search:
+            result = await service.search_foods_async("onion", max_results=5)
+
+        mock_search.assert_called_once_with("onion", max_results=5, after_id=None)
+        assert result[0].name == "onion"
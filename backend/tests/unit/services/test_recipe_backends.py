@@ -0,0 +1,114 @@
+import pytest
+
+from app.models.schemas import PackedRecipes, RecipeRequest
+from app.services.recipe_backends import (
+    FakeBackendError,
+    FakeRecipeBackend,
+    GeminiRecipeBackend,
+    create_recipe_backend,
+)
+from app.services.recipe_service import (
+    PACKED_PROMPT_HEADER,
+    PACKED_RECIPE_CONFIG,
+    RECIPE_CONFIG,
+    RecipeService,
+)
+
+
+def query(**kwargs):
+    """Build the prompt RecipeService sends for a request."""
+    return RecipeService.generate_recipe_query(RecipeRequest(**kwargs))
+
+
+@pytest.mark.unit
+class TestFakeRecipeBackend:
+    """Test cases for the deterministic fake recipe backend."""
+
+    def test_generate_answers_query(self):
+        """Test that recipes follow the requested count, cuisine and ingredients."""
+        backend = FakeRecipeBackend()
+
+        recipes = backend.generate(
+            query(ingredients=["chicken", "rice"], max_recipes=2, cuisine_style="thai"),
+            RECIPE_CONFIG,
+        )
+
+        assert len(recipes) == 2
+        assert all(recipe.recipe_name.startswith("Thai Chicken") for recipe in recipes)
+        assert recipes[0].ingredients == ["chicken", "rice"]
+
+    def test_generate_is_deterministic(self):
+        """Test that the same prompt always gets the same recipes."""
+        prompt = query(ingredients=["onion"], max_recipes=3)
+
+        assert FakeRecipeBackend().generate(prompt, RECIPE_CONFIG) == \
+            FakeRecipeBackend(seed=7).generate(prompt, RECIPE_CONFIG)
+
+    async def test_generate_async_packed(self):
+        """Test that packed prompts are answered per numbered request."""
+        prompt = PACKED_PROMPT_HEADER + "\n".join([
+            f"1. {query(ingredients=['onion'], max_recipes=1)}",
+            f"2. {query(ingredients=['leek'], max_recipes=2)}",
+        ])
+
+        answers = await FakeRecipeBackend().generate_async(prompt, PACKED_RECIPE_CONFIG)
+
+        assert [answer.request_index for answer in answers] == [1, 2]
+        assert all(isinstance(answer, PackedRecipes) for answer in answers)
+        assert [len(answer.recipes) for answer in answers] == [1, 2]
+
+    async def test_error_rate(self):
+        """Test that every call fails when the error rate is one."""
+        backend = FakeRecipeBackend(error_rate=1.0)
+
+        with pytest.raises(FakeBackendError):
+            await backend.generate_async(query(ingredients=["onion"]), RECIPE_CONFIG)
+
+    def test_latency_draws_are_seeded(self):
+        """Test that the latency sequence is reproducible for a seed."""
+        first = FakeRecipeBackend(latency_median_ms=100, latency_sigma=0.5, seed=3)
+        second = FakeRecipeBackend(latency_median_ms=100, latency_sigma=0.5, seed=3)
+
+        draws = [first._draw() for _ in range(5)]
+
+        assert draws == [second._draw() for _ in range(5)]
+        assert all(latency > 0 for latency, _ in draws)
+
+    async def test_stream_async_concatenates_to_answer(self):
+        """Test that streamed chunks form the JSON of the full answer."""
+        backend = FakeRecipeBackend(stream_chunk_size=16)
+        prompt = query(ingredients=["onion"], max_recipes=2)
+
+        chunks = [chunk async for chunk in backend.stream_async(prompt, RECIPE_CONFIG)]
+
+        assert len(chunks) > 1
+        assert "".join(chunks).startswith('[{"recipe_name"')
+
+
+@pytest.mark.unit
+class TestCreateRecipeBackend:
+    """Test cases for selecting the recipe backend."""
+
+    def test_known_backends(self):
+        """Test that backends are selected by name."""
+        assert isinstance(create_recipe_backend("gemini"), GeminiRecipeBackend)
+        assert isinstance(create_recipe_backend("fake"), FakeRecipeBackend)
+
+    def test_unknown_backend(self):
+        """Test that an unknown name is rejected."""
+        with pytest.raises(ValueError, match="Unknown recipe backend"):
+            create_recipe_backend("missing")
+
+    async def test_service_streams_from_fake_backend(self, monkeypatch):
+        """Test the full streaming path against the fake backend."""
+        monkeypatch.setattr(
+            "app.services.recipe_service.recipe_backend", FakeRecipeBackend(stream_chunk_size=8)
+        )
+
+        recipes = [
+            recipe async for recipe in
+            RecipeService.stream_recipes_async(RecipeRequest(ingredients=["onion"], max_recipes=2))
+        ]
+
+        assert len(recipes) == 2
+        assert RecipeService.cache_stats().size == 1
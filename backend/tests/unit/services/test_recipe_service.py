@@ -1,8 +1,24 @@
+import asyncio
+import threading
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from app.models.schemas import Recipe, RecipeRequest
-from app.services.recipe_service import RecipeService
+from app.core.executor import run_in_search_executor
+from app.core.single_flight import SingleFlight
+from app.models.schemas import PackedRecipes, Recipe, RecipeRequest
+from app.services.recipe_backends import (
+    FakeRecipeBackend,
+    GeminiRecipeBackend,
+    gemini_available,
+    get_client,
+)
+from app.services.recipe_service import (
+    NoIngredientsError,
+    RecipeService,
+    recipe_cache_key,
+    recipe_similarity_key,
+)
 
 
 @pytest.mark.unit
@@ -47,7 +63,7 @@ class TestRecipeService:
         expected = "Suggest and provide up to 1 recipes that use the following ingredients: chicken."
         assert query == expected
 
-    @patch('app.services.recipe_service.client')
+    @patch('app.services.recipe_backends.client')
     def test_generate_content_success(self, mock_client):
         """Test successful content generation."""
         mock_response = Mock()
@@ -67,7 +83,7 @@ class TestRecipeService:
         assert len(result) == 1
         assert result[0].recipe_name == "Test Recipe"
 
-    @patch('app.services.recipe_service.client')
+    @patch('app.services.recipe_backends.client')
     def test_generate_content_failure(self, mock_client):
         """Test content generation failure."""
         mock_client.models.generate_content.side_effect = Exception("API Error")
@@ -103,3 +119,435 @@ class TestRecipeService:
         # Verify result
         assert len(result) == 1
         assert result[0].recipe_name == "Test Recipe"
+
+    def test_get_client_is_lazy(self):
+        """Test that the Gemini client is created once, on first use."""
+        with patch('app.services.recipe_backends.client', None), \
+                patch('google.genai.Client') as mock_client_class:
+            first = get_client()
+            second = get_client()
+
+        mock_client_class.assert_called_once_with()
+        assert first is second is mock_client_class.return_value
+
+    def test_gemini_available(self, monkeypatch):
+        """Test the availability check used by /health."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        assert gemini_available()
+
+        monkeypatch.delenv("GEMINI_API_KEY")
+        monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+        assert not gemini_available()
+
+    def test_recipe_cache_key_normalizes_request(self):
+        """Test that ingredient order, case and whitespace do not change the key."""
+        key = recipe_cache_key(RecipeRequest(ingredients=["Chicken", " tomato"], max_recipes=2))
+
+        assert key == recipe_cache_key(
+            RecipeRequest(ingredients=["TOMATO", "chicken  "], max_recipes=2, cuisine_style="Any")
+        )
+        assert key != recipe_cache_key(RecipeRequest(ingredients=["chicken", "tomato"], max_recipes=3))
+        assert key != recipe_cache_key(
+            RecipeRequest(ingredients=["chicken", "tomato"], max_recipes=2, cuisine_style="thai")
+        )
+
+    def test_cache_keys_depend_on_backend(self):
+        """Test that recipes from one backend are never served for another."""
+        request = RecipeRequest(ingredients=["chicken", "rice"])
+        with patch('app.services.recipe_service.recipe_backend', GeminiRecipeBackend()):
+            key, namespace = recipe_cache_key(request), recipe_similarity_key(request)[0]
+
+        with patch('app.services.recipe_service.recipe_backend', FakeRecipeBackend()):
+            assert recipe_cache_key(request) != key
+            assert recipe_similarity_key(request)[0] != namespace
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    def test_generate_recipes_uses_cache(self, mock_content):
+        """Test that equivalent requests reuse the first generated recipes."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+        ]
+
+        first = RecipeService.generate_recipes(RecipeRequest(ingredients=["chicken", "rice"]))
+        second = RecipeService.generate_recipes(RecipeRequest(ingredients=["Rice", "CHICKEN"]))
+
+        mock_content.assert_called_once()
+        assert second == first
+        assert RecipeService.cache_stats().hits == 1
+
+    def test_recipe_similarity_key_splits_words(self):
+        """Test that the approximate cache compares normalized ingredient words."""
+        namespace, words = recipe_similarity_key(
+            RecipeRequest(ingredients=["Chicken Breast", "white  rice"], max_recipes=2)
+        )
+
+        assert words == {"chicken", "breast", "white", "rice"}
+        assert namespace == recipe_similarity_key(
+            RecipeRequest(ingredients=["rice"], max_recipes=2, cuisine_style="ANY")
+        )[0]
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    def test_generate_recipes_reuses_near_duplicate_request(self, mock_content):
+        """Test that a request overlapping a cached one reuses its recipes."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+        ]
+
+        first = RecipeService.generate_recipes(
+            RecipeRequest(ingredients=["chicken", "rice", "garlic", "onion"])
+        )
+        second = RecipeService.generate_recipes(
+            RecipeRequest(ingredients=["chicken", "rice", "garlic", "onion", "ginger"])
+        )
+        RecipeService.generate_recipes(
+            RecipeRequest(ingredients=["chicken", "rice", "garlic", "onion"], cuisine_style="thai")
+        )
+
+        assert second == first
+        assert mock_content.call_count == 2
+        assert RecipeService.similarity_stats().hits == 1
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    def test_generate_recipes_canonicalizes_ingredients(self, mock_content):
+        """Test that prompts use deduplicated canonical ingredients."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Test Recipe", ingredients=["tomato"], instructions="Cook")
+        ]
+
+        with patch('app.services.recipe_service.canonicalize_ingredients',
+                   return_value=["tomato"]) as mock_canonicalize:
+            RecipeService.generate_recipes(
+                RecipeRequest(ingredients=["Tomatoes ", "TOMATO"], max_recipes=1)
+            )
+
+        mock_canonicalize.assert_called_once_with(["Tomatoes ", "TOMATO"])
+        mock_content.assert_called_once_with(
+            "Suggest and provide up to 1 recipes that use the following ingredients: tomato."
+        )
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    def test_generate_recipes_keeps_non_ascii_ingredients(self, mock_content):
+        """Test that non-ASCII ingredients reach the prompt and the cache key intact."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Test Recipe", ingredients=["豆腐"], instructions="Cook")
+        ]
+
+        RecipeService.generate_recipes(RecipeRequest(ingredients=["豆腐", "キムチ"], max_recipes=1))
+        RecipeService.generate_recipes(RecipeRequest(ingredients=["jalapeño"], max_recipes=1))
+
+        assert mock_content.call_args_list[0].args[0].endswith("ingredients: 豆腐, キムチ.")
+        assert mock_content.call_count == 2
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    def test_generate_recipes_rejects_requests_without_usable_ingredients(self, mock_content):
+        """Test that nothing is sent upstream when canonicalization leaves no ingredient."""
+        with pytest.raises(NoIngredientsError):
+            RecipeService.generate_recipes(RecipeRequest(ingredients=["!!", " "]))
+
+        mock_content.assert_not_called()
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    def test_generate_recipes_does_not_cache_empty_results(self, mock_content):
+        """Test that an empty response is retried rather than cached."""
+        mock_content.return_value = []
+
+        RecipeService.generate_recipes(RecipeRequest(ingredients=["chicken"]))
+        RecipeService.generate_recipes(RecipeRequest(ingredients=["chicken"]))
+
+        assert mock_content.call_count == 2
+
+    @patch('app.services.recipe_backends.client')
+    async def test_generate_content_async(self, mock_client):
+        """Test generating content with the async client."""
+        recipe = Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+        mock_client.aio.models.generate_content = AsyncMock(return_value=Mock(parsed=[recipe]))
+
+        result = await RecipeService.generate_content_async("test query")
+
+        assert result == [recipe]
+        mock_client.aio.models.generate_content.assert_awaited_once()
+        mock_client.models.generate_content.assert_not_called()
+
+    @patch('app.services.recipe_backends.client')
+    async def test_generate_content_async_timeout(self, mock_client):
+        """Test that a slow Gemini call is abandoned after the timeout."""
+        async def slow_call(**kwargs):
+            await asyncio.sleep(10)
+
+        mock_client.aio.models.generate_content = slow_call
+
+        with patch('app.services.recipe_service.settings.GEMINI_TIMEOUT_SECONDS', 0.01):
+            with pytest.raises(asyncio.TimeoutError):
+                await RecipeService.generate_content_async("test query")
+
+    @patch('app.services.recipe_backends.client')
+    async def test_generate_content_async_retries_unavailable(self, mock_client):
+        """Test that a transient upstream 503 is retried."""
+        unavailable = Exception("Service Unavailable")
+        unavailable.code = 503
+        recipe = Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+        mock_client.aio.models.generate_content = AsyncMock(
+            side_effect=[unavailable, Mock(parsed=[recipe])]
+        )
+
+        with patch('app.core.resilience.wait_random_exponential', return_value=lambda state: 0):
+            result = await RecipeService.generate_content_async("test query")
+
+        assert result == [recipe]
+        assert mock_client.aio.models.generate_content.await_count == 2
+        assert RecipeService.resilience_stats().retries == 1
+
+    @patch('app.services.recipe_backends.client')
+    async def test_generate_content_async_bounds_concurrency(self, mock_client):
+        """Test that no more than GEMINI_MAX_CONCURRENCY calls run at once."""
+        in_flight = peak = 0
+
+        async def tracked_call(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(parsed=[])
+
+        mock_client.aio.models.generate_content = tracked_call
+
+        with patch('app.services.recipe_service._generation_slots', asyncio.Semaphore(2)):
+            await asyncio.gather(*(RecipeService.generate_content_async("q") for _ in range(6)))
+
+        assert peak == 2
+
+    @patch('app.services.recipe_service.RecipeService.generate_content_async')
+    async def test_generate_recipes_async_uses_cache(self, mock_content):
+        """Test that the async path shares the recipe cache."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+        ]
+
+        first = await RecipeService.generate_recipes_async(RecipeRequest(ingredients=["chicken"]))
+        second = await RecipeService.generate_recipes_async(RecipeRequest(ingredients=["Chicken"]))
+
+        mock_content.assert_awaited_once()
+        assert second == first
+
+    @patch('app.services.recipe_service.RecipeService.generate_content_async')
+    async def test_generate_recipes_async_canonicalizes_off_the_event_loop(self, mock_content):
+        """Test that canonicalization runs on the search thread pool."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+        ]
+        threads = []
+
+        def canonicalize(ingredients):
+            threads.append(threading.current_thread().name)
+            return list(ingredients)
+
+        with patch('app.services.recipe_service.canonicalize_ingredients', side_effect=canonicalize):
+            await RecipeService.generate_recipes_async(RecipeRequest(ingredients=["chicken"]))
+
+        assert threads and threads[0].startswith("food-search")
+
+    async def test_generate_recipes_async_coalesces_identical_requests(self):
+        """Test that concurrent equivalent requests share one Gemini call."""
+        recipe = Recipe(recipe_name="Test Recipe", ingredients=["chicken"], instructions="Cook")
+
+        async def slow_generate(query):
+            await asyncio.sleep(0.01)
+            return [recipe]
+
+        with patch('app.services.recipe_service.RecipeService.generate_content_async',
+                   side_effect=slow_generate) as mock_content, \
+                patch('app.services.recipe_service._generation_flights', SingleFlight()):
+            results = await asyncio.gather(*(
+                RecipeService.generate_recipes_async(RecipeRequest(ingredients=ingredients))
+                for ingredients in (["chicken", "rice"], ["rice", "chicken"], ["Chicken", "rice"])
+            ))
+
+            assert mock_content.call_count == 1
+            assert results == [[recipe]] * 3
+            assert RecipeService.coalescing_stats().coalesced == 2
+
+    @patch('app.services.recipe_backends.client')
+    async def test_stream_recipes_async(self, mock_client):
+        """Test that each recipe is yielded before the rest of the stream arrives."""
+        first_received = asyncio.Event()
+
+        async def stream():
+            yield Mock(text='[{"recipe_name": "Soup", "ingredients": ["onion"], ')
+            yield Mock(text='"instructions": "Simmer"}, {"recipe_name": "Stew", ')
+            await asyncio.wait_for(first_received.wait(), timeout=1)
+            yield Mock(text='"ingredients": ["beef"], "instructions": "Braise"}]')
+
+        mock_client.aio.models.generate_content_stream = AsyncMock(return_value=stream())
+
+        names = []
+        async for recipe in RecipeService.stream_recipes_async(RecipeRequest(ingredients=["onion"])):
+            names.append(recipe.recipe_name)
+            first_received.set()
+
+        assert names == ["Soup", "Stew"]
+        cached = RecipeService.generate_recipes(RecipeRequest(ingredients=["ONION"]))
+        assert [recipe.recipe_name for recipe in cached] == ["Soup", "Stew"]
+
+    @patch('app.services.recipe_backends.client')
+    async def test_stream_recipes_async_chunk_timeout(self, mock_client):
+        """Test that a stalled stream is abandoned and not cached."""
+        async def stream():
+            yield Mock(text='[{"recipe_name": "Soup", "ingredients": [], "instructions": ""}')
+            await asyncio.sleep(10)
+
+        mock_client.aio.models.generate_content_stream = AsyncMock(return_value=stream())
+
+        received = []
+        with patch('app.services.recipe_service.settings.GEMINI_TIMEOUT_SECONDS', 0.01):
+            with pytest.raises(asyncio.TimeoutError):
+                async for recipe in RecipeService.stream_recipes_async(
+                    RecipeRequest(ingredients=["onion"])
+                ):
+                    received.append(recipe)
+
+        assert len(received) == 1
+        assert RecipeService.cache_stats().size == 0
+
+    @patch('app.services.recipe_service.RecipeService.generate_content')
+    async def test_stream_recipes_async_cache_hit(self, mock_content):
+        """Test that cached recipes are streamed without calling Gemini."""
+        mock_content.return_value = [
+            Recipe(recipe_name="Soup", ingredients=["onion"], instructions="Simmer")
+        ]
+        RecipeService.generate_recipes(RecipeRequest(ingredients=["onion"]))
+
+        with patch('app.services.recipe_backends.client') as mock_client:
+            recipes = [
+                recipe async for recipe in
+                RecipeService.stream_recipes_async(RecipeRequest(ingredients=["onion"]))
+            ]
+
+        assert [recipe.recipe_name for recipe in recipes] == ["Soup"]
+        mock_client.aio.models.generate_content_stream.assert_not_called()
+
+    @staticmethod
+    def recipe(name):
+        """Build a one-ingredient recipe."""
+        return Recipe(recipe_name=name, ingredients=[name], instructions="Cook")
+
+    async def test_generate_recipes_batch_dedups_and_uses_cache(self):
+        """Test that a batch generates each distinct uncached request once."""
+        with patch('app.services.recipe_service.RecipeService.generate_content',
+                   return_value=[self.recipe("cached")]):
+            RecipeService.generate_recipes(RecipeRequest(ingredients=["rice"]))
+
+        async def generate(request, cache_key):
+            return [self.recipe(request.ingredients[0].lower())]
+
+        requests = [
+            RecipeRequest(ingredients=["Chicken"]),
+            RecipeRequest(ingredients=["rice"]),
+            RecipeRequest(ingredients=["chicken "]),
+            RecipeRequest(ingredients=[]),
+        ]
+        with patch('app.services.recipe_service.RecipeService.generate_uncached_recipes_async',
+                   side_effect=generate) as mock_generate:
+            results = await RecipeService.generate_recipes_batch_async(requests)
+
+        mock_generate.assert_called_once()
+        assert [item.index for item in results] == [0, 1, 2, 3]
+        assert results[0].recipes == results[2].recipes == [self.recipe("chicken")]
+        assert results[1].recipes == [self.recipe("cached")]
+        assert results[3].recipes is None and "ingredient" in results[3].error
+
+    async def test_generate_recipes_batch_looks_up_caches_once(self):
+        """Test that each distinct batch request misses the caches exactly once."""
+        requests = [
+            RecipeRequest(ingredients=["Chicken"]),
+            RecipeRequest(ingredients=["chicken"]),
+            RecipeRequest(ingredients=["beef"]),
+        ]
+        misses = RecipeService.cache_stats().misses
+        similarity_misses = RecipeService.similarity_stats().misses
+        with patch('app.services.recipe_service.RecipeService.generate_content_async',
+                   AsyncMock(return_value=[self.recipe("ok")])) as mock_content, \
+                patch('app.services.recipe_service.run_in_search_executor',
+                      wraps=run_in_search_executor) as mock_executor:
+            await RecipeService.generate_recipes_batch_async(requests)
+
+        assert mock_content.await_count == 2
+        assert RecipeService.cache_stats().misses - misses == 2
+        assert RecipeService.similarity_stats().misses - similarity_misses == 2
+        assert mock_executor.call_count == len(requests)
+
+    async def test_generate_recipes_batch_reports_errors_per_item(self):
+        """Test that one failing request does not fail the others."""
+        async def generate(request, cache_key):
+            if request.ingredients == ["bad"]:
+                raise Exception("API Error")
+            if request.ingredients == ["slow"]:
+                raise asyncio.TimeoutError()
+            return [self.recipe("ok")]
+
+        requests = [RecipeRequest(ingredients=[name]) for name in ("good", "bad", "slow")]
+        with patch('app.services.recipe_service.RecipeService.generate_uncached_recipes_async',
+                   side_effect=generate):
+            results = await RecipeService.generate_recipes_batch_async(requests)
+
+        assert results[0].recipes == [self.recipe("ok")]
+        assert results[1].error == "Failed to generate recipes: API Error"
+        assert results[2].error == "Recipe generation timed out"
+
+    async def test_generate_recipes_batch_bounds_parallelism(self):
+        """Test that at most RECIPE_BATCH_CONCURRENCY items run at once."""
+        in_flight = peak = 0
+
+        async def generate(request, cache_key):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [self.recipe("ok")]
+
+        requests = [RecipeRequest(ingredients=[f"food {i}"]) for i in range(7)]
+        with patch('app.services.recipe_service.RecipeService.generate_uncached_recipes_async',
+                   side_effect=generate), \
+                patch('app.services.recipe_service.settings.RECIPE_BATCH_CONCURRENCY', 3):
+            results = await RecipeService.generate_recipes_batch_async(requests)
+
+        assert peak == 3
+        assert all(item.recipes for item in results)
+
+    async def test_generate_recipes_batch_packs_prompts(self):
+        """Test packing requests into shared prompts, retrying unanswered ones alone."""
+        requests = [RecipeRequest(ingredients=[name], max_recipes=1) for name in ("a", "b", "c")]
+        packed = AsyncMock(side_effect=[
+            [[self.recipe("a"), self.recipe("extra")], None],
+        ])
+
+        with patch('app.services.recipe_service.RecipeService.generate_packed_content_async',
+                   packed), \
+                patch('app.services.recipe_service.RecipeService.generate_uncached_recipes_async',
+                      AsyncMock(side_effect=lambda request, cache_key: [self.recipe(request.ingredients[0])])) \
+                as mock_single, \
+                patch('app.services.recipe_service.settings.RECIPE_BATCH_PACK_SIZE', 2):
+            results = await RecipeService.generate_recipes_batch_async(requests, pack_prompts=True)
+
+        packed.assert_awaited_once()
+        assert len(packed.await_args.args[0]) == 2
+        assert [item.recipes for item in results] == [
+            [self.recipe("a")], [self.recipe("b")], [self.recipe("c")]
+        ]
+        assert mock_single.await_count == 2
+        assert RecipeService.cache_stats().size == 1
+
+    @patch('app.services.recipe_backends.client')
+    async def test_generate_packed_content_async(self, mock_client):
+        """Test mapping a packed response back to its queries."""
+        mock_client.aio.models.generate_content = AsyncMock(return_value=Mock(parsed=[
+            PackedRecipes(request_index=2, recipes=[self.recipe("b")]),
+            PackedRecipes(request_index=1, recipes=[self.recipe("a")]),
+        ]))
+
+        answers = await RecipeService.generate_packed_content_async(["qa", "qb", "qc"])
+
+        assert answers == [[self.recipe("a")], [self.recipe("b")], None]
+        prompt = mock_client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "1. qa" in prompt and "3. qc" in prompt
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from app.utils.json_stream import JsonArrayStreamParser
+
+
+def feed_in_chunks(text, size):
+    """Feed text to a new parser in fixed-size chunks and collect the elements."""
+    parser = JsonArrayStreamParser()
+    elements = []
+    for start in range(0, len(text), size):
+        elements += parser.feed(text[start:start + size])
+    return parser, elements
+
+
+@pytest.mark.unit
+class TestJsonArrayStreamParser:
+    """Test cases for incremental JSON array parsing."""
+
+    def test_elements_complete_as_they_arrive(self):
+        """Test that each element is returned once its closing brace is fed."""
+        parser = JsonArrayStreamParser()
+
+        assert parser.feed('[{"recipe_name": "Soup"') == []
+        assert parser.feed('}, {"recipe_name": ') == [{"recipe_name": "Soup"}]
+        assert parser.feed('"Stew"}]') == [{"recipe_name": "Stew"}]
+        assert parser.done
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+    def test_any_chunking(self, size):
+        """Test that chunk boundaries never change the result."""
+        data = [
+            {"recipe_name": 'Tricky "[{,}]" name', "ingredients": ["a", "b"], "instructions": "x\\y"},
+            {"nested": [1, [2, 3], {"k": "v"}]},
+            1, -2.5, "s,]", True, None, [],
+        ]
+
+        parser, elements = feed_in_chunks(json.dumps(data, indent=2), size)
+
+        assert elements == data
+        assert parser.done
+
+    def test_skips_text_before_array(self):
+        """Test that a Markdown code fence around the array is ignored."""
+        parser, elements = feed_in_chunks('```json\n[{"a": 1}]\n```', 4)
+
+        assert elements == [{"a": 1}]
+
+    def test_empty_array(self):
+        """Test parsing an empty array."""
+        parser, elements = feed_in_chunks("[ ]", 1)
+
+        assert elements == []
+        assert parser.done
+
+    def test_ignores_text_after_array(self):
+        """Test that nothing is parsed once the array has closed."""
+        parser = JsonArrayStreamParser()
+
+        assert parser.feed('[1] [2]') == [1]
+        assert parser.feed('[3]') == []
+
+    def test_invalid_element(self):
+        """Test that a malformed element raises."""
+        with pytest.raises(json.JSONDecodeError):
+            JsonArrayStreamParser().feed("[{bad}]")
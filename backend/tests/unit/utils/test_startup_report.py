@@ -0,0 +1,22 @@
+import pytest
+
+from app.utils.startup_report import ImportTiming, parse_importtime
+
+
+@pytest.mark.unit
+class TestStartupReport:
+    """Test cases for the startup time report."""
+
+    def test_parse_importtime(self):
+        """Test parsing -X importtime output."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   encodings.utf_8\n"
+            "some other stderr line\n"
+            "import time:      8664 |    1893723 | app.main\n"
+        )
+
+        assert parse_importtime(output) == [
+            ImportTiming("encodings.utf_8", 120, 120),
+            ImportTiming("app.main", 8664, 1893723),
+        ]